@@ -1,16 +1,25 @@
 """
 Appium Test Framework - Ana Paket
 """
+import importlib
 
 # Versiyon bilgisi
 __version__ = "1.0.0"
 
-# Kullanıcıya açık API'ler
-from .core.test_runner import BaseTestRunner
-from core import device_manager
+# Kullanıcıya açık API'ler; ilk erişimde yüklenir (Appium yalnızca gerektiğinde içe aktarılır)
+_EXPORTS = {
+    'BaseTestRunner': '.core.test_runner',
+    'device_manager': 'core.device_manager',
+}
 
 # İstenirse tüm modülleri otomatik yükleyebilir
 __all__ = ['BaseTestRunner', 'device_manager']
 
-# Paket yüklendiğinde çalışacak başlatma kodu (opsiyonel)
-print(f"{__name__} v{__version__} başlatıldı")
\ No newline at end of file
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(_EXPORTS[name], __name__)
+    value = module if name == 'device_manager' else getattr(module, name)
+    globals()[name] = value
+    return value
@@ -72,4 +72,25 @@ XPATHS_OF_PERMISSIONS = {
     "Location" : '//android.widget.Button[@resource-id="com.android.permissioncontroller:id/permission_allow_foreground_only_button"]',
     "Nearby_Devices": '//android.widget.Button[@resource-id="com.android.permissioncontroller:id/permission_allow_button"]',
     "Phone_Calls" : '//android.widget.Button[@resource-id="com.android.permissioncontroller:id/permission_allow_button"]',
-}
\ No newline at end of file
+}
+
+# XPATHS_OF_PERMISSIONS anahtarlarının runtime izin karşılıkları (provizyonda `pm grant` ile önceden verilir)
+RUNTIME_PERMISSIONS = {
+    "Record_Video": ["android.permission.CAMERA", "android.permission.RECORD_AUDIO"],
+    "Location": ["android.permission.ACCESS_FINE_LOCATION", "android.permission.ACCESS_COARSE_LOCATION"],
+    "Nearby_Devices": ["android.permission.BLUETOOTH_SCAN", "android.permission.BLUETOOTH_CONNECT",
+                       "android.permission.NEARBY_WIFI_DEVICES"],
+    "Phone_Calls": ["android.permission.READ_PHONE_STATE", "android.permission.CALL_PHONE"],
+}
+
+# İzin diyaloglarını açan paketler (DebugLoggerUI)
+PERMISSION_PACKAGES = ["com.debug.loggerui"]
+
+# DebugLoggerUI'nin adb broadcast arayüzü (UI'ye girmeden log başlat/durdur)
+DEBUGLOGGER = {
+    "package": "com.debug.loggerui",
+    "action": "com.debug.loggerui.ADB_CMD",
+    "log_types": 7,  # Bit maskesi: 1 mobilelog, 2 modemlog, 4 networklog
+    "status_props": ["vendor.MB.running", "debug.MB.running"],  # "1" ise log kaydı sürüyor
+    "log_dir": "/sdcard/debuglogger",
+}
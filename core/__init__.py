@@ -1,4 +1,21 @@
-from .device_manager import  AppiumServerManager
-from .test_runner import BaseTestRunner
+import importlib
 
-__all__ = [ 'AppiumServerManager', 'BaseTestRunner']
\ No newline at end of file
+# Dışa aktarılan sınıflar ilk erişimde yüklenir; `import core.adb_client` gibi
+# alt modül içe aktarımları Appium/Selenium'u (test_runner) yüklemez
+_EXPORTS = {
+    'AppiumServerManager': '.device_manager',
+    'AppiumServerPool': '.device_manager',
+    'BaseTestRunner': '.test_runner',
+    'AdbClient': '.adb_client',
+    'AdbError': '.adb_client',
+}
+
+__all__ = [ 'AppiumServerManager', 'AppiumServerPool', 'BaseTestRunner', 'AdbClient', 'AdbError']
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,358 @@
+import asyncio
+import os
+import select
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+
+ADB_SERVER_HOST = os.environ.get("ANDROID_ADB_SERVER_ADDRESS", "localhost")
+ADB_SERVER_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", 5037))
+
+
+class AdbError(Exception):
+    """ADB sunucusu FAIL döndürdüğünde veya bağlantı koptuğunda fırlatılır"""
+
+
+# Uzun süren shell komutları (büyük klasörde find, rm -rf, dumpsys) için önerilen süre sınırı
+LONG_COMMAND_TIMEOUT = 300
+
+
+def encode_request(payload: str) -> bytes:
+    """ADB smart-socket formatı: 4 haneli hex uzunluk + komut"""
+    data = payload.encode("utf-8")
+    return f"{len(data):04x}".encode("ascii") + data
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise AdbError("ADB bağlantısı beklenmedik şekilde kapandı")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _read_status(sock: socket.socket, request: str):
+    status = _recv_exact(sock, 4)
+    if status == b"OKAY":
+        return
+    if status == b"FAIL":
+        length = int(_recv_exact(sock, 4), 16)
+        message = _recv_exact(sock, length).decode("utf-8", errors="replace")
+        raise AdbError(f"{request}: {message}")
+    raise AdbError(f"{request}: beklenmeyen yanıt {status!r}")
+
+
+def open_service(serial: Optional[str], service: str,
+                 host: str = ADB_SERVER_HOST, port: int = ADB_SERVER_PORT,
+                 timeout: Optional[float] = 30) -> socket.socket:
+    """adb sunucusuna bağlanır, cihaza transport açar ve servisi başlatır.
+
+    Dönen soket servisin stdin/stdout akışıdır; servis bitince sunucu soketi kapatır.
+    """
+    sock = socket.create_connection((host, port), timeout=timeout)
+    try:
+        transport = f"host:transport:{serial}" if serial else "host:transport-any"
+        sock.sendall(encode_request(transport))
+        _read_status(sock, transport)
+        sock.sendall(encode_request(service))
+        _read_status(sock, service)
+        return sock
+    except Exception:
+        sock.close()
+        raise
+
+
+def host_request(request: str, host: str = ADB_SERVER_HOST,
+                 port: int = ADB_SERVER_PORT, timeout: Optional[float] = 10) -> str:
+    """host:devices gibi cihaza bağlı olmayan sunucu isteklerini çalıştırır"""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(encode_request(request))
+        _read_status(sock, request)
+        length = int(_recv_exact(sock, 4), 16)
+        return _recv_exact(sock, length).decode("utf-8", errors="replace")
+
+
+def list_devices(host: str = ADB_SERVER_HOST, port: int = ADB_SERVER_PORT) -> Dict[str, str]:
+    """Bağlı cihazları {serial: durum} olarak döndürür"""
+    devices = {}
+    for line in host_request("host:devices", host, port).splitlines():
+        if "\t" in line:
+            serial, state = line.split("\t", 1)
+            devices[serial] = state
+    return devices
+
+
+class AdbShellSession:
+    """Cihazda açık tutulan tek bir `sh` süreci.
+
+    `exec:sh` servisi pty açmadan stdin/stdout'u sokete bağlar. Her komut bir
+    bitiş işaretçisiyle sonlandırılır; böylece aynı bağlantı üzerinden art arda
+    komut çalıştırılabilir ve her çağrıda yeni adb istemcisi/el sıkışması gerekmez.
+    """
+
+    def __init__(self, serial: Optional[str], host: str = ADB_SERVER_HOST,
+                 port: int = ADB_SERVER_PORT, timeout: Optional[float] = 30):
+        self.serial = serial
+        self.timeout = timeout
+        self.sock = open_service(serial, "exec:sh", host, port, timeout)
+        self._buffer = bytearray()
+
+    def is_alive(self) -> bool:
+        """Komut göndermeden önce soketin karşı taraftan kapatılıp kapatılmadığını kontrol eder"""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            if not readable:
+                return True
+            # Boşta bekleyen oturumda okunacak veri yalnızca EOF (b"") olabilir
+            return self.sock.recv(1, socket.MSG_PEEK) != b""
+        except (OSError, ValueError):
+            return False
+
+    def _write_command(self, command: str, marker: str):
+        # Komut stdin'i tüketmesin diye /dev/null'a bağlanır, stderr stdout'a katılır
+        script = f"{{ {command}\n}} </dev/null 2>&1; printf '\\n{marker}:%d\\n' $?\n"
+        self.sock.sendall(script.encode("utf-8"))
+
+    def _read_result(self, marker: str) -> Tuple[int, str]:
+        token = f"\n{marker}:".encode("ascii")
+        while True:
+            index = self._buffer.find(token)
+            if index != -1:
+                end = self._buffer.find(b"\n", index + len(token))
+                if end != -1:
+                    output = bytes(self._buffer[:index])
+                    returncode = int(self._buffer[index + len(token):end])
+                    del self._buffer[:end + 1]
+                    return returncode, output.decode("utf-8", errors="replace")
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise AdbError(f"[{self.serial}] shell oturumu kapandı")
+            self._buffer.extend(chunk)
+
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[int, str]:
+        return self.run_many([command], timeout)[0]
+
+    def run_many(self, commands: List[str], timeout: Optional[float] = None) -> List[Tuple[int, str]]:
+        """Tüm komutları tek yazımda gönderir, sonuçları sırayla okur.
+
+        `timeout` verilirse bu çağrı boyunca her okuma için oturumun varsayılan süresi yerine kullanılır.
+        """
+        markers = [f"__ADB_DONE_{uuid.uuid4().hex}__" for _ in commands]
+        self.sock.settimeout(self.timeout if timeout is None else timeout)
+        try:
+            for command, marker in zip(commands, markers):
+                self._write_command(command, marker)
+            return [self._read_result(marker) for marker in markers]
+        finally:
+            self.sock.settimeout(self.timeout)
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class AdbClient:
+    """Cihaz başına kalıcı adb bağlantısı.
+
+    `adb` istemci sürecini hiç başlatmadan doğrudan adb sunucusunun soketiyle
+    (varsayılan localhost:5037) konuşur. Metin komutları kalıcı shell oturumu
+    üzerinden, ikili çıktılar (screencap gibi) ise `exec:` servisiyle okunur.
+
+    Örnek:
+        >>> adb = AdbClient.for_device("L2897100765")
+        >>> adb.shell("input keyevent 26")
+        >>> adb.shell_many(["getprop ro.product.model", "dumpsys battery"])
+    """
+
+    _pool: Dict[Tuple[Optional[str], str, int], "AdbClient"] = {}
+    _pool_lock = threading.Lock()
+
+    def __init__(self, serial: Optional[str] = None, host: str = ADB_SERVER_HOST,
+                 port: int = ADB_SERVER_PORT, timeout: Optional[float] = 30):
+        self.serial = serial
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._session: Optional[AdbShellSession] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_device(cls, serial: Optional[str] = None, host: str = ADB_SERVER_HOST,
+                   port: int = ADB_SERVER_PORT) -> "AdbClient":
+        """Süreç içinde cihaz başına tek istemci döndürür (havuz)"""
+        key = (serial, host, port)
+        with cls._pool_lock:
+            client = cls._pool.get(key)
+            if client is None:
+                client = cls(serial, host, port)
+                cls._pool[key] = client
+            return client
+
+    @classmethod
+    def close_all(cls):
+        with cls._pool_lock:
+            for client in cls._pool.values():
+                client.close()
+            cls._pool.clear()
+
+    def _get_session(self) -> AdbShellSession:
+        if self._session is not None and not self._session.is_alive():
+            # Boştayken kopan oturum (cihaz yeniden bağlandı, adb sunucusu yeniden başladı)
+            self._drop_session()
+        if self._session is None:
+            self._session = AdbShellSession(self.serial, self.host, self.port, self.timeout)
+        return self._session
+
+    def _drop_session(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _with_session(self, func):
+        # Yalnızca komut gönderilmeden önceki hatalarda (bağlantı/transport) bir kez daha denenir.
+        # Komut gönderildikten sonra kopan oturumda komutun cihazda çalışıp çalışmadığı
+        # bilinemez; tekrar göndermek yerine oturum kapatılıp hata yükseltilir.
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    session = self._get_session()
+                    break
+                except (OSError, AdbError):
+                    if attempt == 1:
+                        raise
+            try:
+                return func(session)
+            except (OSError, AdbError):
+                # Zaman aşımında da geç gelen çıktı sonraki komutla karışmasın diye oturum bırakılır
+                self._drop_session()
+                raise
+
+    # -------------------- Senkron API --------------------
+    def run(self, command: str, timeout: Optional[float] = None) -> Tuple[int, str]:
+        """Komutu çalıştırır, (çıkış kodu, çıktı) döndürür.
+
+        `timeout` uzun süren komutlar için çağrı başına okuma süre sınırıdır (varsayılan: istemcinin süresi).
+        """
+        return self._with_session(lambda session: session.run(command, timeout))
+
+    def shell(self, command: str, timeout: Optional[float] = None) -> str:
+        """`adb shell <command>` karşılığı; yalnızca çıktıyı döndürür"""
+        return self.run(command, timeout)[1]
+
+    def exec_out(self, command: str) -> bytes:
+        """`adb exec-out <command>` karşılığı; ikili çıktıyı bellekte döndürür"""
+        sock = open_service(self.serial, f"exec:{command}", self.host, self.port, self.timeout)
+        chunks = []
+        try:
+            while True:
+                chunk = sock.recv(1 << 20)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        finally:
+            sock.close()
+        return b"".join(chunks)
+
+    def exec_out_to(self, command: str, out) -> int:
+        """`exec_out` gibi, ancak çıktıyı belleğe almadan dosya nesnesine yazar; yazılan bayt sayısını döndürür"""
+        sock = open_service(self.serial, f"exec:{command}", self.host, self.port, self.timeout)
+        written = 0
+        try:
+            while True:
+                chunk = sock.recv(1 << 20)
+                if not chunk:
+                    break
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            sock.close()
+        return written
+
+    # -------------------- Toplu API --------------------
+    def run_many(self, commands: List[str], timeout: Optional[float] = None) -> List[Tuple[int, str]]:
+        """Komutları aynı oturumda ardışık (pipelined) çalıştırır"""
+        commands = list(commands)
+        if not commands:
+            return []
+        return self._with_session(lambda session: session.run_many(commands, timeout))
+
+    def shell_many(self, commands: List[str], timeout: Optional[float] = None) -> List[str]:
+        return [output for _, output in self.run_many(commands, timeout)]
+
+    def exec_out_many(self, commands: List[str], max_workers: int = 4) -> List[bytes]:
+        """İkili çıktılı komutları paralel exec: bağlantılarıyla çalıştırır"""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.exec_out, commands))
+
+    def close(self):
+        with self._lock:
+            self._drop_session()
+
+
+class AsyncAdbClient:
+    """adb sunucusuyla asyncio soketleri üzerinden konuşan istemci.
+
+    Her komut kendi bağlantısını açar; asyncio binlerce açık bağlantıyı tek
+    iş parçacığında taşıyabildiği için süreç ya da thread gerekmez.
+    """
+
+    def __init__(self, serial: Optional[str], host: str = ADB_SERVER_HOST, port: int = ADB_SERVER_PORT):
+        self.serial = serial
+        self.host = host
+        self.port = port
+
+    @staticmethod
+    async def _read_status(reader: asyncio.StreamReader, request: str):
+        status = await reader.readexactly(4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            length = int(await reader.readexactly(4), 16)
+            message = (await reader.readexactly(length)).decode("utf-8", errors="replace")
+            raise AdbError(f"{request}: {message}")
+        raise AdbError(f"{request}: beklenmeyen yanıt {status!r}")
+
+    async def _open(self, service: str):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            for request in (f"host:transport:{self.serial}" if self.serial else "host:transport-any", service):
+                writer.write(encode_request(request))
+                await writer.drain()
+                await self._read_status(reader, request)
+            return reader, writer
+        except Exception:
+            writer.close()
+            raise
+
+    async def exec_out(self, command: str) -> bytes:
+        """`adb exec-out <command>` karşılığı"""
+        reader, writer = await self._open(f"exec:{command}")
+        try:
+            return await reader.read()
+        finally:
+            writer.close()
+
+    async def shell(self, command: str) -> str:
+        """`adb shell <command>` karşılığı (stderr stdout'a katılır)"""
+        # exec: servisi komutu zaten `sh -c` ile çalıştırır
+        output = await self.exec_out(f"{{ {command}\n}} 2>&1")
+        return output.decode("utf-8", errors="replace")
+
+    async def pull(self, remote: str, local: str) -> int:
+        """Klasör çekme için adb istemcisi kullanılır (sync protokolü); çıkış kodunu döndürür"""
+        # adb istemcisi bu nesnenin konuştuğu sunucuya yönlendirilir
+        env = dict(os.environ, ANDROID_ADB_SERVER_ADDRESS=self.host, ANDROID_ADB_SERVER_PORT=str(self.port))
+        process = await asyncio.create_subprocess_exec(
+            "adb", "-s", self.serial, "pull", remote, local,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE, env=env)
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            print(f"[{self.serial}] adb pull hatası: {stderr.decode(errors='replace').strip()}")
+        return process.returncode
@@ -0,0 +1,260 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.locator_cache import atomic_write_json, file_lock
+
+
+def sha256_file(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class IngestStats:
+    files: int = 0
+    new_blobs: int = 0
+    deduplicated: int = 0
+    skipped: int = 0
+    bytes_saved: int = 0
+
+    def __str__(self):
+        return (f"{self.files} dosya, {self.new_blobs} yeni blob, {self.deduplicated} tekrar "
+                f"({self.bytes_saved / 1e6:.1f} MB kazanıldı), {self.skipped} zaten depoda")
+
+
+class ArtifactStore:
+    """Çekilen loglar için içerik adresli (sha256) depo.
+
+    Her benzersiz içerik `objects/<ilk 2 hane>/<sha256>` altında bir kez tutulur.
+    Çalıştırma dizinlerindeki dosyalar bu blob'lara hardlink olur (hardlink
+    yapılamazsa kopya kalır). Her çalıştırmanın {göreli yol: sha256} listesi
+    `runs/` altında saklanır; gc bu listelerde geçmeyen blob'ları siler, verify
+    blob'ları yeniden hash'leyerek bozulmaları bulur.
+
+    Depo, hardlink'in çalışması için çalıştırma dizinleriyle aynı diskte olmalıdır.
+    Blob inode'ları `inodes.json` içinde saklanır; böylece her `ArtifactStore()`
+    tüm blob'ları stat'lamadan zaten depoya bağlı dosyaları tanır.
+
+    Örnek:
+        >>> store = ArtifactStore(os.path.join(output_dir, ".store"))
+        >>> store.ingest_tree(os.path.join(output_dir, "L2885900175_20250606_175114"))
+        >>> store.gc()
+        >>> store.verify()
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.runs_dir = os.path.join(root, "runs")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.runs_dir, exist_ok=True)
+        self.index_path = os.path.join(root, "inodes.json")
+        self._blob_inodes: Optional[Dict[Tuple[int, int], str]] = None
+        self._new_inodes: Dict[Tuple[int, int], str] = {}
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _iter_blobs(self):
+        for prefix in os.listdir(self.objects_dir):
+            directory = os.path.join(self.objects_dir, prefix)
+            if os.path.isdir(directory):
+                for digest in os.listdir(directory):
+                    if not digest.endswith(".tmp"):
+                        yield digest, os.path.join(directory, digest)
+
+    def _scan_inodes(self) -> Dict[Tuple[int, int], str]:
+        inodes = {}
+        for digest, path in self._iter_blobs():
+            info = os.stat(path)
+            inodes[(info.st_dev, info.st_ino)] = digest
+        return inodes
+
+    def _read_index(self) -> Dict[str, str]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _inode_index(self) -> Dict[Tuple[int, int], str]:
+        """Depodaki blob'ların inode'ları; zaten blob'a bağlı dosyalar yeniden hash'lenmez.
+
+        `inodes.json` okunur; dosya yoksa blob'lar bir kez taranır ve sonuç kaydedilir.
+        Kayıtlar kullanılmadan önce blob'un inode'u ile doğrulandığı için eskimiş bir
+        kayıt yanlış sonuç vermez, yalnızca dosyanın yeniden hash'lenmesine yol açar.
+        """
+        if self._blob_inodes is None:
+            stored = self._read_index()
+            if stored:
+                self._blob_inodes = {tuple(int(part) for part in key.split(":")): digest
+                                     for key, digest in stored.items()}
+            else:
+                self._blob_inodes = self._scan_inodes()
+                self._new_inodes.update(self._blob_inodes)
+        return self._blob_inodes
+
+    def _remember(self, key: Tuple[int, int], digest: str):
+        self._inode_index()[key] = digest
+        self._new_inodes[key] = digest
+
+    def save_index(self):
+        """Bu örnekte öğrenilen inode'ları `inodes.json` ile birleştirerek yazar"""
+        if not self._new_inodes:
+            return
+        with file_lock(self.index_path):
+            stored = self._read_index()
+            stored.update({f"{dev}:{ino}": digest for (dev, ino), digest in self._new_inodes.items()})
+            atomic_write_json(self.index_path, stored)
+        self._new_inodes = {}
+
+    # -------------------- Ekleme --------------------
+    def _link_or_copy(self, source: str, destination: str):
+        # Aynı dosyayı aynı anda alan süreçler birbirinin geçici dosyasını ezmesin diye ad benzersizdir
+        tmp = f"{destination}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            os.link(source, tmp)
+        except FileExistsError:
+            raise
+        except OSError:
+            # Farklı disk veya hardlink desteklemeyen dosya sistemi
+            shutil.copy2(source, tmp)
+        try:
+            os.replace(tmp, destination)
+        except OSError:
+            os.remove(tmp)
+            raise
+
+    def ingest_file(self, path: str, stats: Optional[IngestStats] = None) -> str:
+        """Dosyayı depoya alır; aynı içerik varsa dosyayı o blob'a hardlink ile değiştirir"""
+        stats = stats or IngestStats()
+        stats.files += 1
+        info = os.stat(path)
+        key = (info.st_dev, info.st_ino)
+        known = self._inode_index().get(key)
+        if known:
+            try:
+                blob_info = os.stat(self.blob_path(known))
+                if (blob_info.st_dev, blob_info.st_ino) == key:
+                    stats.skipped += 1
+                    return known
+            except OSError:
+                pass
+            self._inode_index().pop(key, None)  # Blob silinmiş veya inode yeniden kullanılmış
+
+        digest = sha256_file(path)
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            self._link_or_copy(blob, path)
+            stats.deduplicated += 1
+            stats.bytes_saved += info.st_size
+        else:
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            self._link_or_copy(path, blob)
+            stats.new_blobs += 1
+        blob_info = os.stat(blob)
+        self._remember((blob_info.st_dev, blob_info.st_ino), digest)
+        return digest
+
+    def ingest_tree(self, run_dir: str, run_id: Optional[str] = None) -> IngestStats:
+        """Çalıştırma dizinindeki tüm dosyaları depoya alır ve çalıştırma listesini yazar"""
+        stats = IngestStats()
+        run_id = run_id or os.path.basename(os.path.normpath(run_dir))
+        files: Dict[str, str] = {}
+        for directory, _, names in os.walk(run_dir):
+            for name in names:
+                path = os.path.join(directory, name)
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                relative = os.path.relpath(path, run_dir).replace(os.sep, "/")
+                files[relative] = self.ingest_file(path, stats)
+
+        atomic_write_json(os.path.join(self.runs_dir, f"{run_id}.json"),
+                          {"run_dir": os.path.abspath(run_dir), "files": files})
+        self.save_index()
+        return stats
+
+    # -------------------- Bakım --------------------
+    def _live_digests(self) -> set:
+        live = set()
+        for name in os.listdir(self.runs_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.runs_dir, name)
+            with open(path, "r", encoding="utf-8") as f:
+                run = json.load(f)
+            if not os.path.isdir(run.get("run_dir", "")):
+                # Çalıştırma dizini silinmiş: listesi de kaldırılır
+                os.remove(path)
+                continue
+            live.update(run["files"].values())
+        return live
+
+    def gc(self, dry_run: bool = False) -> Dict[str, int]:
+        """Hiçbir çalıştırmanın kullanmadığı blob'ları siler"""
+        live = self._live_digests()
+        removed, freed = 0, 0
+        for digest, path in list(self._iter_blobs()):
+            if digest in live:
+                continue
+            removed += 1
+            freed += os.path.getsize(path)
+            if not dry_run:
+                os.remove(path)
+        if not dry_run:
+            # Silinen blob'ların kayıtları atılır; indeks kalan blob'lardan yeniden kurulur
+            self._blob_inodes = self._scan_inodes()
+            self._new_inodes = {}
+            with file_lock(self.index_path):
+                atomic_write_json(self.index_path, {f"{dev}:{ino}": digest
+                                                    for (dev, ino), digest in self._blob_inodes.items()})
+        return {"removed": removed, "freed_bytes": freed}
+
+    def verify(self) -> List[str]:
+        """Blob'ları yeniden hash'ler; içeriği adıyla uyuşmayanları döndürür"""
+        corrupted = []
+        for digest, path in self._iter_blobs():
+            if sha256_file(path) != digest:
+                corrupted.append(digest)
+        for name in os.listdir(self.runs_dir):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.runs_dir, name), "r", encoding="utf-8") as f:
+                run = json.load(f)
+            missing = [d for d in run["files"].values() if not os.path.exists(self.blob_path(d))]
+            corrupted.extend(missing)
+        return sorted(set(corrupted))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İçerik adresli log deposu bakımı")
+    parser.add_argument("command", choices=["ingest", "gc", "verify"])
+    parser.add_argument("--store", required=True, help="Depo dizini (ör. Logs/.store)")
+    parser.add_argument("paths", nargs="*", help="ingest için çalıştırma dizinleri")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.store)
+    if args.command == "ingest":
+        for path in args.paths:
+            print(f"{path}: {store.ingest_tree(path)}")
+    elif args.command == "gc":
+        result = store.gc(dry_run=args.dry_run)
+        print(f"{result['removed']} blob silindi, {result['freed_bytes'] / 1e6:.1f} MB boşaldı")
+    else:
+        corrupted = store.verify()
+        print("Tüm blob'lar sağlam" if not corrupted else f"Bozuk/eksik blob'lar: {corrupted}")
+        raise SystemExit(1 if corrupted else 0)
+
+
+if __name__ == "__main__":
+    main()
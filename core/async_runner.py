@@ -0,0 +1,167 @@
+import asyncio
+import inspect
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.adb_client import AdbError, AsyncAdbClient
+from core.result_sink import ResultSink
+from core.test_runner import BaseTestRunner
+
+
+class AsyncDeviceContext:
+    """Coroutine testlere verilen cihaz bağlamı"""
+
+    def __init__(self, device_name: str, driver, adb: AsyncAdbClient, executor: ThreadPoolExecutor):
+        self.device_name = device_name
+        self.driver = driver
+        self.adb = adb
+        self._executor = executor
+
+    async def call(self, func, *args):
+        """Bloklayan bir Appium çağrısını sınırlı thread havuzunda çalıştırır"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+
+class AsyncTestRunner(BaseTestRunner):
+    """Tüm cihazları tek süreçte, tek event loop ile yöneten runner.
+
+    adb işlemleri asyncio soketleriyle yapılır; bloklayan Appium çağrıları
+    `max_threads` ile sınırlı bir thread havuzunda çalışır. Böylece cihaz başına
+    süreç açılmadan tek host yüzlerce cihazı yönetebilir.
+
+    Eşzamanlılık sınırı: senkron bir `BaseTest` test bitene kadar havuzdaki bir
+    thread'i tutar. Aynı anda senkron test koşan cihaz sayısı bu yüzden en fazla
+    `max_threads` olur; varsayılan havuz cihaz başına bir thread'dir. Yalnızca
+    coroutine testleri kısa `ctx.call` çağrıları için thread kullandığından onlarla
+    daha küçük bir havuz yeterlidir.
+
+    Testler iki şekilde verilebilir:
+        - Mevcut senkron `BaseTest` alt sınıfları (run_with_retry thread havuzunda çalışır)
+        - `async def senaryo(ctx: AsyncDeviceContext)` coroutine fonksiyonları veya
+          `execute_async(ctx)` coroutine metodu olan nesneler
+
+    Örnek:
+        >>> async def reboot_check(ctx):
+        ...     await ctx.adb.shell("input keyevent 26")
+        ...     await ctx.call(ctx.driver.get_window_size)
+        ...     return True
+        >>> AsyncTestRunner(DEVICES, BROWSER_CONFIGS).run([reboot_check, openapp])
+    """
+
+    def __init__(self, devices: List[Dict], browser_configs: List[Dict],
+                 max_threads: Optional[int] = None, max_concurrent_sessions: int = 8, **kwargs):
+        """
+        Args:
+            max_threads: Bloklayan çağrılar (senkron testler, driver kurulumu, log işleme)
+                için thread sayısı; varsayılan cihaz sayısı. Cihaz sayısından küçükse
+                senkron testler en fazla bu kadar cihazda aynı anda koşar
+            max_concurrent_sessions: Aynı anda oluşturulabilecek Appium oturumu sayısı
+        """
+        super().__init__(devices, browser_configs, **kwargs)
+        self.max_threads = max_threads or max(len(devices), 1)
+        self.max_concurrent_sessions = max_concurrent_sessions
+
+    def run(self, test_cases) -> Dict[str, List[Dict]]:
+        """Testleri tüm cihazlarda çalıştırır (her cihazda sırayla, cihazlar eşzamanlı)"""
+        if not isinstance(test_cases, (list, tuple)):
+            test_cases = [test_cases]
+        return asyncio.run(self.run_async(list(test_cases)))
+
+    async def run_async(self, test_cases: List) -> Dict[str, List[Dict]]:
+        executor = ThreadPoolExecutor(max_workers=self.max_threads)
+        session_limit = asyncio.Semaphore(self.max_concurrent_sessions)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(executor, self._provision_devices)
+            try:
+                results = await asyncio.gather(*(
+                    self._run_device(device, test_cases, executor, session_limit) for device in self.devices
+                ))
+            finally:
+                await loop.run_in_executor(executor, self._provision_devices, True)
+        finally:
+            executor.shutdown(wait=True)
+        return {device["name"]: result for device, result in zip(self.devices, results)}
+
+    async def _run_device(self, device: Dict, test_cases: List, executor: ThreadPoolExecutor,
+                          session_limit: asyncio.Semaphore) -> List[Dict]:
+        device_name = device["name"]
+        loop = asyncio.get_running_loop()
+        adb = AsyncAdbClient(device_name)
+        results = []
+        ResultSink.for_device(device_name)  # Zaman çizelgesi bu andan itibaren filtrelenir
+
+        async with session_limit:
+            driver = await loop.run_in_executor(executor, self._initialize_driver, device_name, device["port"])
+        if not driver:
+            return results
+
+        context = AsyncDeviceContext(device_name, driver, adb, executor)
+        try:
+            for test_case in test_cases:
+                start = time.monotonic()
+                error = None
+                try:
+                    passed = bool(await self._run_one(test_case, context, loop, executor))
+                except Exception as e:
+                    passed, error = False, str(e)
+                results.append({
+                    "device": device_name,
+                    "test": getattr(test_case, "__name__", type(test_case).__name__),
+                    "passed": passed,
+                    "duration_sec": time.monotonic() - start,
+                    "error": error,
+                })
+                status = "PASS" if passed else "FAIL"
+                print(f"[{device_name}] [{status}] {results[-1]['test']} ({results[-1]['duration_sec']:.1f} sn)")
+
+            await self._pull_debug_logs_async(adb, executor)
+        finally:
+            ResultSink.for_device(device_name).flush()
+            await loop.run_in_executor(executor, self._safe_quit_driver, driver, device_name)
+        return results
+
+    async def _run_one(self, test_case, context: AsyncDeviceContext, loop, executor):
+        if inspect.iscoroutinefunction(test_case):
+            scenario = test_case
+        elif inspect.iscoroutinefunction(getattr(test_case, "execute_async", None)):
+            scenario = test_case.execute_async
+        else:
+            # Senkron BaseTest: örnekleme ve retry dahil senkron runner'larla aynı yol
+            return await loop.run_in_executor(executor, self._execute_test_case,
+                                              context.driver, context.device_name, test_case)
+
+        sampler = await loop.run_in_executor(executor, self._start_sampler, context.device_name)
+        try:
+            return await scenario(context)
+        finally:
+            if sampler is not None:
+                await loop.run_in_executor(executor, self._stop_sampler, context.device_name, sampler)
+
+    async def _pull_debug_logs_async(self, adb: AsyncAdbClient, executor: ThreadPoolExecutor):
+        device_name = adb.serial
+        loop = asyncio.get_running_loop()
+        try:
+            listing = await adb.shell("ls /sdcard/debuglogger >/dev/null 2>&1 && echo OK")
+            if "OK" not in listing:
+                print(f"[{device_name}] debuglogger klasörü bulunamadı")
+                return
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            target_dir = os.path.join(self.output_dir, f"{device_name}_{timestamp}")
+            os.makedirs(target_dir, exist_ok=True)
+            if self.log_sync:
+                # Artımlı senkronizasyon bloklayan soket çağrıları yaptığı için thread'de çalışır
+                from core.log_sync import DebugLogSync
+                sync = DebugLogSync(device_name, self.output_dir)
+                stats = await loop.run_in_executor(executor, sync.sync_into, target_dir)
+                print(f"[{device_name}] debuglogger senkronize edildi: {stats}")
+                pulled = True
+            else:
+                pulled = await adb.pull("/sdcard/debuglogger", target_dir) == 0
+            if pulled:
+                await loop.run_in_executor(executor, self._process_pulled_logs, device_name, target_dir)
+        except (OSError, AdbError) as e:
+            print(f"[{device_name}] Log çekme hatası: {str(e)}")
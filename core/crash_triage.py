@@ -0,0 +1,325 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.locator_cache import atomic_write_json, file_lock
+from core.log_index import RUN_DIR_PATTERN
+
+KNOWN_SIGNATURES_PATH = os.environ.get("KNOWN_SIGNATURES_PATH", "known_signatures.json")
+SIGNATURE_FRAMES = 6
+
+PID_HEADER = re.compile(r"^----- pid (\d+) at (.+?) -----$")
+RSS_FIELD = re.compile(r"^(Rss\w*Kb|VmSwapKb): (\d+)$")
+JAVA_FRAME = re.compile(r"^\s+at ([\w$.<>-]+)\(")
+NATIVE_FRAME = re.compile(r"^\s+native: #\d+ pc \w+\s+(\S+)(?: \((.+?)\))?")
+LOCK_WAIT = re.compile(r"^\s+- waiting (?:to lock|on) <[^>]+> \(a ([\w$.]+)\)")
+SUBJECT_NOISE = re.compile(r"0x[0-9a-fA-F]+|\d+|\{[^}]*\}|\([^)]*\)")
+BOOT_REASON = re.compile(r"androidboot\.bootreason=(\S+) @ (.+)$")
+AEE_HISTORY = re.compile(r"^(/\S+?/db\.\w+\.\d+\.\w+),(.*)$")
+SYMBOL_OFFSET = re.compile(r"\+(?:0x[0-9a-fA-F]+|\d+)(?:/0x[0-9a-fA-F]+)?")
+ISO_PREFIX = re.compile(r"^(\d{4}-\d\d-\d\d) (\d\d:\d\d:\d\d)")
+UTC_OFFSET = re.compile(r" [+-]\d\d(?:\d\d)? ")
+
+
+def signature_of(*parts: str) -> str:
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def to_iso(text: str) -> str:
+    """ANR/boot ("2025-06-06 17:51:14.35+0300") ve AEE ("Fri Jun  6 18:07:22 +03 2025")
+    zamanlarını karşılaştırılabilir cihaz yerel saatine ("2025-06-06T17:51:14") çevirir"""
+    match = ISO_PREFIX.match(text)
+    if match:
+        return f"{match.group(1)}T{match.group(2)}"
+    try:
+        return datetime.strptime(UTC_OFFSET.sub(" ", re.sub(r"\s+", " ", text.strip())),
+                                 "%a %b %d %H:%M:%S %Y").isoformat()
+    except ValueError:
+        return text
+
+
+def normalize_subject(subject: str) -> str:
+    """"Broadcast of Intent { act=... }" -> "Broadcast of Intent"; sayılar ve adresler atılır"""
+    return re.sub(r"\s+", " ", SUBJECT_NOISE.sub("", subject)).strip(" :")
+
+
+# -------------------- Ayrıştırıcılar (worker süreçlerinde çalışır) --------------------
+def parse_anr(path: str) -> Optional[Dict]:
+    """ANR trace dosyasından konu, RSS, süreç ve main thread yığınını çıkarır.
+
+    Yalnızca ilk sürecin main thread bloğuna kadar okunur; dosyanın geri kalanı
+    (diğer thread'ler ve süreçler) imza için gerekmediğinden atlanır.
+    """
+    result = {"kind": "ANR", "path": path, "subject": "", "rss": {}, "process": None,
+              "pid": None, "time": None, "state": None, "frames": []}
+    in_main = False
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if in_main:
+                if not line.strip():
+                    break
+                match = JAVA_FRAME.match(line)
+                if match:
+                    result["frames"].append(match.group(1))
+                    continue
+                match = LOCK_WAIT.match(line)
+                if match:
+                    result["frames"].append(f"lock:{match.group(1)}")
+                    continue
+                match = NATIVE_FRAME.match(line)
+                if match:
+                    symbol = SYMBOL_OFFSET.sub("", match.group(2) or "?")
+                    result["frames"].append(f"{os.path.basename(match.group(1))}!{symbol}")
+                continue
+
+            if line.startswith("Subject: ") and not result["subject"]:
+                result["subject"] = line[len("Subject: "):]
+            elif result["pid"] is None:
+                match = PID_HEADER.match(line) or RSS_FIELD.match(line)
+                if match and match.re is PID_HEADER:
+                    result["pid"], result["time"] = int(match.group(1)), to_iso(match.group(2))
+                elif match:
+                    result["rss"][match.group(1)] = int(match.group(2))
+            elif line.startswith("Cmd line: ") and result["process"] is None:
+                result["process"] = line[len("Cmd line: "):].strip()
+            elif line.startswith('"main" '):
+                result["state"] = line.split()[-1]
+                in_main = True
+
+    if result["pid"] is None:
+        return None
+    java = [frame for frame in result["frames"] if "!" not in frame]
+    # Yığının tepesindeki libc/libart sarmalayıcıları her ANR'de aynıdır; Java çerçeveleri tercih edilir
+    top = (java or result["frames"])[:SIGNATURE_FRAMES]
+    result["top"] = top
+    result["signature"] = signature_of("ANR", result["process"] or "?", normalize_subject(result["subject"]), *top)
+    result["title"] = f"ANR {result['process']} [{result['state']}] {top[0] if top else '?'}"
+    result["occurrence"] = f"{result['pid']}@{result['time']}"
+    return result
+
+
+def parse_aee_history(path: str) -> List[Dict]:
+    """db_history: AEE istisna kayıtları ve açılış (boot) nedenleri"""
+    events = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            match = BOOT_REASON.search(line)
+            if match:
+                events.append({"kind": "BOOT", "path": path, "reason": match.group(1),
+                               "time": to_iso(match.group(2)), "occurrence": f"boot@{match.group(2)}",
+                               "signature": signature_of("BOOT", match.group(1)),
+                               "title": f"Boot reason: {match.group(1)}"})
+                continue
+            match = AEE_HISTORY.match(line)
+            if match:
+                event = _aee_event(match.group(2).split(","), path, os.path.basename(match.group(1)))
+                if event:
+                    events.append(event)
+    return events
+
+
+def parse_aee_db(directory: str) -> List[Dict]:
+    """db.fatal.NN.TYPE/ZZ_INTERNAL; .dbg içeriği şifreli olduğundan yalnızca bu özet okunur"""
+    path = os.path.join(directory, "ZZ_INTERNAL")
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read().strip("\x00 \n")
+    except OSError:
+        return []
+    event = _aee_event(text.split(","), path, os.path.basename(directory)) if text else None
+    return [event] if event else []
+
+
+def _aee_event(fields: List[str], path: str, db_name: str) -> Optional[Dict]:
+    # Sınıf,0,0,99,/data/vendor/core/,0,,Tür,Tarih,1,boyut
+    if len(fields) < 9:
+        return None
+    exception_class, exception_type, when = fields[0], fields[7], to_iso(fields[8])
+    normalized = SYMBOL_OFFSET.sub("", exception_type)
+    return {"kind": "AEE", "path": path, "db": db_name, "class": exception_class,
+            "type": exception_type, "time": when, "occurrence": f"{exception_class}@{when}",
+            "signature": signature_of("AEE", exception_class, normalized),
+            "title": f"AEE {exception_class}: {normalized}"}
+
+
+def _parse_task(task: Tuple[str, str]) -> List[Dict]:
+    kind, path = task
+    try:
+        if kind == "anr":
+            parsed = parse_anr(path)
+            return [parsed] if parsed else []
+        if kind == "aee_history":
+            return parse_aee_history(path)
+        return parse_aee_db(path)
+    except OSError:
+        return []
+
+
+# -------------------- Tarama ve kümeleme --------------------
+def find_run_dirs(paths: Iterable[str]) -> List[str]:
+    """Verilen yollar çalıştırma dizini ise kendisi, değilse altındaki çalıştırma dizinleri"""
+    runs = []
+    for path in paths:
+        if RUN_DIR_PATTERN.match(os.path.basename(os.path.normpath(path))):
+            runs.append(path)
+            continue
+        for name in sorted(os.listdir(path)):
+            child = os.path.join(path, name)
+            if os.path.isdir(child) and RUN_DIR_PATTERN.match(name):
+                runs.append(child)
+    return runs
+
+
+def collect_tasks(run_dir: str) -> List[Tuple[str, str]]:
+    tasks = []
+    for directory, dirs, names in os.walk(run_dir):
+        parent = os.path.basename(directory)
+        if parent == "anr":
+            tasks.extend(("anr", os.path.join(directory, name)) for name in sorted(names)
+                         if name.startswith(("anr_", "temp_anr_")))
+        elif parent == "vendor_aee_exp":
+            if "db_history" in names:
+                tasks.append(("aee_history", os.path.join(directory, "db_history")))
+            tasks.extend(("aee_db", os.path.join(directory, name)) for name in sorted(dirs)
+                         if name.startswith("db."))
+    return tasks
+
+
+class CrashTriage:
+    """ANR ve AEE kayıtlarını paralel ayrıştırıp imzalara göre kümeleyen sınıf.
+
+    Aynı olay her çekimde tekrar geldiği için kayıtlar (cihaz, olay anahtarı)
+    ile tekilleştirilir; hardlink'li kopyalar (log_sync) hiç yeniden okunmaz.
+    İmzalar `known_path` dosyasındaki bilinen imzalarla karşılaştırılır ve rapor
+    yeni / bilinen olarak ayrılır.
+
+    Örnek:
+        >>> triage = CrashTriage(known_path=os.path.join(output_dir, "known_signatures.json"))
+        >>> report = triage.run([output_dir])
+        >>> print(triage.format_report(report))
+    """
+
+    def __init__(self, known_path: str = KNOWN_SIGNATURES_PATH, max_workers: Optional[int] = None):
+        self.known_path = known_path
+        self.max_workers = max_workers
+
+    def load_known(self) -> Dict[str, Dict]:
+        try:
+            with open(self.known_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def scan(self, paths: Iterable[str]) -> List[Dict]:
+        tasks, owners, inodes = [], [], set()
+        for run_dir in find_run_dirs(paths):
+            device = RUN_DIR_PATTERN.match(os.path.basename(os.path.normpath(run_dir))).group(1)
+            for task in collect_tasks(run_dir):
+                info = os.stat(task[1])
+                if os.path.isfile(task[1]):
+                    key = (info.st_dev, info.st_ino)
+                    if key in inodes:
+                        continue
+                    inodes.add(key)
+                tasks.append(task)
+                owners.append((device, os.path.basename(os.path.normpath(run_dir))))
+
+        events = []
+        if not tasks:
+            return events
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            chunksize = max(1, len(tasks) // ((self.max_workers or os.cpu_count() or 1) * 4))
+            for (device, run), parsed in zip(owners, executor.map(_parse_task, tasks, chunksize=chunksize)):
+                for event in parsed:
+                    event["device"], event["run"] = device, run
+                    events.append(event)
+        return events
+
+    @staticmethod
+    def cluster(events: List[Dict]) -> Dict[str, Dict]:
+        clusters: Dict[str, Dict] = {}
+        seen = set()
+        for event in events:
+            key = (event["device"], event["signature"], event["occurrence"])
+            if key in seen:
+                continue
+            seen.add(key)
+            cluster = clusters.setdefault(event["signature"], {
+                "signature": event["signature"], "kind": event["kind"], "title": event["title"],
+                "count": 0, "devices": set(), "runs": set(), "first_time": event["time"],
+                "last_time": event["time"], "sample": event["path"], "frames": event.get("top", [])})
+            cluster["count"] += 1
+            cluster["devices"].add(event["device"])
+            cluster["runs"].add(event["run"])
+            cluster["first_time"] = min(cluster["first_time"], event["time"])
+            cluster["last_time"] = max(cluster["last_time"], event["time"])
+        return clusters
+
+    def run(self, paths: Iterable[str], update_known: bool = True) -> Dict:
+        start = time.monotonic()
+        events = self.scan(paths)
+        clusters = self.cluster(events)
+
+        with file_lock(self.known_path):
+            known = self.load_known()
+            new, existing = [], []
+            for signature, cluster in sorted(clusters.items(), key=lambda item: -item[1]["count"]):
+                cluster["devices"] = sorted(cluster["devices"])
+                cluster["runs"] = sorted(cluster["runs"])
+                (existing if signature in known else new).append(cluster)
+                if update_known:
+                    entry = known.setdefault(signature, {"title": cluster["title"], "kind": cluster["kind"],
+                                                         "first_seen": datetime.now().isoformat(timespec="seconds"),
+                                                         "count": 0})
+                    entry["count"] += cluster["count"]
+                    entry["last_seen"] = datetime.now().isoformat(timespec="seconds")
+            if update_known and clusters:
+                atomic_write_json(self.known_path, known)
+
+        return {"events": len(events), "signatures": len(clusters), "new": new, "known": existing,
+                "duration_sec": round(time.monotonic() - start, 3)}
+
+    @staticmethod
+    def format_report(report: Dict, include_boot: bool = False) -> str:
+        lines = [f"{report['events']} kayıt, {report['signatures']} imza "
+                 f"({len(report['new'])} yeni), {report['duration_sec']:.1f} sn"]
+        for label, clusters in (("YENİ", report["new"]), ("BİLİNEN", report["known"])):
+            shown = [c for c in clusters if include_boot or c["kind"] != "BOOT"]
+            if not shown:
+                continue
+            lines.append(f"\n== {label} ({len(shown)})")
+            for cluster in shown:
+                lines.append(f"[{cluster['signature']}] x{cluster['count']} {cluster['title']} "
+                             f"| cihaz: {','.join(cluster['devices'])} | {cluster['first_time']} .. {cluster['last_time']}")
+                if label == "YENİ" and cluster["frames"]:
+                    lines.extend(f"      {frame}" for frame in cluster["frames"])
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANR/AEE kayıtlarını imzalara göre kümele")
+    parser.add_argument("paths", nargs="+", help="Çalıştırma dizinleri veya bunları içeren Logs dizini")
+    parser.add_argument("--known", default=KNOWN_SIGNATURES_PATH, help="Bilinen imzalar dosyası")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--json", help="Raporu JSON olarak da yaz")
+    parser.add_argument("--no-update", action="store_true", help="Bilinen imzalar dosyasını güncelleme")
+    parser.add_argument("--boot", action="store_true", help="Açılış nedenlerini de listele")
+    args = parser.parse_args()
+
+    triage = CrashTriage(args.known, args.workers)
+    report = triage.run(args.paths, update_known=not args.no_update)
+    print(triage.format_report(report, include_boot=args.boot))
+    if args.json:
+        atomic_write_json(args.json, report)
+
+
+if __name__ == "__main__":
+    main()
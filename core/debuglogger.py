@@ -0,0 +1,118 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from config.devices import DEBUGLOGGER
+from core.adb_client import LONG_COMMAND_TIMEOUT, AdbClient, AdbError
+
+
+class DebugLoggerController:
+    """DebugLoggerUI'yi arayüze girmeden adb üzerinden yöneten denetleyici.
+
+    Başlat/durdur komutları `am broadcast -a <action> -e cmd_name ...` ile
+    gönderilir; durum `status_props` sistem özelliklerinden okunur. Bu özellikler
+    cihazda yoksa durum log klasöründeki dosyaların büyüyüp büyümediğinden
+    anlaşılır (`am broadcast` alıcı olmasa da "Broadcast completed" yazar, tek
+    başına kanıt sayılmaz). Durum beklenen değere gelmezse metotlar False döner
+    ve çağıran taraf UI yoluna geri düşebilir.
+
+    Örnek:
+        >>> logger = DebugLoggerController("L2897100765")
+        >>> logger.start()
+        True
+        >>> logger.stop()
+        True
+    """
+
+    def __init__(self, device_name: str, adb: Optional[AdbClient] = None,
+                 config: Optional[Dict] = None, poll_interval: float = 0.25,
+                 settle_seconds: float = 2.0):
+        """
+        Args:
+            settle_seconds: Durum özellikleri yoksa log boyutlarının karşılaştırıldığı iki
+                ölçüm arasındaki süre; bu sürede hiç büyümeyen kayıt durmuş sayılır
+        """
+        self.device_name = device_name
+        self.adb = adb or AdbClient.for_device(device_name)
+        self.config = config or DEBUGLOGGER
+        self.poll_interval = poll_interval
+        self.settle_seconds = settle_seconds
+
+    def _broadcast(self, cmd_name: str) -> bool:
+        command = (f"am broadcast -a {self.config['action']} -p {self.config['package']} "
+                   f"-e cmd_name {cmd_name} --ei cmd_target {self.config['log_types']}")
+        try:
+            returncode, output = self.adb.run(command)
+        except (OSError, AdbError) as e:
+            print(f"[{self.device_name}] DebugLogger broadcast hatası: {str(e)}")
+            return False
+        return returncode == 0 and "Broadcast completed" in output
+
+    def is_running(self) -> Optional[bool]:
+        """Log kaydı sürüyorsa True; durum özellikleri cihazda yoksa None"""
+        props = self.config.get("status_props", [])
+        if not props:
+            return None
+        values = [value.strip() for value in self.adb.shell_many([f"getprop {prop}" for prop in props])]
+        if not any(values):
+            return None
+        return "1" in values
+
+    def _wait_for_state(self, running: bool, timeout: float,
+                        before: Optional[Tuple[int, int]] = None) -> bool:
+        """Durum `running` olana kadar bekler.
+
+        Durum özellikleri yoksa log klasörünün (dosya sayısı, toplam boyut) anlık görüntüsü
+        `settle_seconds` arayla alınır: değiştiyse kayıt sürüyor, değişmediyse durmuş sayılır.
+        `before` broadcast'ten önce alınmış görüntüdür; başlatmada ilk karşılaştırma ona göre yapılır.
+        """
+        deadline = time.monotonic() + timeout
+        previous, previous_at = before, time.monotonic()
+        while True:
+            state = self.is_running()
+            if state is None:
+                now = time.monotonic()
+                if previous is None or now - previous_at >= self.settle_seconds:
+                    snapshot = self._log_snapshot()
+                    if previous is not None:
+                        state = snapshot != previous
+                    previous, previous_at = snapshot, now
+            if state == running:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    def _log_snapshot(self) -> Optional[Tuple[int, int]]:
+        """Log klasöründeki (dosya sayısı, toplam bayt); klasör yoksa None"""
+        returncode, output = self.adb.run(
+            f"find {self.config['log_dir']} -type f -exec stat -c %s {{}} +", timeout=LONG_COMMAND_TIMEOUT)
+        sizes = [int(value) for value in output.split() if value.isdigit()]
+        if returncode != 0 and not sizes:
+            return None
+        return len(sizes), sum(sizes)
+
+    def start(self, timeout: float = 10) -> bool:
+        state = self.is_running()
+        if state:
+            return True
+        before = self._log_snapshot() if state is None else None
+        return self._broadcast("start") and self._wait_for_state(True, timeout, before)
+
+    def stop(self, timeout: float = 10) -> bool:
+        if self.is_running() is False:
+            return True
+        return self._broadcast("stop") and self._wait_for_state(False, timeout)
+
+    def clear(self) -> bool:
+        """Kayıt dururken önceki logları siler (UI'deki CLEAR ALL karşılığı).
+
+        Artımlı log senkronizasyonunun (DebugLogSync) durumunu da sıfırladığı için
+        yalnızca açıkça istendiğinde çağrılmalıdır.
+        """
+        if self.is_running():
+            print(f"[{self.device_name}] DebugLogger çalışırken loglar temizlenmez")
+            return False
+        returncode, output = self.adb.run(f"rm -rf {self.config['log_dir']}/*", timeout=LONG_COMMAND_TIMEOUT)
+        if returncode != 0:
+            print(f"[{self.device_name}] DebugLogger logları temizlenemedi: {output.strip()}")
+        return returncode == 0
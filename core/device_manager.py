@@ -1,11 +1,54 @@
+import os
 import subprocess
 import socket
-from typing import Dict, Optional
+import json
+import shutil
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
 import time
 
 
 
 
+def wait_until_ready(port: int, host: str = "127.0.0.1", timeout: float = 60,
+                     interval: float = 0.25, process: Optional[subprocess.Popen] = None,
+                     stop_event: Optional[threading.Event] = None) -> bool:
+    """Appium `GET /status` hazır dönene kadar bekler (Appium 1 için /wd/hub/status da denenir).
+
+    `process` verilirse süreç bu sırada kapanmışsa süre dolmadan hemen False döner.
+    `stop_event` verilirse olay kurulduğunda bekleme bırakılır ve False döner.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        if stop_event is not None and stop_event.is_set():
+            return False
+        for path in ("/status", "/wd/hub/status"):
+            try:
+                with urllib.request.urlopen(f"http://{host}:{port}{path}", timeout=2) as response:
+                    body = json.loads(response.read().decode("utf-8") or "{}")
+                    if response.status == 200 and body.get("value", {}).get("ready", True):
+                        return True
+            except Exception:
+                continue
+        if stop_event is not None:
+            stop_event.wait(interval)
+        else:
+            time.sleep(interval)
+    return False
+
+
+def find_free_port(host: str = "127.0.0.1") -> int:
+    """İşletim sisteminden boş bir TCP portu alır"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
 class AppiumServerManager:
     @staticmethod
     def check_server(port: int) -> bool:
@@ -29,8 +72,189 @@ class AppiumServerManager:
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
-            time.sleep(10)
-            return True
+            # Sabit bekleme yerine sunucu hazır olana kadar /status yoklanır
+            return wait_until_ready(port, host="localhost", timeout=60)
         except Exception as e:
             print(f"Appium sunucusu yeniden başlatılamadı (port {port}): {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+
+@dataclass
+class ManagedServer:
+    name: str
+    port: int
+    process: Optional[subprocess.Popen] = None
+    restarts: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    next_restart_at: float = 0.0
+    given_up: bool = False
+
+
+class AppiumServerPool:
+    """Birden fazla Appium sunucusunu paralel başlatan, izleyen ve durduran yönetici.
+
+    Portlar otomatik ayrılır, sunucular `GET /status` hazır olana kadar
+    yoklanır ve süreç nesneleri tutulduğu için durdurma işlemi lsof/kill
+    gerektirmez. İzleme (watchdog) açıksa çöken sunucu aynı portta yeniden başlatılır;
+    art arda çöken sunucu için denemeler üstel aralıklarla yapılır ve `max_restarts`
+    denemeden sonra bırakılır. `stop_all` sürmekte olan bir yeniden başlatmanın hazır
+    olmasını beklemez; izleyici durdurma isteğini hazır olma yoklaması sırasında da görür.
+
+    Örnek:
+        >>> pool = AppiumServerPool()
+        >>> devices = pool.start_for_devices(DEVICES)   # port'lar güncellenmiş kopya
+        >>> BaseTestRunner(devices=devices, browser_configs=BROWSER_CONFIGS).run_suite(tests)
+        >>> pool.stop_all()
+    """
+
+    def __init__(self, appium_command: str = "appium",
+                 extra_args: Sequence[str] = ("--relaxed-security",),
+                 host: str = "127.0.0.1", ready_timeout: float = 60,
+                 watchdog_interval: Optional[float] = 5.0, max_workers: int = 16,
+                 max_restarts: int = 5, restart_backoff: float = 2.0, stable_seconds: float = 300.0):
+        """
+        Args:
+            max_restarts: İzleyicinin bir sunucuyu art arda en fazla kaç kez yeniden başlatacağı
+            restart_backoff: İlk yeniden başlatma bekleme süresi (sn); her denemede iki katına çıkar (en çok 60 sn)
+            stable_seconds: Bu süreden uzun çalıştıktan sonra çöken sunucunun deneme sayacı sıfırlanır
+        """
+        self.appium_command = appium_command
+        self.extra_args = list(extra_args)
+        self.host = host
+        self.ready_timeout = ready_timeout
+        self.watchdog_interval = watchdog_interval
+        self.max_workers = max_workers
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.stable_seconds = stable_seconds
+        self.servers: Dict[str, ManagedServer] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    # -------------------- Başlatma --------------------
+    def _launch(self, server: ManagedServer) -> bool:
+        # Windows'ta appium bir .cmd betiği olduğu için tam yol çözülür; shell kullanılmaz.
+        # Betik node'u alt süreç olarak başlatır; ayrı süreç grubu sayesinde durdururken
+        # taskkill /T ile node da kapatılır, yetim kalmaz
+        executable = shutil.which(self.appium_command) or self.appium_command
+        creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0
+        server.process = subprocess.Popen(
+            [executable, "--address", self.host, "--port", str(server.port), *self.extra_args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=creationflags
+        )
+        server.started_at = time.monotonic()
+        ready = wait_until_ready(server.port, self.host, self.ready_timeout, process=server.process,
+                                 stop_event=self._stop_event)
+        if ready:
+            print(f"[{server.name}] Appium sunucusu hazır (port {server.port}, "
+                  f"{time.monotonic() - server.started_at:.1f} sn)")
+        elif self._stop_event.is_set():
+            print(f"[{server.name}] Havuz durduruluyor, Appium sunucusunun hazır olması beklenmedi")
+        elif server.process.poll() is not None:
+            print(f"[{server.name}] Appium sunucusu hazır olmadan kapandı "
+                  f"(çıkış kodu {server.process.returncode}, port {server.port})")
+        else:
+            print(f"[{server.name}] Appium sunucusu {self.ready_timeout} sn içinde hazır olmadı (port {server.port})")
+        return ready
+
+    def start(self, names: List[str], ports: Optional[List[int]] = None) -> Dict[str, int]:
+        """Sunucuları paralel başlatır; hazır olanların {isim: port} eşlemesini döndürür"""
+        ports = ports or [find_free_port(self.host) for _ in names]
+        new_servers = [ManagedServer(name, port) for name, port in zip(names, ports)]
+        with self._lock:
+            for server in new_servers:
+                self.servers[server.name] = server
+            if self._watchdog is None:
+                self._stop_event.clear()  # Önceki stop_all'dan kalan istek yeni başlatmayı kesmesin
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            ready = list(executor.map(self._launch, new_servers))
+
+        if self.watchdog_interval and self._watchdog is None:
+            self._watchdog = threading.Thread(target=self._watch, daemon=True)
+            self._watchdog.start()
+        return {server.name: server.port for server, ok in zip(new_servers, ready) if ok}
+
+    def start_for_devices(self, devices: List[Dict]) -> List[Dict]:
+        """DEVICES listesindeki her cihaz için sunucu açar; port'u atanmış kopyaları döndürür"""
+        ports = self.start([device["name"] for device in devices])
+        return [{**device, "port": ports[device["name"]]} for device in devices if device["name"] in ports]
+
+    # -------------------- Durdurma --------------------
+    def _terminate(self, server: ManagedServer, timeout: float = 10):
+        process = server.process
+        if process is None or process.poll() is not None:
+            return
+        if os.name == "nt":
+            # terminate() yalnızca cmd sürecini kapatır; /T ile alt süreçler (node) de sonlandırılır
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            process.terminate()
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def stop(self, name: str):
+        with self._lock:
+            server = self.servers.pop(name, None)
+        if server:
+            self._terminate(server)
+
+    def stop_all(self):
+        self._stop_event.set()
+        if self._watchdog:
+            self._watchdog.join()
+            self._watchdog = None
+        with self._lock:
+            servers = list(self.servers.values())
+            self.servers.clear()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self._terminate, servers))
+
+    def restart(self, name: str) -> bool:
+        """Sunucuyu aynı portta yeniden başlatır"""
+        server = self.servers.get(name)
+        if server is None or self._stop_event.is_set():
+            return False
+        self._terminate(server)
+        server.restarts += 1
+        return self._launch(server)
+
+    # -------------------- İzleme --------------------
+    def _watch(self):
+        while not self._stop_event.wait(self.watchdog_interval):
+            with self._lock:
+                crashed = [s for s in self.servers.values()
+                           if not s.given_up and s.process is not None and s.process.poll() is not None]
+            now = time.monotonic()
+            for server in crashed:
+                if self._stop_event.is_set():
+                    return
+                if server.next_restart_at == 0.0:
+                    # Çökme yeni fark edildi; uzun süre sorunsuz çalıştıysa sayaç sıfırlanır
+                    if now - server.started_at >= self.stable_seconds:
+                        server.restarts = 0
+                    if server.restarts >= self.max_restarts:
+                        server.given_up = True
+                        print(f"[{server.name}] Appium sunucusu {server.restarts} yeniden başlatmadan sonra "
+                              f"yine kapandı (çıkış kodu {server.process.returncode}); izleme bırakıldı")
+                        continue
+                    server.next_restart_at = now + min(self.restart_backoff * 2 ** server.restarts, 60)
+                if now < server.next_restart_at:
+                    continue
+                print(f"[{server.name}] Appium sunucusu kapanmış (çıkış kodu {server.process.returncode}), "
+                      f"yeniden başlatılıyor ({server.restarts + 1}/{self.max_restarts})")
+                server.next_restart_at = 0.0
+                self.restart(server.name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop_all()
@@ -0,0 +1,191 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.adb_client import AdbClient
+from core.perf_parsers import framestats_stage_durations, parse_framestats, parse_latency_array
+
+
+class SurfaceFlingerTracker:
+    """`dumpsys SurfaceFlinger --latency` tamponunu art arda okuyup frame'leri biriktiren sınıf.
+
+    SurfaceFlinger yalnızca son 127 frame'i tutar. Tracker her okumada yalnızca
+    son görülen present zamanından sonraki frame'leri ekler; ardışık okumalarda
+    çakışan frame'ler iki kez sayılmaz. Frame aralıkları 0.1 ms'lik sabit boyutlu
+    bir histogramda tutulur, böylece yüzdelikler bellek büyümeden hesaplanır.
+
+    Örnek:
+        >>> tracker = SurfaceFlingerTracker("L2897100765", "SurfaceView[com.google.android.youtube/...]")
+        >>> for _ in range(25):
+        ...     scroll()
+        ...     tracker.poll()
+        >>> tracker.stats()
+    """
+
+    HISTOGRAM_BIN_MS = 0.1
+    HISTOGRAM_MAX_MS = 2000.0
+
+    def __init__(self, device_name: str, layer_name: str,
+                 adb: Optional[AdbClient] = None, jank_factor: float = 1.5):
+        """
+        Args:
+            layer_name: --latency'e verilecek layer/paket adı
+            jank_factor: Aralığı refresh periyodunun bu katından uzun olan frame janky sayılır
+        """
+        self.device_name = device_name
+        self.layer_name = layer_name
+        self.adb = adb or AdbClient.for_device(device_name)
+        self.jank_factor = jank_factor
+        self.reset()
+
+    def reset(self):
+        self.refresh_period_ns = 0
+        self.last_present_ns = 0
+        self.total_frames = 0
+        self.janky_frames = 0
+        self.total_interval_ns = 0
+        self.max_interval_ns = 0
+        self.polls = 0
+        self.gaps = 0
+        self.histogram = np.zeros(int(self.HISTOGRAM_MAX_MS / self.HISTOGRAM_BIN_MS) + 1, dtype=np.int64)
+
+    def poll(self) -> int:
+        """Tamponu bir kez okur; eklenen yeni frame sayısını döndürür"""
+        raw_data = self.adb.shell(f"dumpsys SurfaceFlinger --latency {self.layer_name}")
+        return self.ingest(raw_data)
+
+    def ingest(self, raw_data: str) -> int:
+        refresh_period, frames = parse_latency_array(raw_data)
+        self.polls += 1
+        if refresh_period:
+            self.refresh_period_ns = refresh_period
+        if frames.shape[0] == 0:
+            return 0
+
+        present = np.sort(frames[:, 1])
+        new_present = present[present > self.last_present_ns]
+        if new_present.size == 0:
+            return 0
+
+        if self.last_present_ns and present[0] > self.last_present_ns:
+            # Tampon iki okuma arasında tamamen dönmüş: arada kaybolan frame'ler var,
+            # bu yüzden önceki okumanın son frame'iyle aralık hesaplanmaz
+            self.gaps += 1
+            intervals = np.diff(new_present)
+        elif self.last_present_ns:
+            intervals = np.diff(new_present, prepend=self.last_present_ns)
+        else:
+            intervals = np.diff(new_present)
+
+        self.last_present_ns = int(new_present[-1])
+        self.total_frames += int(new_present.size)
+        self._add_intervals(intervals)
+        return int(new_present.size)
+
+    def _add_intervals(self, intervals: np.ndarray):
+        if intervals.size == 0:
+            return
+        self.total_interval_ns += int(intervals.sum())
+        self.max_interval_ns = max(self.max_interval_ns, int(intervals.max()))
+        if self.refresh_period_ns:
+            self.janky_frames += int(np.count_nonzero(intervals > self.refresh_period_ns * self.jank_factor))
+
+        bins = np.minimum(intervals / 1e6 / self.HISTOGRAM_BIN_MS, self.histogram.size - 1).astype(np.int64)
+        self.histogram += np.bincount(bins, minlength=self.histogram.size)
+
+    def percentile(self, q: float) -> float:
+        """Frame aralığı yüzdeliği (ms), histogram çözünürlüğünde"""
+        counts = self.histogram.sum()
+        if counts == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.histogram), counts * q / 100.0))
+        return (index + 1) * self.HISTOGRAM_BIN_MS
+
+    def stats(self) -> Dict:
+        intervals = int(self.histogram.sum())
+        mean_ms = self.total_interval_ns / intervals / 1e6 if intervals else 0.0
+        return {
+            "total_frames": self.total_frames,
+            "janky_frames": self.janky_frames,
+            "jank_percent": 100.0 * self.janky_frames / intervals if intervals else 0.0,
+            "avg_fps": 1000.0 / mean_ms if mean_ms else 0.0,
+            "refresh_period_ms": self.refresh_period_ns / 1e6,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_interval_ns / 1e6,
+            "polls": self.polls,
+            "buffer_gaps": self.gaps,
+        }
+
+    def track(self, duration_sec: float, interval: float = 0.5) -> Dict:
+        """Belirtilen süre boyunca düzenli aralıklarla okuyup istatistikleri döndürür"""
+        end = time.monotonic() + duration_sec
+        while time.monotonic() < end:
+            self.poll()
+            time.sleep(interval)
+        self.poll()
+        return self.stats()
+
+
+class GfxinfoWindow:
+    """`gfxinfo framestats` ölçümünü senaryo adımlarına bölen pencereli toplayıcı.
+
+    Her pencere sonunda framestats okunur ve aynı shell çağrısında sayaçlar
+    `reset` ile sıfırlanır; böylece her pencere yalnızca kendi frame'lerini görür.
+    framestats en fazla son ~120 frame'i verdiğinden pencereler kısa tutulmalıdır.
+
+    Örnek:
+        >>> gfx = GfxinfoWindow("L2897100765", "com.google.android.youtube")
+        >>> with gfx.window("scroll"):
+        ...     self.scroll_up(driver, device_name)
+        >>> gfx.results["scroll"]["draw"]["p90"]
+    """
+
+    def __init__(self, device_name: str, package_name: str, adb: Optional[AdbClient] = None):
+        self.device_name = device_name
+        self.package_name = package_name
+        self.adb = adb or AdbClient.for_device(device_name)
+        self.results: Dict[str, Dict] = {}
+
+    def reset(self):
+        self.adb.shell(f"dumpsys gfxinfo {self.package_name} reset")
+
+    def collect(self, label: str) -> Dict:
+        """Pencereyi kapatır: framestats'ı okur, sayaçları sıfırlar ve aşama istatistiklerini döndürür"""
+        raw_data = self.adb.shell(f"dumpsys gfxinfo {self.package_name} framestats; "
+                                  f"dumpsys gfxinfo {self.package_name} reset >/dev/null")
+        header, frames = parse_framestats(raw_data)
+        durations = framestats_stage_durations(header, frames)
+
+        result = {"frames": int(durations["total"].size) if "total" in durations else 0}
+        for stage, values in durations.items():
+            if values.size == 0:
+                continue
+            p50, p90, p95 = np.percentile(values, [50, 90, 95])
+            result[stage] = {"mean": float(values.mean()), "p50": float(p50),
+                             "p90": float(p90), "p95": float(p95), "max": float(values.max())}
+
+        total = durations.get("total")
+        if total is not None and total.size:
+            column = {name: i for i, name in enumerate(header)}
+            # Frame bütçesi: Android 12+ FrameInterval sütunu, yoksa 60 Hz
+            if "FrameInterval" in column and "Flags" in column:
+                valid = frames[frames[:, column["Flags"]] == 0]
+                budget = valid[:, column["FrameInterval"]] / 1e6
+            else:
+                budget = 16.67
+            result["janky_frames"] = int(np.count_nonzero(total > budget))
+        self.results[label] = result
+        return result
+
+    @contextmanager
+    def window(self, label: str):
+        self.reset()
+        try:
+            yield self
+        finally:
+            self.collect(label)
@@ -0,0 +1,369 @@
+import argparse
+import mmap
+import os
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.log_index import FILE_DATE_PATTERN, TIMEZONE_HEADER, _tzinfo
+
+KERNEL_FILE_PATTERN = re.compile(r"^kernel_log_\d+__(\d{4}_\d{4}_\d{6})$")
+PPM_CLUSTERS = 2  # MT6768: LL (6 çekirdek) + L (2 çekirdek)
+
+# Tüm metrikler tek geçişte yakalanır: `<lvl>[uptime] (cpu)[pid:comm]` ön ekinden sonra
+# hangi alternatif eşleştiyse o grubun adı satırın türünü belirler.
+KERNEL_PATTERN = re.compile(
+    rb"^<\d>\[\s*(?P<uptime>\d+\.\d+)\][^\n]*?(?:"
+    rb"vol = (?P<vol>-?\d+)\s+current = (?P<current>-?\d+)\s+cap = (?P<cap>-?\d+)\s+temp = (?P<temp>-?\d+)"
+    rb"|\[Power/PPM\] \((?P<ppm_mask>0x[0-9a-fA-F]+)\)\((?P<ppm_budget>-?\d+)\)\((?P<ppm_root>-?\d+)\)"
+    rb"\([^)]*\)(?P<ppm_clusters>(?:\s*\(-?\d+\))+)"
+    rb"|halSetFWOwn:[^\n]*?FW OWN:(?P<fw_own>\d)"
+    rb"|halSetDriverOwn:[^\n]*?DRIVER OWN Done\[(?P<driver_own_us>\d+) us\]"
+    rb"|(?P<utc>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\.\d+) UTC;android time"
+    rb")", re.MULTILINE)
+UPTIME_PREFIX = re.compile(rb"^<\d>\[\s*(\d+\.\d+)\]", re.MULTILINE)
+PPM_NUMBER = re.compile(rb"-?\d+")
+# uptime bundan fazla geri giderse cihaz yeniden başlamıştır (CPU'lar arası küçük sapmalar sayılmaz)
+BOOT_RESET_SEC = 1.0
+
+PPM_COLUMNS = ["policy_mask", "power_budget", "root_cluster"] + [
+    f"c{cluster}_{field}" for cluster in range(PPM_CLUSTERS)
+    for field in ("min_freq_idx", "max_freq_idx", "min_core", "max_core")]
+
+
+def _distinct(uptime: np.ndarray, *columns: np.ndarray) -> np.ndarray:
+    """Bir önceki satırın aynı uptime ve değerlerle tekrarı olmayan satırların maskesi"""
+    keep = np.ones(uptime.size, dtype=bool)
+    changed = np.diff(uptime) != 0
+    for values in columns:
+        changed |= np.diff(values) != 0
+    keep[1:] = changed
+    return keep
+
+
+def _to_array(values: List[bytes], dtype) -> np.ndarray:
+    """Bayt dizilerini tek seferde sayıya çevirir (satır satır int()/float() yerine)"""
+    if not values:
+        return np.empty(0, dtype=dtype)
+    return np.array(values, dtype=bytes).astype(dtype)
+
+
+class KernelLogFile:
+    """Tek bir kernel_log dosyasını mmap ile tarayıp metrikleri ham dizilere çıkarır"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.timezone = timezone.utc
+        self.raw: Dict[str, List] = {name: [] for name in (
+            "battery_uptime", "vol", "current", "cap", "temp",
+            "ppm_uptime", "ppm_mask", "ppm_budget", "ppm_root", "ppm_clusters",
+            "fw_own_uptime", "driver_own_uptime", "driver_own_us",
+            "anchor_uptime", "anchor_utc",
+            "battery_boot", "ppm_boot", "fw_own_boot", "driver_own_boot", "anchor_boot")}
+        self.first_uptime: Optional[float] = None
+        self.last_uptime: Optional[float] = None
+        # Dosya içindeki boot bölümü sayısı; her kaydın `*_boot` değeri dosya içi bölüm numarasıdır
+        self.segments = 1
+
+    def scan(self) -> "KernelLogFile":
+        if os.path.getsize(self.path) == 0:
+            return self
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header = data[:256]
+            if header.startswith(TIMEZONE_HEADER.encode()):
+                self.timezone = _tzinfo(header[len(TIMEZONE_HEADER):header.find(b"\n")].decode().strip())
+            # Yeniden başlatmalar: uptime'ın geri gittiği satırların ofsetleri
+            starts, uptimes = [], []
+            for match in UPTIME_PREFIX.finditer(data):
+                starts.append(match.start())
+                uptimes.append(match.group(1))
+            resets = []
+            if uptimes:
+                values = _to_array(uptimes, np.float64)
+                self.first_uptime, self.last_uptime = float(values[0]), float(values[-1])
+                resets = [starts[i] for i in np.flatnonzero(np.diff(values) < -BOOT_RESET_SEC) + 1]
+                self.segments = len(resets) + 1
+
+            raw = self.raw
+            segment = 0
+            for match in KERNEL_PATTERN.finditer(data):
+                while segment < len(resets) and match.start() >= resets[segment]:
+                    segment += 1
+                kind = match.lastgroup
+                uptime = match.group("uptime")
+                if kind == "temp":
+                    raw["battery_uptime"].append(uptime)
+                    raw["battery_boot"].append(segment)
+                    raw["vol"].append(match.group("vol"))
+                    raw["current"].append(match.group("current"))
+                    raw["cap"].append(match.group("cap"))
+                    raw["temp"].append(match.group("temp"))
+                elif kind == "ppm_clusters":
+                    raw["ppm_uptime"].append(uptime)
+                    raw["ppm_boot"].append(segment)
+                    raw["ppm_mask"].append(int(match.group("ppm_mask"), 16))
+                    raw["ppm_budget"].append(match.group("ppm_budget"))
+                    raw["ppm_root"].append(match.group("ppm_root"))
+                    numbers = PPM_NUMBER.findall(match.group("ppm_clusters"))[:PPM_CLUSTERS * 4]
+                    raw["ppm_clusters"].append(numbers + [b"-1"] * (PPM_CLUSTERS * 4 - len(numbers)))
+                elif kind == "fw_own":
+                    raw["fw_own_uptime"].append(uptime)
+                    raw["fw_own_boot"].append(segment)
+                elif kind == "driver_own_us":
+                    raw["driver_own_uptime"].append(uptime)
+                    raw["driver_own_boot"].append(segment)
+                    raw["driver_own_us"].append(match.group("driver_own_us"))
+                elif kind == "utc":
+                    raw["anchor_uptime"].append(uptime)
+                    raw["anchor_boot"].append(segment)
+                    raw["anchor_utc"].append(datetime.strptime(match.group("utc").decode(), "%Y-%m-%d %H:%M:%S.%f")
+                                             .replace(tzinfo=timezone.utc).timestamp())
+        return self
+
+    def fallback_anchor(self):
+        """Dosyada "UTC;android time" satırı yoksa dosya adındaki zaman (yerel saat) kullanılır.
+
+        debuglogger dosyayı kapatırken adlandırdığı için bu zaman son satıra (dosyanın son
+        boot bölümüne) karşılık gelir.
+        """
+        match = FILE_DATE_PATTERN.search(os.path.basename(self.path))
+        if not match or self.last_uptime is None:
+            return None
+        stamp = datetime.strptime(match.group(0), "%Y_%m%d_%H%M%S").replace(tzinfo=self.timezone)
+        return self.last_uptime, stamp.timestamp()
+
+
+class KernelTelemetry:
+    """kernel_log dosyalarındaki pil, PPM ve wlan FW-own telemetrisini NumPy dizilerine çıkarır.
+
+    Çekirdek saati (uptime) cihaz uykudayken durduğu için duvar saatine sabit bir
+    fark ile çevrilemez. Loglardaki `... UTC;android time ...` satırları çapa olarak
+    kullanılır; her örnek kendinden önceki en yakın çapanın farkıyla epoch'a çevrilir.
+    Çapa yoksa dosya adındaki zaman, dosyanın timezone başlığına göre yorumlanır.
+
+    Yeniden başlatmada uptime sıfırlandığından loglar uptime'ın geri gittiği yerlerden
+    boot bölümlerine ayrılır (dosya içinde ve dosyalar arasında). Her bölüm yalnızca
+    kendi çapalarıyla epoch'a çevrilir, seriler epoch'a göre sıralanır; çapası olmayan
+    bölümün örneklerinin epoch'u NaN kalır. Serilerdeki `boot` sütunu bölüm numarasıdır.
+
+    Örnek:
+        >>> telemetry = KernelTelemetry.from_run("Logs/L2885900115_20250613_145756")
+        >>> battery = telemetry.metrics["battery"]
+        >>> battery["epoch"], battery["temp_c"]
+        >>> telemetry.summary()
+    """
+
+    def __init__(self, files: List[KernelLogFile]):
+        self.files = files
+        self.timezone = files[0].timezone if files else timezone.utc
+        self._first_boots = self._boot_offsets()
+        self.metrics = self._build()
+
+    @classmethod
+    def from_paths(cls, paths: List[str]) -> "KernelTelemetry":
+        return cls([KernelLogFile(path).scan() for path in paths])
+
+    @classmethod
+    def from_run(cls, run_dir: str) -> "KernelTelemetry":
+        """Çalıştırma dizinindeki tüm kernel_log dosyalarını (dosya adı zamanına göre sıralı) okur"""
+        paths = []
+        for directory, _, names in os.walk(run_dir):
+            for name in names:
+                match = KERNEL_FILE_PATTERN.match(name)
+                if match:
+                    paths.append((match.group(1), os.path.join(directory, name)))
+        return cls.from_paths([path for _, path in sorted(paths)])
+
+    # -------------------- Zaman dönüşümü --------------------
+    def _boot_offsets(self) -> List[int]:
+        """Her dosyanın ilk bölümünün genel boot numarası.
+
+        Sonraki dosya öncekinin son uptime'ından geride başlıyorsa arada yeniden başlatma vardır.
+        """
+        offsets, boot, last = [], 0, None
+        for log in self.files:
+            if last is not None and log.first_uptime is not None and log.first_uptime < last - BOOT_RESET_SEC:
+                boot += 1
+            offsets.append(boot)
+            boot += log.segments - 1
+            if log.last_uptime is not None:
+                last = log.last_uptime
+        return offsets
+
+    def first_boot(self, path: str) -> int:
+        """Dosyanın ilk satırlarının genel boot numarası (akış halinde okuyan kodlar için)"""
+        for log, boot in zip(self.files, self._first_boots):
+            if log.path == path:
+                return boot
+        raise KeyError(path)
+
+    def _anchors(self):
+        boots, uptimes, epochs = [], [], []
+        for log, first in zip(self.files, self._first_boots):
+            boots.extend(first + segment for segment in log.raw["anchor_boot"])
+            uptimes.extend(float(value) for value in log.raw["anchor_uptime"])
+            epochs.extend(log.raw["anchor_utc"])
+        # UTC çapası olmayan bölümler için dosya adı zamanı
+        anchored = set(boots)
+        for log, first in zip(self.files, self._first_boots):
+            boot = first + log.segments - 1
+            anchor = log.fallback_anchor() if boot not in anchored else None
+            if anchor:
+                boots.append(boot)
+                uptimes.append(anchor[0])
+                epochs.append(anchor[1])
+        boots = np.array(boots, dtype=np.int32)
+        uptimes, epochs = np.array(uptimes, dtype=np.float64), np.array(epochs, dtype=np.float64)
+        order = np.lexsort((uptimes, boots))
+        return boots[order], uptimes[order], epochs[order] - uptimes[order]
+
+    def to_epoch(self, uptime: np.ndarray, boot: Optional[np.ndarray] = None) -> np.ndarray:
+        """uptime'ı aynı boot bölümünün çapalarıyla epoch'a çevirir (boot verilmezse 0. bölüm)"""
+        boot = np.zeros(uptime.shape, dtype=np.int32) if boot is None else boot
+        epoch = np.full(uptime.shape, np.nan)
+        for value in np.unique(boot):
+            anchors = self._anchor_boots == value
+            if not anchors.any():
+                continue
+            mask = boot == value
+            anchor_uptimes, offsets = self._anchor_uptimes[anchors], self._anchor_offsets[anchors]
+            index = np.clip(np.searchsorted(anchor_uptimes, uptime[mask], side="right") - 1, 0, None)
+            epoch[mask] = uptime[mask] + offsets[index]
+        return epoch
+
+    @property
+    def has_clock(self) -> bool:
+        """uptime'ı duvar saatine çevirecek en az bir çapa var mı"""
+        return self._anchor_uptimes.size > 0
+
+    def epoch_of(self, uptime: float, boot: int = 0) -> float:
+        """`to_epoch`'un tek değerlik hali (satır satır akış işleyen kodlar için)"""
+        start, end = np.searchsorted(self._anchor_boots, [boot, boot + 1])
+        if start == end:
+            return float("nan")
+        index = max(0, int(np.searchsorted(self._anchor_uptimes[start:end], uptime, side="right")) - 1)
+        return uptime + float(self._anchor_offsets[start + index])
+
+    def to_local(self, epoch: np.ndarray) -> np.ndarray:
+        """Epoch'u timezone başlığındaki bölgenin yerel saatine (datetime64[us]) çevirir"""
+        if epoch.size == 0 or np.isnan(epoch).all():
+            return np.empty(epoch.shape, dtype="datetime64[us]")
+        reference = datetime.fromtimestamp(float(np.nanmin(epoch)), tz=self.timezone)
+        shift = reference.utcoffset().total_seconds()
+        return ((epoch + shift) * 1e6).astype("datetime64[us]")
+
+    # -------------------- Diziler --------------------
+    def _gather(self, key: str, dtype) -> np.ndarray:
+        return np.concatenate([_to_array(log.raw[key], dtype) for log in self.files]) if self.files \
+            else np.empty(0, dtype=dtype)
+
+    def _gather_boot(self, key: str) -> np.ndarray:
+        """Dosya içi bölüm numaralarını genel boot numarasına çevirip birleştirir"""
+        return np.concatenate([np.array(log.raw[key], dtype=np.int32) + first
+                               for log, first in zip(self.files, self._first_boots)]) if self.files \
+            else np.empty(0, dtype=np.int32)
+
+    def _series(self, uptime: np.ndarray, boot: np.ndarray, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # Epoch her boot bölümünde ayrı hesaplanır, sonra birleşik seri epoch'a göre sıralanır
+        epoch = self.to_epoch(uptime, boot)
+        order = np.lexsort((uptime, boot, epoch))
+        series = {"uptime": uptime[order], "boot": boot[order], "epoch": epoch[order]}
+        series["local_time"] = self.to_local(series["epoch"])
+        series.update({name: values[order] for name, values in columns.items()})
+        return series
+
+    def _build(self) -> Dict[str, Dict[str, np.ndarray]]:
+        self._anchor_boots, self._anchor_uptimes, self._anchor_offsets = self._anchors()
+
+        uptime, boot = self._gather("battery_uptime", np.float64), self._gather_boot("battery_boot")
+        vol, current = self._gather("vol", np.int32), self._gather("current", np.int32)
+        cap, temp = self._gather("cap", np.int32), self._gather("temp", np.int32)
+        # Yakıt ölçer satırı çoğu zaman aynı uptime ile iki kez basılır
+        keep = _distinct(uptime, vol, boot)
+        battery = self._series(uptime[keep], boot[keep], {
+            "vol_mv": vol[keep], "current_ma": current[keep],
+            "cap_pct": cap[keep], "temp_c": temp[keep] / 10.0})
+
+        clusters = [np.array(log.raw["ppm_clusters"], dtype=bytes).reshape(-1, PPM_CLUSTERS * 4) for log in self.files]
+        clusters = np.concatenate(clusters).astype(np.int32) if clusters else np.empty((0, PPM_CLUSTERS * 4), np.int32)
+        ppm_columns = {
+            "policy_mask": np.concatenate([np.array(log.raw["ppm_mask"], dtype=np.int64) for log in self.files])
+            if self.files else np.empty(0, np.int64),
+            "power_budget": self._gather("ppm_budget", np.int32),
+            "root_cluster": self._gather("ppm_root", np.int32),
+        }
+        ppm_columns.update({name: clusters[:, i] for i, name in enumerate(PPM_COLUMNS[3:])})
+        ppm = self._series(self._gather("ppm_uptime", np.float64), self._gather_boot("ppm_boot"), ppm_columns)
+
+        # wlan satırları da aynı uptime ile tekrar basılabilir; pil serisi gibi ayıklanır
+        fw_uptime, fw_boot = self._gather("fw_own_uptime", np.float64), self._gather_boot("fw_own_boot")
+        keep = _distinct(fw_uptime, fw_boot)
+        fw_own = self._series(fw_uptime[keep], fw_boot[keep], {})
+        own_uptime, own_us = self._gather("driver_own_uptime", np.float64), self._gather("driver_own_us", np.int64)
+        own_boot = self._gather_boot("driver_own_boot")
+        keep = _distinct(own_uptime, own_us, own_boot)
+        driver_own = self._series(own_uptime[keep], own_boot[keep], {"duration_us": own_us[keep]})
+        return {"battery": battery, "ppm": ppm, "wlan_fw_own": fw_own, "wlan_driver_own": driver_own}
+
+    # -------------------- Rapor --------------------
+    def summary(self) -> Dict:
+        """Sütun bazlı min/max/ortalama/p95 (perf_sampler raporuyla aynı biçim)"""
+        summary = {}
+        for metric, series in self.metrics.items():
+            columns = {"count": int(series["uptime"].size)}
+            clocked = series["local_time"][~np.isnan(series["epoch"])]
+            if clocked.size:
+                columns["start"] = str(clocked[0])
+                columns["end"] = str(clocked[-1])
+            for name, values in series.items():
+                if name in ("uptime", "boot", "epoch", "local_time") or values.size == 0:
+                    continue
+                values = values.astype(np.float64)
+                columns[name] = {"min": float(values.min()), "max": float(values.max()),
+                                 "mean": float(values.mean()), "p95": float(np.percentile(values, 95))}
+            summary[metric] = columns
+        return summary
+
+    def save(self, path: str):
+        """Tüm dizileri `<metrik>.<sütun>` anahtarlarıyla sıkıştırılmış .npz dosyasına yazar"""
+        np.savez_compressed(path, **{f"{metric}.{name}": values
+                                     for metric, series in self.metrics.items()
+                                     for name, values in series.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="kernel_log pil/PPM/wlan telemetrisi")
+    parser.add_argument("paths", nargs="+", help="Çalıştırma dizinleri veya kernel_log dosyaları")
+    parser.add_argument("--npz", help="Dizileri .npz olarak kaydet; birden fazla girişte "
+                                      "dosya adına giriş adı eklenir (ör. out_<dizin>.npz)")
+    args = parser.parse_args()
+
+    used = set()
+    for path in args.paths:
+        telemetry = KernelTelemetry.from_run(path) if os.path.isdir(path) else KernelTelemetry.from_paths([path])
+        print(f"== {path}")
+        for metric, columns in telemetry.summary().items():
+            span = f" {columns['start']} .. {columns['end']}" if "start" in columns else ""
+            print(f"  {metric}: {columns['count']} örnek{span}")
+            for name, stats in columns.items():
+                if isinstance(stats, dict):
+                    print(f"    {name:<18} min {stats['min']:>10.1f}  max {stats['max']:>10.1f}  "
+                          f"ort {stats['mean']:>10.1f}  p95 {stats['p95']:>10.1f}")
+        if args.npz:
+            target = args.npz
+            if len(args.paths) > 1:
+                # Her giriş kendi dosyasına yazılır; aynı ad tekrar gelirse sıra numarası eklenir
+                root, ext = os.path.splitext(args.npz)
+                label = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+                if label in used:
+                    label = f"{label}_{len(used)}"
+                used.add(label)
+                target = f"{root}_{label}{ext or '.npz'}"
+            telemetry.save(target)
+            print(f"  -> {target}")
+
+
+if __name__ == "__main__":
+    main()
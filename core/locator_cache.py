@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from core.adb_client import AdbClient, AdbError
+
+
+LOCATOR_CACHE_PATH = os.environ.get("LOCATOR_CACHE_PATH", ".locator_cache.json")
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 10, stale_after: float = 30):
+    """Süreçler arası basit kilit dosyası (O_EXCL; Windows'ta da çalışır).
+
+    Kilidi alan süreç çökerse `stale_after` saniyeden eski kilit silinir.
+    """
+    lock_path = path + ".lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Kilit alınamadı: {lock_path}")
+            time.sleep(0.05)
+    try:
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def atomic_write_json(path: str, data, retries: int = 5):
+    """Geçici dosyaya yazıp os.replace ile değiştirir; okuyan yarım dosya görmez"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    for attempt in range(retries):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            # Windows'ta hedef başka süreçte açıkken replace geçici olarak reddedilir
+            if attempt == retries - 1:
+                os.remove(tmp_path)
+                raise
+            time.sleep(0.05 * (attempt + 1))
+
+
+class LocatorCache:
+    """find_app için kalıcı locator/strateji önbelleği.
+
+    Anahtar `<cihaz modeli>|<locator>`. Değer, işe yarayan strateji numarası,
+    o ana kadar uygulanan scroll'lar ve elementin bulunduğu bounds'tur. Dosya
+    JSON olarak saklanır; yazmalar kilit altında oku-birleştir-yaz şeklinde
+    yapıldığı için aynı anda çalışan worker süreçleri birbirinin kaydını ezmez.
+
+    Örnek:
+        >>> cache = LocatorCache.default()
+        >>> cache.get("Era 50", xpath)
+        {'strategy': 3, 'scrolls': [{'ratio_y': 0.8, 'ratio_end': 0.2}, ...], 'bounds': {...}, ...}
+    """
+
+    _default: Optional["LocatorCache"] = None
+    _models: Dict[str, str] = {}
+
+    def __init__(self, path: str = LOCATOR_CACHE_PATH):
+        self.path = path
+        self._entries: Dict[str, dict] = {}
+        self._signature: Optional[tuple] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> "LocatorCache":
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    @classmethod
+    def device_model(cls, device_name: str) -> str:
+        """Cihaz modelini (ro.product.model) süreç içinde bir kez okur"""
+        model = cls._models.get(device_name)
+        if model is None:
+            try:
+                model = AdbClient.for_device(device_name).shell("getprop ro.product.model").strip()
+            except (OSError, AdbError):
+                model = ""
+            model = model or device_name
+            cls._models[device_name] = model
+        return model
+
+    @staticmethod
+    def key(model: str, locator: str) -> str:
+        return f"{model}|{locator}"
+
+    def _read_file(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _refresh(self):
+        """Dosya başka bir süreç tarafından değiştirildiyse yeniden yükler"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            self._entries = self._read_file()
+            self._signature = signature
+
+    def _update(self, key: str, entry: Optional[dict]):
+        with self._lock, file_lock(self.path):
+            entries = self._read_file()
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+            atomic_write_json(self.path, entries)
+            self._entries = entries
+            stat = os.stat(self.path)
+            self._signature = (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, model: str, locator: str) -> Optional[dict]:
+        with self._lock:
+            self._refresh()
+            return self._entries.get(self.key(model, locator))
+
+    def put(self, model: str, locator: str, strategy: int, scrolls: list, bounds: Optional[dict] = None):
+        """Kaydı yazar; `bounds` elementin {x, y, width, height} dikdörtgenidir"""
+        previous = self.get(model, locator)
+        if previous and (previous.get("strategy"), previous.get("scrolls"), previous.get("bounds")) == \
+                (strategy, scrolls, bounds):
+            return  # Değişiklik yoksa dosyaya yazılmaz
+        try:
+            self._update(self.key(model, locator), {
+                "strategy": strategy,
+                "scrolls": scrolls,
+                "bounds": bounds,
+                "updated_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            })
+        except (OSError, TimeoutError) as e:
+            print(f"Locator önbelleği yazılamadı: {str(e)}")
+
+    def invalidate(self, model: str, locator: str):
+        if self.get(model, locator) is None:
+            return
+        try:
+            self._update(self.key(model, locator), None)
+        except (OSError, TimeoutError) as e:
+            print(f"Locator önbelleği güncellenemedi: {str(e)}")
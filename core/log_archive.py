@@ -0,0 +1,294 @@
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+ARCHIVE_MAGIC = b"LOGARC01"
+FOOTER = struct.Struct("<QQ8s")      # index offset, index uzunluğu, magic
+DEFAULT_CHUNK_SIZE = 1 << 20         # Her bağımsız frame'in sıkıştırılmamış boyutu
+
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+class _Codec:
+    """Bağımsız frame'ler için sıkıştırıcı; zstandard yoksa zlib kullanılır"""
+
+    def __init__(self, name: str, level: Optional[int] = None):
+        self.name = name
+        if name == "zstd":
+            zstandard = _zstd()
+            if zstandard is None:
+                raise ImportError("Bu arşiv zstd ile sıkıştırılmış; 'pip install zstandard' gerekli")
+            self.level = 3 if level is None else level
+            self._zstandard = zstandard
+        elif name == "zlib":
+            self.level = 6 if level is None else level
+        else:
+            raise ValueError(f"Bilinmeyen codec: {name}")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            # ZstdCompressor thread-safe değildir; her frame için ayrı nesne
+            return self._zstandard.ZstdCompressor(level=self.level).compress(data)
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        if self.name == "zstd":
+            return self._zstandard.ZstdDecompressor().decompress(data, max_output_size=size)
+        return zlib.decompress(data)
+
+
+def write_archive(run_dir: str, archive_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  codec: Optional[str] = None, level: Optional[int] = None, max_workers: int = 4) -> Dict:
+    """Dizini, her dosyası bağımsız frame'lere bölünmüş tek bir arşiv dosyasına yazar.
+
+    Düzen: magic | frame'ler | sıkıştırılmış JSON index | footer. Index her üye için
+    frame'lerin (ofset, sıkıştırılmış boyut) listesini tutar; böylece okuyucu yalnızca
+    istenen bayt aralığına düşen frame'leri açar.
+
+    Returns:
+        {"members", "original_bytes", "archive_bytes", "codec"}
+    """
+    compressor = _Codec(codec or ("zstd" if _zstd() else "zlib"), level)
+    members: Dict[str, Dict] = {}
+    original = 0
+    tmp_path = archive_path + ".tmp"
+
+    with open(tmp_path, "wb") as out, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        out.write(ARCHIVE_MAGIC)
+        for directory, _, names in os.walk(run_dir):
+            for name in sorted(names):
+                path = os.path.join(directory, name)
+                if os.path.islink(path) or not os.path.isfile(path):
+                    continue
+                relative = os.path.relpath(path, run_dir).replace(os.sep, "/")
+                digest = hashlib.sha256()
+                frames: List[List[int]] = []
+                size = 0
+                with open(path, "rb") as f:
+                    while True:
+                        # Bellek sınırlı kalsın diye frame'ler worker sayısının iki katı kadar gruplanır
+                        batch = [chunk for chunk in (f.read(chunk_size) for _ in range(max_workers * 2)) if chunk]
+                        if not batch:
+                            break
+                        for chunk, compressed in zip(batch, executor.map(compressor.compress, batch)):
+                            digest.update(chunk)
+                            frames.append([out.tell(), len(compressed)])
+                            out.write(compressed)
+                            size += len(chunk)
+                members[relative] = {
+                    "size": size,
+                    "mtime": os.path.getmtime(path),
+                    "sha256": digest.hexdigest(),
+                    "frames": frames,
+                }
+                original += size
+
+        index = zlib.compress(json.dumps({
+            "codec": compressor.name,
+            "chunk_size": chunk_size,
+            "members": members,
+        }).encode("utf-8"))
+        index_offset = out.tell()
+        out.write(index)
+        out.write(FOOTER.pack(index_offset, len(index), ARCHIVE_MAGIC))
+
+    os.replace(tmp_path, archive_path)
+    return {"members": len(members), "original_bytes": original,
+            "archive_bytes": os.path.getsize(archive_path), "codec": compressor.name}
+
+
+class ArchiveMemberReader(io.RawIOBase):
+    """Arşivdeki tek bir dosya için seek edilebilir, salt okunur akış"""
+
+    def __init__(self, archive: "LogArchive", name: str):
+        self._archive = archive
+        self._name = name
+        self._size = archive.size(name)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        data = self._archive.read(self._name, self._position, len(buffer))
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
+
+
+class LogArchive:
+    """`write_archive` ile yazılmış arşivi okur; yalnızca gereken frame'ler açılır.
+
+    Örnek:
+        >>> with LogArchive("Logs/L2897100765_20250623_154338.logarc") as archive:
+        ...     archive.members()[:3]
+        ...     head = archive.read("debuglogger/mobilelog/APLog_x/main_log", 0, 4096)
+        ...     with archive.open_text("debuglogger/mobilelog/APLog_x/main_log") as f:
+        ...         for line in f: ...
+    """
+
+    def __init__(self, path: str, cache_frames: int = 8):
+        self.path = path
+        self._file = open(path, "rb")
+        if self._file.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            raise ValueError(f"Geçersiz arşiv: {path}")
+        self._file.seek(-FOOTER.size, io.SEEK_END)
+        index_offset, index_length, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"Arşiv footer'ı bozuk: {path}")
+        self._file.seek(index_offset)
+        index = json.loads(zlib.decompress(self._file.read(index_length)))
+        self.chunk_size = index["chunk_size"]
+        self._members = index["members"]
+        self._codec = _Codec(index["codec"])
+        self._cache: Dict = {}
+        self._cache_order: List = []
+        self._cache_frames = cache_frames
+
+    def members(self) -> List[str]:
+        return sorted(self._members)
+
+    def info(self, name: str) -> Dict:
+        try:
+            return self._members[name]
+        except KeyError:
+            raise KeyError(f"Arşivde yok: {name}") from None
+
+    def size(self, name: str) -> int:
+        return self.info(name)["size"]
+
+    def _frame(self, name: str, number: int) -> bytes:
+        key = (name, number)
+        if key in self._cache:
+            return self._cache[key]
+        offset, length = self.info(name)["frames"][number]
+        self._file.seek(offset)
+        data = self._codec.decompress(self._file.read(length), self.chunk_size)
+        self._cache[key] = data
+        self._cache_order.append(key)
+        if len(self._cache_order) > self._cache_frames:
+            self._cache.pop(self._cache_order.pop(0), None)
+        return data
+
+    def read(self, name: str, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Üyenin [offset, offset+length) aralığını yalnızca ilgili frame'leri açarak döndürür"""
+        size = self.size(name)
+        end = size if length is None else min(size, offset + length)
+        if offset >= end:
+            return b""
+        first, last = offset // self.chunk_size, (end - 1) // self.chunk_size
+        parts = [self._frame(name, number) for number in range(first, last + 1)]
+        data = b"".join(parts)
+        start = offset - first * self.chunk_size
+        return data[start:start + (end - offset)]
+
+    def open(self, name: str) -> io.BufferedReader:
+        return io.BufferedReader(ArchiveMemberReader(self, name), buffer_size=self.chunk_size)
+
+    def open_text(self, name: str, encoding: str = "utf-8") -> io.TextIOWrapper:
+        return io.TextIOWrapper(self.open(name), encoding=encoding, errors="replace")
+
+    def extract(self, name: str, destination: str):
+        os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+        with self.open(name) as source, open(destination, "wb") as target:
+            shutil.copyfileobj(source, target, self.chunk_size)
+
+    def verify(self) -> List[str]:
+        """Her üyeyi açıp sha256'sını index ile karşılaştırır; bozuk üyeleri döndürür"""
+        corrupted = []
+        for name in self.members():
+            digest = hashlib.sha256()
+            for number in range(len(self.info(name)["frames"])):
+                digest.update(self._frame(name, number))
+            if digest.hexdigest() != self.info(name)["sha256"]:
+                corrupted.append(name)
+        return corrupted
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def archive_run(run_dir: str, archive_path: Optional[str] = None, remove_source: bool = False, **kwargs) -> Dict:
+    """Bitmiş çalıştırma dizinini `<dizin>.logarc` arşivine çevirir.
+
+    `remove_source` True ise arşiv doğrulandıktan sonra dizin silinir.
+    """
+    archive_path = archive_path or os.path.normpath(run_dir) + ".logarc"
+    result = write_archive(run_dir, archive_path, **kwargs)
+    if remove_source:
+        with LogArchive(archive_path) as archive:
+            corrupted = archive.verify()
+        if corrupted:
+            raise IOError(f"Arşiv doğrulanamadı, kaynak silinmedi: {corrupted[:3]}")
+        shutil.rmtree(run_dir)
+    result["path"] = archive_path
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seek edilebilir sıkıştırılmış log arşivleri")
+    sub = parser.add_subparsers(dest="command", required=True)
+    pack = sub.add_parser("pack", help="Çalıştırma dizinlerini arşivle")
+    pack.add_argument("run_dirs", nargs="+")
+    pack.add_argument("--remove-source", action="store_true")
+    pack.add_argument("--codec", choices=["zstd", "zlib"])
+    listing = sub.add_parser("list", help="Arşiv içeriğini listele")
+    listing.add_argument("archive")
+    cat = sub.add_parser("cat", help="Üyenin bir bayt aralığını yazdır")
+    cat.add_argument("archive")
+    cat.add_argument("member")
+    cat.add_argument("--offset", type=int, default=0)
+    cat.add_argument("--length", type=int)
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        for run_dir in args.run_dirs:
+            result = archive_run(run_dir, remove_source=args.remove_source, codec=args.codec)
+            ratio = result["original_bytes"] / max(1, result["archive_bytes"])
+            print(f"{result['path']}: {result['members']} dosya, {result['original_bytes'] / 1e6:.1f} MB -> "
+                  f"{result['archive_bytes'] / 1e6:.1f} MB ({ratio:.1f}x, {result['codec']})")
+    elif args.command == "list":
+        with LogArchive(args.archive) as archive:
+            for name in archive.members():
+                print(f"{archive.size(name):>12}  {name}")
+    else:
+        with LogArchive(args.archive) as archive:
+            sys.stdout.buffer.write(archive.read(args.member, args.offset, args.length))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,389 @@
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+LOG_INDEX_PATH = os.environ.get("LOG_INDEX_PATH", "log_index.sqlite")
+
+# mobilelog'daki threadtime satırı: "06-13 14:26:35.202510   753   837 I Tag: mesaj"
+THREADTIME_PATTERN = re.compile(
+    r"^(\d\d-\d\d \d\d:\d\d):(\d\d\.\d+)\s+(\d+)\s+(\d+) ([VDIWEFSA]) (.*?)\s*: ?(.*)$")
+TIMEZONE_HEADER = "----- timezone:"
+TIMEZONE_HEADER_BYTES = TIMEZONE_HEADER.encode()
+BUFFER_FILE_PATTERN = re.compile(r"^(main|sys|events|radio|crash)_log")
+FILE_DATE_PATTERN = re.compile(r"(\d{4})_(\d{2})(\d{2})_\d{6}")
+RUN_DIR_PATTERN = re.compile(r"^(.+?)_(\d{8})_(\d{6})$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_dir TEXT UNIQUE,
+    device TEXT,
+    ingested_at REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    file_key TEXT,
+    head_digest TEXT,
+    head_length INTEGER,
+    buffer TEXT,
+    name TEXT,
+    size INTEGER,
+    parsed_bytes INTEGER,
+    line_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS file_runs (
+    file_id INTEGER REFERENCES files(id),
+    run_id INTEGER REFERENCES runs(id),
+    path TEXT,
+    PRIMARY KEY (file_id, run_id, path)
+);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER REFERENCES files(id),
+    ts REAL,
+    pid INTEGER,
+    tid INTEGER,
+    level TEXT,
+    tag TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS lines_level_tag_ts ON lines(level, tag, ts);
+CREATE INDEX IF NOT EXISTS lines_tag_ts ON lines(tag, ts);
+CREATE INDEX IF NOT EXISTS lines_ts ON lines(ts);
+CREATE INDEX IF NOT EXISTS lines_file ON lines(file_id);
+CREATE INDEX IF NOT EXISTS files_key ON files(file_key);
+CREATE INDEX IF NOT EXISTS file_runs_run ON file_runs(run_id);
+"""
+
+# Eski indekslerde (tüm dosya sha256'sı ile tekilleştiren şema) eksik olan sütunlar
+FILE_COLUMNS = {"file_key": "TEXT", "head_digest": "TEXT", "head_length": "INTEGER", "parsed_bytes": "INTEGER"}
+HEAD_BYTES = 4096
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5(message, content='lines', content_rowid='id');
+"""
+
+
+_warned_timezones = set()
+
+
+def _tzinfo(name: str):
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        # Windows'ta tzdata paketi yoksa saat dilimi bulunamaz; cihaz ile bilgisayar
+        # genellikle aynı dilimde olduğu için bilgisayarın yerel dilimi kullanılır
+        local = datetime.now().astimezone().tzinfo
+        if name not in _warned_timezones:
+            _warned_timezones.add(name)
+            print(f"⚠ Saat dilimi bulunamadı ({name}); yerel saat dilimi ({local}) kullanılıyor. "
+                  f"Doğru zamanlar için 'pip install tzdata' kurun")
+        return local
+
+
+def _file_reference_date(path: str) -> Optional[datetime]:
+    """Dosya/klasör adındaki tarih (ör. __2025_0613_143020); threadtime satırlarında yıl yoktur"""
+    match = None
+    for part in reversed(path.replace("\\", "/").split("/")):
+        match = FILE_DATE_PATTERN.search(part)
+        if match:
+            break
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+
+
+def complete_length(path: str) -> int:
+    """Dosyanın son tam satırının bittiği bayt ofseti (yazılmakta olan yarım satır hariç)"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        position = size
+        while position > 0:
+            start = max(0, position - 65536)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                return start + newline + 1
+            position = start
+    return 0
+
+
+def parse_threadtime(path: str, offset: int = 0,
+                     end: Optional[int] = None) -> Iterator[Tuple[float, int, int, str, str, str]]:
+    """Dosyayı satır satır okuyup (epoch, pid, tid, seviye, tag, mesaj) üretir.
+
+    `offset`/`end` verilirse yalnızca [offset, end) bayt aralığındaki satırlar üretilir;
+    öncesindeki timezone başlıkları yine dikkate alınır.
+    """
+    reference = _file_reference_date(path) or datetime.fromtimestamp(os.path.getmtime(path))
+    tz = timezone.utc
+    minute_epochs: Dict[str, float] = {}
+    position = 0
+
+    with open(path, "rb") as f:
+        for raw in f:
+            position += len(raw)
+            if end is not None and position > end:
+                break
+            if raw.startswith(TIMEZONE_HEADER_BYTES):
+                tz = _tzinfo(raw[len(TIMEZONE_HEADER_BYTES):].decode("utf-8", errors="replace").strip())
+                minute_epochs.clear()
+                continue
+            if position <= offset:
+                continue
+            line = raw.decode("utf-8", errors="replace")
+            match = THREADTIME_PATTERN.match(line.rstrip("\r\n"))
+            if not match:
+                continue
+            minute, seconds, pid, tid, level, tag, message = match.groups()
+            base = minute_epochs.get(minute)
+            if base is None:
+                # Dakika başı epoch'u bir kez hesaplanır; saniyeler üstüne eklenir
+                stamp = datetime.strptime(f"{reference.year}-{minute}", "%Y-%m-%d %H:%M")
+                # Yılbaşını geçen dosyalar: dosya adı aralık sonu, satır ocak başı olabilir (ya da tersi)
+                if stamp.month > reference.month + 1:
+                    stamp = stamp.replace(year=reference.year - 1)
+                elif reference.month == 12 and stamp.month == 1:
+                    stamp = stamp.replace(year=reference.year + 1)
+                base = stamp.replace(tzinfo=tz).timestamp()
+                minute_epochs[minute] = base
+            yield base + float(seconds), int(pid), int(tid), level, tag, message
+
+
+class LogIndex:
+    """mobilelog threadtime dosyaları için SQLite indeksi (FTS5 tam metin aramasıyla).
+
+    Dosyalar cihaz ve çalıştırma dizinindeki göreli yolla tanınır; her dosya için
+    ayrıştırılan bayt sayısı tutulur. Sonraki çekimde aynı dosya (ilk baytlarının
+    özetiyle doğrulanarak) yalnızca büyüdüğü kısım kadar ayrıştırılır; değişmemiş
+    kopyalar yalnızca çalıştırmayla ilişkilendirilir. Baş kısmı farklıysa (dosya
+    yeniden yazılmış) yeni bir dosya olarak eklenir.
+
+    Örnek:
+        >>> index = LogIndex("log_index.sqlite")
+        >>> index.ingest_tree("Logs/L2885900115_20250613_145756")
+        >>> index.query(level="E", tag="ActivityManager", since="2025-06-06")
+    """
+
+    def __init__(self, path: str = LOG_INDEX_PATH, batch_size: int = 5000):
+        self.path = path
+        self.batch_size = batch_size
+        # Paralel cihaz süreçleri aynı dosyaya yazabilir; kilit için beklenir
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # FTS5 derlenmemiş SQLite: metin araması LIKE ile yapılır
+            self.has_fts = False
+
+    def _migrate(self):
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(files)")}
+        for column, kind in FILE_COLUMNS.items():
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE files ADD COLUMN {column} {kind}")
+
+    # -------------------- Ekleme --------------------
+    def _run_id(self, run_dir: str) -> int:
+        run_dir = os.path.abspath(run_dir)
+        row = self.conn.execute("SELECT id FROM runs WHERE run_dir = ?", (run_dir,)).fetchone()
+        if row:
+            return row["id"]
+        match = RUN_DIR_PATTERN.match(os.path.basename(os.path.normpath(run_dir)))
+        cursor = self.conn.execute("INSERT INTO runs (run_dir, device, ingested_at) VALUES (?, ?, ?)",
+                                   (run_dir, match.group(1) if match else None, time.time()))
+        return cursor.lastrowid
+
+    @staticmethod
+    def _head_digest(path: str, length: int) -> str:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read(length)).hexdigest()
+
+    def _known_file(self, key: str, path: str, size: int) -> Optional[sqlite3.Row]:
+        """Aynı anahtarlı, baş kısmı aynı ve küçülmemiş dosya kaydı"""
+        for row in self.conn.execute("SELECT * FROM files WHERE file_key = ? ORDER BY id DESC", (key,)):
+            if size >= row["parsed_bytes"] and self._head_digest(path, row["head_length"]) == row["head_digest"]:
+                return row
+        return None
+
+    def ingest_file(self, path: str, run_id: int, relative: str, key: Optional[str] = None) -> int:
+        """Dosyanın henüz indekslenmemiş satırlarını yazar ve dosyayı çalıştırmayla ilişkilendirir.
+
+        Args:
+            key: Çalıştırmadan bağımsız dosya anahtarı (varsayılan: göreli yol)
+
+        Returns:
+            Eklenen satır sayısı
+        """
+        key = key or relative
+        end = complete_length(path)
+        row = self._known_file(key, path, end)
+        if row is None:
+            name = os.path.basename(path)
+            head_length = min(end, HEAD_BYTES)
+            file_id = self.conn.execute(
+                "INSERT INTO files (file_key, head_digest, head_length, buffer, name, size, parsed_bytes, line_count) "
+                "VALUES (?, ?, ?, ?, ?, 0, 0, 0)",
+                (key, self._head_digest(path, head_length), head_length,
+                 BUFFER_FILE_PATTERN.match(name).group(1), name)).lastrowid
+            offset, previous = 0, 0
+        else:
+            file_id, offset, previous = row["id"], row["parsed_bytes"], row["line_count"]
+        self.conn.execute("INSERT OR IGNORE INTO file_runs VALUES (?, ?, ?)", (file_id, run_id, relative))
+        if end <= offset:
+            return 0
+
+        first_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM lines").fetchone()[0]
+        count = 0
+        batch = []
+        for record in parse_threadtime(path, offset, end):
+            batch.append((file_id,) + record)
+            if len(batch) >= self.batch_size:
+                self._insert_lines(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            self._insert_lines(batch)
+            count += len(batch)
+
+        if self.has_fts and count:
+            self.conn.execute("INSERT INTO lines_fts(rowid, message) "
+                              "SELECT id, message FROM lines WHERE file_id = ? AND id > ?", (file_id, first_id))
+        self.conn.execute("UPDATE files SET size = ?, parsed_bytes = ?, line_count = ? WHERE id = ?",
+                          (end, end, previous + count, file_id))
+        return count
+
+    def _insert_lines(self, batch):
+        self.conn.executemany(
+            "INSERT INTO lines (file_id, ts, pid, tid, level, tag, message) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+
+    def ingest_tree(self, run_dir: str) -> Dict[str, int]:
+        """Çalıştırma dizinindeki tüm main/sys/events/radio/crash log dosyalarını ekler"""
+        start = time.monotonic()
+        files, lines = 0, 0
+        match = RUN_DIR_PATTERN.match(os.path.basename(os.path.normpath(run_dir)))
+        device = match.group(1) if match else None
+        with self.conn:
+            run_id = self._run_id(run_dir)
+            for directory, _, names in os.walk(run_dir):
+                for name in sorted(names):
+                    if not BUFFER_FILE_PATTERN.match(name):
+                        continue
+                    path = os.path.join(directory, name)
+                    relative = os.path.relpath(path, run_dir).replace(os.sep, "/")
+                    # Aynı cihazın sonraki çekimlerinde aynı dosya aynı göreli yolda bulunur
+                    key = f"{device}/{relative}" if device else relative
+                    lines += self.ingest_file(path, run_id, relative, key)
+                    files += 1
+        return {"files": files, "lines": lines, "duration_sec": round(time.monotonic() - start, 3)}
+
+    # -------------------- Sorgu --------------------
+    @staticmethod
+    def _epoch(value) -> Optional[float]:
+        if value is None or isinstance(value, (int, float)):
+            return value
+        return datetime.fromisoformat(value).timestamp()
+
+    def query(self, level: Optional[str] = None, tag: Optional[str] = None,
+              since=None, until=None, text: Optional[str] = None,
+              device: Optional[str] = None, buffer: Optional[str] = None,
+              limit: Optional[int] = 1000) -> List[Dict]:
+        """Satırları filtreler.
+
+        Args:
+            level: "E", "W" ... (birden fazla için "EF")
+            since/until: epoch veya ISO tarih ("2025-06-06", "2025-06-13T14:26")
+            text: Mesajda tam metin arama (FTS5 sorgu sözdizimi)
+            device: Çalıştırma klasöründeki cihaz adı
+        """
+        clauses, params = [], []
+        if level:
+            clauses.append(f"l.level IN ({','.join('?' * len(level))})")
+            params.extend(level)
+        if tag:
+            clauses.append("l.tag = ?")
+            params.append(tag)
+        if since is not None:
+            clauses.append("l.ts >= ?")
+            params.append(self._epoch(since))
+        if until is not None:
+            clauses.append("l.ts < ?")
+            params.append(self._epoch(until))
+        if buffer:
+            clauses.append("f.buffer = ?")
+            params.append(buffer)
+        if device:
+            clauses.append("EXISTS (SELECT 1 FROM file_runs fr JOIN runs r ON r.id = fr.run_id "
+                           "WHERE fr.file_id = l.file_id AND r.device = ?)")
+            params.append(device)
+        if text:
+            if self.has_fts:
+                clauses.append("l.id IN (SELECT rowid FROM lines_fts WHERE lines_fts MATCH ?)")
+                params.append(text)
+            else:
+                clauses.append("l.message LIKE ?")
+                params.append(f"%{text}%")
+
+        sql = ("SELECT l.ts, l.pid, l.tid, l.level, l.tag, l.message, f.buffer, f.name AS file "
+               "FROM lines l JOIN files f ON f.id = l.file_id")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY l.ts"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mobilelog SQLite indeksi")
+    parser.add_argument("--db", default=LOG_INDEX_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="Çalıştırma dizinlerini indeksle")
+    ingest.add_argument("run_dirs", nargs="+")
+    query = sub.add_parser("query", help="Satırları sorgula")
+    query.add_argument("--level")
+    query.add_argument("--tag")
+    query.add_argument("--since")
+    query.add_argument("--until")
+    query.add_argument("--text")
+    query.add_argument("--device")
+    query.add_argument("--buffer")
+    query.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    with LogIndex(args.db) as index:
+        if args.command == "ingest":
+            for run_dir in args.run_dirs:
+                print(f"{run_dir}: {index.ingest_tree(run_dir)}")
+            return
+        start = time.monotonic()
+        rows = index.query(args.level, args.tag, args.since, args.until, args.text,
+                           args.device, args.buffer, args.limit)
+        for row in rows:
+            stamp = datetime.fromtimestamp(row["ts"]).strftime("%Y-%m-%d %H:%M:%S.%f")
+            print(f"{stamp} {row['pid']:>5} {row['tid']:>5} {row['level']} {row['tag']}: {row['message']}")
+        print(f"{len(rows)} satır, {(time.monotonic() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from core.adb_client import LONG_COMMAND_TIMEOUT, AdbClient, AdbError
+from core.locator_cache import atomic_write_json
+
+# Büyüyen dosyanın aynı dosya olduğunu doğrulamak için özeti karşılaştırılan baş kısım
+HEAD_BYTES = 4096
+
+
+def shell_quote(path: str) -> str:
+    return "'" + path.replace("'", "'\\''") + "'"
+
+
+@dataclass
+class SyncStats:
+    new: int = 0
+    grown: int = 0
+    replaced: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    bytes_transferred: int = 0
+    duration_sec: float = 0.0
+
+    def __str__(self):
+        return (f"{self.new} yeni, {self.grown} büyüyen, {self.replaced} değişen, {self.unchanged} aynı, "
+                f"{self.deleted} silinen dosya; {self.bytes_transferred / 1e6:.1f} MB, {self.duration_sec:.1f} sn")
+
+
+class DebugLogSync:
+    """Cihazdaki log klasörünü artımlı olarak senkronize eder.
+
+    Cihazdaki dosyalar boyut, mtime ve inode ile listelenir, son senkronizasyonun
+    manifest'i ile karşılaştırılır ve yalnızca yeni dosyalar (tamamı) ile büyüyen
+    dosyalar (`tail -c +N` ile yalnızca eklenen kısım) aktarılır. Büyüyen dosyanın
+    kesilip yeniden yazılmadığı, ilk `HEAD_BYTES` baytın cihazdaki ve yereldeki
+    özetleri karşılaştırılarak doğrulanır (tüm dosyalar için tek toplu shell çağrısı).
+
+    Güncel tam kopya `<output_dir>/.sync/<cihaz>/mirror` altında tutulur; her
+    çalıştırma dizini bu kopyadan hardlink ile oluşturulduğu için disk kullanımı
+    yalnızca yeni veri kadar artar ve her dizin yine eksiksiz bir görünüm sunar.
+    Başka dizine bağlı olmayan dosya yerinde büyütülür. Önceki bir çalıştırma
+    dizinine bağlı dosya ise o dizindeki görünüm değişmesin diye önce kopyalanır
+    (copy-on-write): maliyet, çalıştırma başına büyüyen dosya başına bir kez dosya
+    boyutu kadar yerel disk kopyasıdır. Reflink destekleyen dosya sistemlerinde
+    (btrfs, XFS) kopya veri taşımadan yapılır.
+
+    Örnek:
+        >>> sync = DebugLogSync("L2897100765", output_dir)
+        >>> stats = sync.sync_into(os.path.join(output_dir, "L2897100765_20250623_154338"))
+    """
+
+    def __init__(self, device_name: str, output_dir: str, remote_dir: str = "/sdcard/debuglogger",
+                 adb: Optional[AdbClient] = None, max_workers: int = 4):
+        self.device_name = device_name
+        self.remote_dir = remote_dir.rstrip("/")
+        self.adb = adb or AdbClient.for_device(device_name)
+        self.max_workers = max_workers
+        self.state_dir = os.path.join(output_dir, ".sync", device_name)
+        self.mirror_dir = os.path.join(self.state_dir, "mirror")
+        self.manifest_path = os.path.join(self.state_dir, "manifest.json")
+
+    # -------------------- Listeleme --------------------
+    def list_remote(self) -> Dict[str, Tuple[int, int, int]]:
+        """{göreli yol: (boyut, mtime, inode)}"""
+        returncode, output = self.adb.run(
+            f"find {shell_quote(self.remote_dir)} -type f -exec stat -c '%s|%Y|%i|%n' {{}} +",
+            timeout=LONG_COMMAND_TIMEOUT)
+        if returncode != 0 and not output.strip():
+            raise AdbError(f"{self.remote_dir} listelenemedi")
+        files = {}
+        prefix = self.remote_dir + "/"
+        for line in output.splitlines():
+            parts = line.split("|", 3)
+            if len(parts) != 4 or not all(part.isdigit() for part in parts[:3]) or not parts[3].startswith(prefix):
+                continue
+            files[parts[3][len(prefix):]] = (int(parts[0]), int(parts[1]), int(parts[2]))
+        return files
+
+    def load_manifest(self) -> Dict[str, Tuple[int, ...]]:
+        """{göreli yol: (boyut, mtime, inode)}; eski manifest'lerde inode yoktur"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return {path: tuple(entry) for path, entry in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    # -------------------- Aktarım --------------------
+    def _local(self, relative: str) -> str:
+        return os.path.join(self.mirror_dir, *relative.split("/"))
+
+    def _fetch_full(self, relative: str) -> int:
+        local = self._local(relative)
+        os.makedirs(os.path.dirname(local), exist_ok=True)
+        tmp = local + ".part"
+        with open(tmp, "wb") as f:
+            written = self.adb.exec_out_to(f"cat {shell_quote(self.remote_dir + '/' + relative)}", f)
+        os.replace(tmp, local)  # Yeni inode: eski çalıştırma dizinlerindeki hardlink'ler etkilenmez
+        return written
+
+    def _fetch_tail(self, relative: str, offset: int) -> int:
+        local = self._local(relative)
+        command = f"tail -c +{offset + 1} {shell_quote(self.remote_dir + '/' + relative)}"
+        if os.stat(local).st_nlink == 1:
+            # Başka dizine bağlı değil: yerinde büyütülür; aktarım yarıda kalırsa eski boyuta kesilir
+            with open(local, "r+b") as f:
+                f.seek(offset)
+                try:
+                    written = self.adb.exec_out_to(command, f)
+                except BaseException:
+                    f.truncate(offset)
+                    raise
+                f.truncate()
+            return written
+        # Eski çalıştırma dizinlerine hardlink'li: onların görünümü değişmesin diye kopyası büyütülür
+        tmp = local + ".part"
+        _clone_file(local, tmp)
+        with open(tmp, "ab") as f:
+            written = self.adb.exec_out_to(command, f)
+        os.replace(tmp, local)
+        return written
+
+    def _remote_head_digests(self, items: List[Tuple[str, int]]) -> Dict[str, Optional[str]]:
+        """[(göreli yol, bayt)] için cihazdaki baş kısım SHA-1 özetleri; hesaplanamazsa None"""
+        commands = [f"head -c {size} {shell_quote(self.remote_dir + '/' + relative)} | sha1sum"
+                    for relative, size in items]
+        digests = {}
+        for (relative, _), (returncode, output) in zip(items, self.adb.run_many(commands, LONG_COMMAND_TIMEOUT)):
+            digest = output.split()[0] if output.split() else ""
+            digests[relative] = digest if returncode == 0 and len(digest) == 40 else None
+        return digests
+
+    def _local_head_digest(self, relative: str, size: int) -> str:
+        with open(self._local(relative), "rb") as f:
+            return hashlib.sha1(f.read(size)).hexdigest()
+
+    def _transfer(self, item) -> int:
+        relative, action, offset = item
+        if action == "tail":
+            return self._fetch_tail(relative, offset)
+        return self._fetch_full(relative)
+
+    def sync(self) -> SyncStats:
+        """Mirror'ı cihazla eşitler"""
+        start = time.monotonic()
+        stats = SyncStats()
+        remote = self.list_remote()
+        manifest = self.load_manifest()
+        plan: List[Tuple[str, str, int]] = []
+
+        candidates: List[Tuple[str, int]] = []
+        for relative, (size, mtime, inode) in remote.items():
+            previous = manifest.get(relative)
+            local_size = os.path.getsize(self._local(relative)) if os.path.exists(self._local(relative)) else -1
+            same_inode = previous is not None and (len(previous) < 3 or previous[2] == inode)
+            if previous is None or local_size < 0:
+                plan.append((relative, "full", 0))
+                stats.new += 1
+            elif same_inode and tuple(previous[:2]) == (size, mtime) and local_size == size:
+                stats.unchanged += 1
+            elif same_inode and size > previous[0] and mtime >= previous[1] and local_size == previous[0]:
+                # Log dosyaları yalnızca sona eklenerek büyür; baş kısmı aşağıda doğrulanır
+                candidates.append((relative, previous[0]))
+            else:
+                plan.append((relative, "full", 0))
+                stats.replaced += 1
+
+        if candidates:
+            digests = self._remote_head_digests(
+                [(relative, min(offset, HEAD_BYTES)) for relative, offset in candidates])
+            for relative, offset in candidates:
+                local_digest = self._local_head_digest(relative, min(offset, HEAD_BYTES))
+                if digests[relative] is not None and digests[relative] == local_digest:
+                    plan.append((relative, "tail", offset))
+                    stats.grown += 1
+                else:
+                    # Dosya kesilip yeniden yazılmış (veya özet hesaplanamadı): tamamı alınır
+                    plan.append((relative, "full", 0))
+                    stats.replaced += 1
+
+        for relative in set(manifest) - set(remote):
+            stats.deleted += 1
+            try:
+                os.remove(self._local(relative))
+            except OSError:
+                pass
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            stats.bytes_transferred = sum(executor.map(self._transfer, plan))
+
+        # Listeleme ile aktarım arasında büyüyen dosyalar için manifest'e gerçekte alınan boyut yazılır
+        for relative, _, _ in plan:
+            _, mtime, inode = remote[relative]
+            remote[relative] = (os.path.getsize(self._local(relative)), mtime, inode)
+
+        atomic_write_json(self.manifest_path, {path: list(entry) for path, entry in remote.items()})
+        stats.duration_sec = time.monotonic() - start
+        return stats
+
+    # -------------------- Çalıştırma dizini --------------------
+    def materialize(self, target_dir: str, manifest: Optional[Dict[str, Tuple[int, ...]]] = None):
+        """Mirror'ın tam görünümünü hardlink'lerle `target_dir/<klasör adı>` altına kurar"""
+        manifest = manifest if manifest is not None else self.load_manifest()
+        root = os.path.join(target_dir, os.path.basename(self.remote_dir))
+        for relative in manifest:
+            source = self._local(relative)
+            destination = os.path.join(root, *relative.split("/"))
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            try:
+                os.link(source, destination)
+            except OSError:
+                # Farklı disk veya hardlink desteklemeyen dosya sistemi
+                shutil.copy2(source, destination)
+        return root
+
+    def sync_into(self, target_dir: str) -> SyncStats:
+        stats = self.sync()
+        self.materialize(target_dir)
+        return stats
+
+
+def _clone_file(source: str, destination: str):
+    """Dosyayı kopyalar; Linux'ta reflink (FICLONE) destekleniyorsa veri kopyalanmaz"""
+    try:
+        import fcntl
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), 0x40049409, src.fileno())  # FICLONE
+        return
+    except (ImportError, OSError):
+        pass
+    shutil.copyfile(source, destination)
@@ -0,0 +1,202 @@
+import gzip
+import os
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from core.adb_client import AdbError, open_service
+from core.result_sink import ResultSink
+
+DEFAULT_BUFFERS = ("main", "system", "crash")
+
+
+class LogcatCapture:
+    """Test süresince cihazın logcat akışını arka planda okuyan sınıf.
+
+    `logcat -v threadtime -v epoch` çıktısı adb soketinden satır satır okunur;
+    her satır o anda aktif olan ResultSink adımıyla etiketlenir ve
+    `<output_dir>/logcat_<cihaz>_<zaman>_<n>.log.gz` parçalarına yazılır
+    (satır biçimi: `<adım>\\t<logcat satırı>`). Son satırlar ayrıca boyutu ve yaşı
+    sınırlı bir halka tamponda tutulur; test hata verdiğinde son N saniye
+    cihazdan ayrıca log çekmeden hemen diske dökülebilir.
+
+    Örnek:
+        >>> with LogcatCapture("L2897100765", "logcat", buffers=("main", "system", "kernel")) as capture:
+        ...     try:
+        ...         test_case.execute(driver, device_name)
+        ...     except Exception:
+        ...         capture.dump_recent(30)
+        ...         raise
+    """
+
+    def __init__(self, device_name: str, output_dir: str = "logcat",
+                 buffers: Sequence[str] = DEFAULT_BUFFERS,
+                 ring_lines: int = 50000, ring_seconds: float = 300.0,
+                 chunk_bytes: int = 16 << 20, max_reconnects: int = 5):
+        """
+        Args:
+            buffers: logcat tamponları; çekirdek ve olay logları için "kernel", "events" eklenebilir
+            ring_lines / ring_seconds: Bellekte tutulacak en fazla satır sayısı / en eski satırın yaşı
+            chunk_bytes: Bir parça dosyasına yazılacak sıkıştırılmamış bayt sınırı
+            max_reconnects: Akış koparsa (cihaz yeniden bağlandı vb.) en fazla yeniden bağlanma sayısı
+        """
+        self.device_name = device_name
+        self.output_dir = output_dir
+        self.buffers = list(buffers)
+        self.ring_seconds = ring_seconds
+        self.chunk_bytes = chunk_bytes
+        self.max_reconnects = max_reconnects
+        self.sink = ResultSink.for_device(device_name)
+
+        self._ring: deque = deque(maxlen=ring_lines)  # (alınma zamanı, adım, satır)
+        self._ring_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sock: Optional[socket.socket] = None
+        self._last_device_ts: Optional[float] = None
+
+        self._chunk = None
+        self._chunk_written = 0
+        self.chunks: List[str] = []
+        self.line_count = 0
+
+    # -------------------- Akış --------------------
+    def _command(self) -> str:
+        command = f"logcat -v threadtime -v epoch -b {','.join(self.buffers)}"
+        if self._last_device_ts is not None:
+            # Yeniden bağlanınca kalınan yerden devam edilir
+            return command + f" -T {self._last_device_ts:.3f}"
+        return command + " -T 1"
+
+    def _current_step(self) -> str:
+        try:
+            return self.sink.current_step or "-"
+        except IndexError:
+            # Adım tam bu sırada ana iş parçacığında kapandı
+            return "-"
+
+    def _open_chunk(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.output_dir, f"logcat_{self.device_name}_{stamp}_{len(self.chunks)}.log.gz")
+        self._chunk = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+        self._chunk_written = 0
+        self.chunks.append(path)
+
+    def _close_chunk(self):
+        if self._chunk is not None:
+            self._chunk.close()
+            self._chunk = None
+
+    def _handle_lines(self, lines: List[str]):
+        now = time.time()
+        step = self._current_step()  # Aynı okumadan gelen satırlar aynı adıma aittir
+        if self._chunk is None or self._chunk_written >= self.chunk_bytes:
+            self._close_chunk()
+            self._open_chunk()
+
+        entries = []
+        for line in lines:
+            if not line or line.startswith("--------- beginning of"):
+                continue
+            head = line.lstrip().split(" ", 1)[0]
+            try:
+                self._last_device_ts = float(head)
+            except ValueError:
+                pass
+            entries.append((now, step, line))
+            text = f"{step}\t{line}\n"
+            self._chunk.write(text)
+            self._chunk_written += len(text)
+
+        self.line_count += len(entries)
+        with self._ring_lock:
+            self._ring.extend(entries)
+            cutoff = now - self.ring_seconds
+            while self._ring and self._ring[0][0] < cutoff:
+                self._ring.popleft()
+
+    def _read_stream(self):
+        pending = b""
+        while not self._stop_event.is_set():
+            try:
+                data = self._sock.recv(1 << 16)
+            except socket.timeout:
+                continue
+            if not data:
+                break
+            pending += data
+            *complete, pending = pending.split(b"\n")
+            if complete:
+                self._handle_lines([raw.decode("utf-8", errors="replace").rstrip("\r") for raw in complete])
+
+    def _run(self):
+        reconnects = 0
+        while not self._stop_event.is_set():
+            received = self.line_count
+            try:
+                self._sock = open_service(self.device_name, f"exec:{self._command()}")
+                self._sock.settimeout(0.5)  # Durdurma isteği en geç bu sürede fark edilir
+                self._read_stream()
+            except (OSError, AdbError) as e:
+                print(f"[{self.device_name}] logcat akışı koptu: {str(e)}")
+            finally:
+                if self._sock is not None:
+                    self._sock.close()
+                    self._sock = None
+            if self._stop_event.is_set():
+                break
+            # Satır gelmeden kopan bağlantılar sayılır; akış bir süre çalıştıysa sayaç sıfırlanır
+            reconnects = 0 if self.line_count > received else reconnects + 1
+            if reconnects > self.max_reconnects:
+                break
+            self._stop_event.wait(min(2 ** reconnects * 0.5, 10))
+        self._close_chunk()
+
+    # -------------------- Yaşam Döngüsü --------------------
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=f"logcat-{self.device_name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Okuyucuyu durdurur ve açık parça dosyasını kapatır"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # -------------------- Halka Tampon --------------------
+    def recent(self, seconds: Optional[float] = None, step: Optional[str] = None) -> List[Tuple[float, str, str]]:
+        """Tampondaki (alınma zamanı, adım, satır) kayıtlarını eskiden yeniye döndürür"""
+        with self._ring_lock:
+            entries = list(self._ring)
+        if seconds is not None:
+            cutoff = time.time() - seconds
+            entries = [entry for entry in entries if entry[0] >= cutoff]
+        if step is not None:
+            entries = [entry for entry in entries if entry[1] == step]
+        return entries
+
+    def dump_recent(self, seconds: float = 30.0, path: Optional[str] = None) -> str:
+        """Son `seconds` saniyenin satırlarını düz metin dosyasına yazar ve sonuca ekler"""
+        entries = self.recent(seconds)
+        if path is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.output_dir, f"logcat_{self.device_name}_failure_{stamp}.log")
+        with open(path, "w", encoding="utf-8") as f:
+            for _, step, line in entries:
+                f.write(f"{step}\t{line}\n")
+        self.sink.record("Logcat", f"Son {seconds:g} sn logcat kaydı: {path}", path=path, lines=len(entries))
+        return path
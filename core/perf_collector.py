@@ -0,0 +1,109 @@
+import re
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from core.adb_client import AdbClient
+from core import perf_parsers
+
+
+# Bölüm adı -> (komut şablonu, parser(raw, package_name), paket gerekli mi)
+SECTIONS: Dict[str, Tuple[str, Callable[[str, Optional[str]], object], bool]] = {
+    "surfaceflinger": ("dumpsys SurfaceFlinger --latency {package}",
+                       lambda raw, _: perf_parsers.parse_surfaceflinger_latency(raw), True),
+    "gfxinfo": ("dumpsys gfxinfo {package} framestats",
+                lambda raw, _: perf_parsers.parse_gfxinfo_framestats(raw), True),
+    "cpu": ("top -n 1 -b", perf_parsers.parse_top, True),
+    "memory": ("dumpsys meminfo {package}",
+               lambda raw, _: perf_parsers.parse_meminfo(raw), True),
+    "thermal": ("dumpsys thermalservice",
+                lambda raw, _: perf_parsers.parse_thermal(raw), False),
+    "model": ("getprop ro.product.model",
+              lambda raw, _: perf_parsers.parse_getprop(raw), False),
+    "android_version": ("getprop ro.build.version.release",
+                        lambda raw, _: perf_parsers.parse_getprop(raw), False),
+}
+
+SECTION_MARKER = "@@PERF_SECTION:"
+_SECTION_RE = re.compile(rf"^{re.escape(SECTION_MARKER)}(\w+)@@$", re.MULTILINE)
+
+
+def split_sections(raw_output: str) -> Dict[str, str]:
+    """İşaretçilerle ayrılmış toplu çıktıyı tek geçişte bölümlere ayırır"""
+    sections = {}
+    matches = list(_SECTION_RE.finditer(raw_output))
+    for i, match in enumerate(matches):
+        start = match.end() + 1
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(raw_output)
+        sections[match.group(1)] = raw_output[start:end]
+    return sections
+
+
+class BatchedMetricsCollector:
+    """Tüm performans komutlarını tek bir shell çağrısında çalıştıran toplayıcı.
+
+    Komutlar bölüm işaretçileriyle tek script'te birleştirilir; cihaz durumu
+    ölçümler arasında kaymaz ve cihaz başına saniyede bir anlık görüntü almak
+    adb'ye tek bir istek yükler.
+
+    Örnek:
+        >>> collector = BatchedMetricsCollector("L2897100765")
+        >>> report = collector.collect("com.google.android.youtube")
+        >>> collector.collect_sections(None, sections=["thermal"])
+    """
+
+    def __init__(self, device_name: str, adb: Optional[AdbClient] = None):
+        self.device_name = device_name
+        self.adb = adb or AdbClient.for_device(device_name)
+
+    def build_script(self, package_name: Optional[str], sections: Iterable[str]) -> str:
+        parts = []
+        for name in sections:
+            template, _, needs_package = SECTIONS[name]
+            if needs_package and not package_name:
+                continue
+            parts.append(f"echo '{SECTION_MARKER}{name}@@'")
+            parts.append(template.format(package=package_name) + " 2>&1")
+        return "\n".join(parts)
+
+    def collect_raw(self, package_name: Optional[str],
+                    sections: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Bölümlerin ham çıktısını tek adb round-trip ile alır"""
+        sections = list(sections or SECTIONS)
+        script = self.build_script(package_name, sections)
+        _, output = self.adb.run(script)
+        return split_sections(output)
+
+    def parse(self, raw_sections: Dict[str, str], package_name: Optional[str]) -> Dict[str, Dict]:
+        parsed = {}
+        for name, raw in raw_sections.items():
+            try:
+                parsed[name] = SECTIONS[name][1](raw, package_name)
+            except Exception as e:
+                parsed[name] = {"error": f"Parse failed: {str(e)}"}
+        return parsed
+
+    def collect_sections(self, package_name: Optional[str],
+                         sections: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """İstenen bölümleri ölçüp parse edilmiş olarak döndürür"""
+        return self.parse(self.collect_raw(package_name, sections), package_name)
+
+    def collect(self, package_name: str) -> Dict:
+        """`get_performance_report` ile aynı yapıda, tek round-trip'lik rapor"""
+        collected_at = time.time()
+        parsed = self.collect_sections(package_name)
+        return {
+            "fps_metrics": {
+                "surfaceflinger": parsed.get("surfaceflinger"),
+                "gfxinfo": parsed.get("gfxinfo")
+            },
+            "system_metrics": {
+                "cpu": parsed.get("cpu"),
+                "memory": parsed.get("memory"),
+                "thermal": parsed.get("thermal")
+            },
+            "device_info": {
+                "model": parsed.get("model"),
+                "android_version": parsed.get("android_version")
+            },
+            "collected_at": collected_at
+        }
@@ -0,0 +1,201 @@
+"""
+dumpsys / top / getprop çıktıları için ortak parser fonksiyonları.
+
+Parser'lar yalnızca ham metni alır, adb çağrısı yapmaz; böylece hem tekil
+`AndroidPerformanceMonitor` metodları hem de toplu toplayıcılar aynı kodu kullanır.
+"""
+import io
+import re
+import warnings
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+# Henüz sunulmamış (fence bekleyen) frame'ler için SurfaceFlinger'ın yazdığı değer
+SF_PENDING_FENCE = np.iinfo(np.int64).max
+
+_INT_TOKEN = re.compile(r"-?\d+")
+
+
+def parse_latency_array(raw_data: str) -> Tuple[int, np.ndarray]:
+    """`dumpsys SurfaceFlinger --latency` çıktısını tek NumPy çağrısıyla parse eder.
+
+    Returns:
+        (refresh_period_ns, N x 3 int64 dizi: desired_present, actual_present, frame_ready).
+        Boş satırlar ve fence bekleyen frame'ler atılır.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            values = np.fromstring(raw_data, dtype=np.int64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            # Araya karışmış uyarı/hata satırı: yalnızca sayısal satırlar tek tek okunur
+            return _parse_latency_lines(raw_data)
+
+    if values.size == 0:
+        return 0, np.empty((0, 3), dtype=np.int64)
+
+    refresh_period = int(values[0])
+    rows = values[1:]
+    rows = rows[:rows.size - rows.size % 3].reshape(-1, 3)
+    return refresh_period, _presented(rows)
+
+
+def _parse_latency_lines(raw_data: str) -> Tuple[int, np.ndarray]:
+    """Sayı olmayan satır içeren latency çıktısının satır satır (yavaş yol) parse'ı.
+
+    İlk tek sayılı satır refresh period, üç sayılı satırlar frame kabul edilir;
+    diğer satırlar atlanır.
+    """
+    refresh_period = None
+    rows = []
+    for line in raw_data.splitlines():
+        tokens = line.split()
+        if not tokens or not all(_INT_TOKEN.fullmatch(token) for token in tokens):
+            continue
+        if refresh_period is None and len(tokens) == 1:
+            refresh_period = int(tokens[0])
+        elif refresh_period is not None and len(tokens) == 3:
+            rows.append([int(token) for token in tokens])
+    if refresh_period is None:
+        return 0, np.empty((0, 3), dtype=np.int64)
+    return refresh_period, _presented(np.array(rows, dtype=np.int64).reshape(-1, 3))
+
+
+def _presented(rows: np.ndarray) -> np.ndarray:
+    """Sunulmamış (0) ve fence bekleyen frame'leri atar"""
+    valid = (rows[:, 1] > 0) & (rows[:, 1] != SF_PENDING_FENCE)
+    return rows[valid]
+
+
+def parse_surfaceflinger_latency(raw_data: str) -> Dict:
+    """`dumpsys SurfaceFlinger --latency` çıktısını parse eder"""
+    refresh_period, frames = parse_latency_array(raw_data)
+
+    if frames.shape[0] < 2:
+        return {"error": "No frame data available"}
+
+    present_times = np.sort(frames[:, 1])
+    frame_durations = np.diff(present_times) / 1e6  # nanosaniye -> milisaniye
+
+    return {
+        "avg_fps": 1000 / np.mean(frame_durations) if frame_durations.size > 0 else 0,
+        "janky_frames": np.sum(frame_durations > 16.67),  # 60fps'de 16.67ms/frame
+        "refresh_period_ns": refresh_period,
+        "frame_data": frames
+    }
+
+
+# framestats sütun farkları -> aşama süreleri (başlangıç, bitiş)
+FRAMESTATS_STAGES = {
+    "input": ("HandleInputStart", "AnimationStart"),
+    "animation": ("AnimationStart", "PerformTraversalsStart"),
+    "layout": ("PerformTraversalsStart", "DrawStart"),
+    "draw": ("DrawStart", "SyncQueued"),
+    "sync": ("SyncStart", "IssueDrawCommandsStart"),
+    "command_issue": ("IssueDrawCommandsStart", "SwapBuffers"),
+    "swap": ("SwapBuffers", "FrameCompleted"),
+    "total": ("IntendedVsync", "FrameCompleted"),
+}
+
+
+def parse_framestats(raw_data: str) -> Tuple[List[str], np.ndarray]:
+    """`gfxinfo framestats` PROFILEDATA bloklarını doğrudan int64 diziye çevirir.
+
+    Returns:
+        (sütun adları, N x len(sütunlar) dizi). Birden fazla pencere (layer) varsa satırlar birleştirilir.
+    """
+    header: List[str] = []
+    blocks = []
+    for block in raw_data.split("---PROFILEDATA---")[1::2]:
+        lines = block.strip().splitlines()
+        if len(lines) < 2:
+            continue
+        header = [name for name in lines[0].split(",") if name]
+        data = np.loadtxt(io.StringIO("\n".join(lines[1:])), delimiter=",", dtype=np.int64,
+                          usecols=range(len(header)), ndmin=2)
+        blocks.append(data)
+
+    if not blocks:
+        return header, np.empty((0, len(header)), dtype=np.int64)
+    return header, np.concatenate(blocks)
+
+
+def framestats_stage_durations(header: List[str], frames: np.ndarray) -> Dict[str, np.ndarray]:
+    """Geçerli (Flags == 0) frame'ler için aşama sürelerini ms olarak hesaplar"""
+    column = {name: i for i, name in enumerate(header)}
+    if "Flags" in column:
+        frames = frames[frames[:, column["Flags"]] == 0]
+
+    durations = {}
+    for stage, (start, end) in FRAMESTATS_STAGES.items():
+        if start not in column or end not in column:
+            continue
+        start_ns = frames[:, column[start]]
+        duration = (frames[:, column[end]] - start_ns) / 1e6
+        # Girdi olayı olmayan frame'lerde HandleInputStart 0 gelir
+        durations[stage] = np.where(start_ns > 0, np.maximum(duration, 0.0), 0.0)
+    return durations
+
+
+def parse_gfxinfo_framestats(raw_data: str) -> Dict:
+    """`dumpsys gfxinfo <pkg> framestats` çıktısını parse eder"""
+    header, frames = parse_framestats(raw_data)
+    durations = framestats_stage_durations(header, frames)
+    total = durations.get("total")
+
+    if total is None or total.size == 0:
+        return {"error": "No gfxinfo data available"}
+
+    return {
+        "90th_percentile": float(np.percentile(total, 90)),
+        "95th_percentile": float(np.percentile(total, 95)),
+        "total_frames": int(total.size)
+    }
+
+
+def parse_top(raw_data: str, package_name: str) -> Dict:
+    """`top -n 1 -b` çıktısından paketin satırını bulur"""
+    line = next((l for l in raw_data.splitlines() if package_name in l), None)
+    if not line:
+        return {"error": "Process not found"}
+
+    parts = re.split(r'\s+', line.strip())
+    return {
+        "cpu_percent": float(parts[8]),
+        "threads": int(parts[9])
+    }
+
+
+def parse_mem_value(raw_data: str, key: str) -> int:
+    """Bellek bilgisi parse helper"""
+    match = re.search(rf"{key}:\s*(\d+)", raw_data)
+    return int(match.group(1)) if match else 0
+
+
+def parse_meminfo(raw_data: str) -> Dict:
+    """`dumpsys meminfo <pkg>` çıktısını parse eder"""
+    if "No process found" in raw_data:
+        return {"error": "Process not found"}
+
+    return {
+        "pss_kb": parse_mem_value(raw_data, "PSS"),
+        "private_dirty": parse_mem_value(raw_data, "Private Dirty")
+    }
+
+
+def parse_thermal(raw_data: str) -> Dict:
+    """`dumpsys thermalservice` çıktısını parse eder"""
+    throttling = "Current throttling status: 1" in raw_data
+    temps = re.findall(r"Temperature: (\d+)", raw_data)
+
+    return {
+        "is_throttling": throttling,
+        "temperatures": [int(t) for t in temps]
+    }
+
+
+def parse_getprop(raw_data: str) -> str:
+    """Tek bir `getprop <key>` çıktısını döndürür"""
+    return raw_data.strip()
@@ -0,0 +1,161 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.adb_client import AdbClient
+from core.perf_collector import BatchedMetricsCollector
+
+
+class RingBuffer:
+    """Sabit boyutlu NumPy halka tampon; dolunca en eski satırın üzerine yazar"""
+
+    def __init__(self, capacity: int, columns: int):
+        self.capacity = capacity
+        self.data = np.full((capacity, columns), np.nan, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+
+    def append(self, row):
+        self.data[self.index] = row
+        self.index = (self.index + 1) % self.capacity
+        self.count += 1
+
+    @property
+    def dropped(self) -> int:
+        """Halka dolduğu için üzerine yazılan örnek sayısı"""
+        return max(0, self.count - self.capacity)
+
+    def to_array(self) -> np.ndarray:
+        """Örnekleri eskiden yeniye sıralı kopya olarak döndürür"""
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate((self.data[self.index:], self.data[:self.index]))
+
+
+class PerformanceSampler:
+    """Test boyunca arka planda CPU, bellek, termal ve FPS örnekleyen sınıf.
+
+    Örnekler `capacity` satırlık halka tamponda tutulur; saatlerce süren
+    koşularda bellek kullanımı sabit kalır, yalnızca en son örnekler saklanır.
+    Örnekleyici kendi adb oturumunu açar; testin aynı cihaza gönderdiği komutlar
+    örnekleme round-trip'lerini beklemez.
+
+    Örnek:
+        >>> sampler = PerformanceSampler(AndroidPerformanceMonitor("L2897100765"),
+        ...                              package_name="com.google.android.youtube", interval=1.0)
+        >>> with sampler:
+        ...     test_case.run_with_retry(driver, device_name)
+        >>> report = sampler.report()
+    """
+
+    COLUMNS = ["elapsed_sec", "cpu_percent", "pss_kb", "max_temperature",
+               "is_throttling", "fps", "janky_frames"]
+    SECTIONS = ["cpu", "memory", "thermal", "surfaceflinger"]
+
+    def __init__(self, monitor, package_name: Optional[str] = None,
+                 interval: float = 1.0, capacity: int = 3600):
+        self.monitor = monitor
+        self.adb = AdbClient(monitor.device_name)
+        self.collector = BatchedMetricsCollector(monitor.device_name, self.adb)
+        self.package_name = package_name
+        self.interval = interval
+        self.buffer = RingBuffer(capacity, len(self.COLUMNS))
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_time = None
+        self._end_time = None
+
+    # -------------------- Ölçüm Kaynakları --------------------
+    def sample_once(self) -> List[float]:
+        """Tüm kaynakları tek adb round-trip ile ölçüp tampona bir satır ekler"""
+        row = [np.nan] * len(self.COLUMNS)
+        row[0] = time.monotonic() - self._start_time
+        try:
+            parsed = self.collector.collect_sections(self.package_name, self.SECTIONS)
+        except Exception:
+            # Bağlantı hatası örneklemeyi durdurmaz, satır NaN olarak kalır
+            self.buffer.append(row)
+            return row
+
+        thermal = parsed.get("thermal", {})
+        temps = thermal.get("temperatures") or []
+        if temps:
+            row[3] = float(max(temps))
+        if "is_throttling" in thermal:
+            row[4] = float(thermal["is_throttling"])
+
+        cpu = parsed.get("cpu", {})
+        row[1] = float(cpu.get("cpu_percent", np.nan))
+        row[2] = float(parsed.get("memory", {}).get("pss_kb", np.nan))
+        fps = parsed.get("surfaceflinger", {})
+        if "error" not in fps:
+            row[5] = float(fps.get("avg_fps", np.nan))
+            row[6] = float(fps.get("janky_frames", np.nan))
+        self.buffer.append(row)
+        return row
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stop_event.is_set():
+            self.sample_once()
+            next_tick += self.interval
+            # Örnekleme uzun sürdüyse kaçırılan tikler atlanır, kayma birikmez
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    # -------------------- Yaşam Döngüsü --------------------
+    def start(self):
+        self._start_time = time.monotonic()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+        self.adb.close()
+        self._end_time = time.monotonic()
+        return self.report()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # -------------------- Rapor --------------------
+    def report(self) -> Dict:
+        """Zaman serisi ve sütun bazlı özet istatistikleri döndürür"""
+        samples = self.buffer.to_array()
+        summary = {}
+        for i, column in enumerate(self.COLUMNS[1:], 1):
+            values = samples[:, i]
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            summary[column] = {
+                "min": float(values.min()),
+                "max": float(values.max()),
+                "mean": float(values.mean()),
+                "p95": float(np.percentile(values, 95)),
+            }
+
+        end = self._end_time or time.monotonic()
+        return {
+            "device_name": self.monitor.device_name,
+            "package_name": self.package_name,
+            "interval_sec": self.interval,
+            "duration_sec": end - self._start_time if self._start_time else 0.0,
+            "total_samples": self.buffer.count,
+            "dropped_samples": self.buffer.dropped,
+            "columns": self.COLUMNS,
+            "samples": samples,
+            "summary": summary,
+        }
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from config.devices import PERMISSION_PACKAGES, RUNTIME_PERMISSIONS
+from core.adb_client import AdbClient, AdbError
+from core.locator_cache import atomic_write_json, file_lock
+
+
+PROVISIONING_CACHE_PATH = os.environ.get("PROVISIONING_CACHE_PATH", ".provisioning_cache.json")
+
+ANIMATION_SETTINGS = ("window_animation_scale", "transition_animation_scale", "animator_duration_scale")
+
+_GRANTED_PATTERN = re.compile(r"^\s*(android\.permission\.\w+): granted=true", re.MULTILINE)
+
+
+@dataclass
+class ProvisioningProfile:
+    """Testlerden önce cihaza uygulanan ayarlar.
+
+    Args:
+        animation_scale: Pencere/geçiş/animator ölçekleri (0 = animasyon kapalı)
+        stay_on_while_plugged_in: 7 = AC/USB/kablosuz şarjda ekran açık kalır (None: dokunma)
+        screen_off_timeout_ms: Ekran kapanma süresi (None: dokunma)
+        dismiss_keyguard: Ekranı uyandırıp kilit ekranını kapat
+        permissions: {paket: [izinler]}; varsayılan XPATHS_OF_PERMISSIONS karşılıkları
+    """
+    animation_scale: Optional[float] = 0.0
+    stay_on_while_plugged_in: Optional[int] = 7
+    screen_off_timeout_ms: Optional[int] = 30 * 60 * 1000
+    dismiss_keyguard: bool = True
+    permissions: Dict[str, List[str]] = field(default_factory=lambda: {
+        package: sorted({p for perms in RUNTIME_PERMISSIONS.values() for p in perms})
+        for package in PERMISSION_PACKAGES
+    })
+
+    def settings(self) -> Dict[str, str]:
+        """{"namespace/key": değer} biçiminde uygulanacak `settings` değerleri"""
+        values = {}
+        if self.animation_scale is not None:
+            for key in ANIMATION_SETTINGS:
+                values[f"global/{key}"] = _format_number(self.animation_scale)
+        if self.stay_on_while_plugged_in is not None:
+            values["global/stay_on_while_plugged_in"] = str(self.stay_on_while_plugged_in)
+        if self.screen_off_timeout_ms is not None:
+            values["system/screen_off_timeout"] = str(self.screen_off_timeout_ms)
+        return values
+
+    def digest(self) -> str:
+        return hashlib.sha1(json.dumps(asdict(self), sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _normalize(value: str) -> str:
+    # settings get "0.0" ve "0" değerlerini aynı sayar
+    value = value.strip()
+    try:
+        return _format_number(float(value))
+    except ValueError:
+        return value
+
+
+class DeviceProvisioner:
+    """Profili cihaza bir kez uygular, parmak iziyle doğrular ve eski ayarları geri yükler.
+
+    Parmak izi; profil özeti, `ro.build.fingerprint`, paket sürümleri ve mevcut
+    ayar değerlerinden hesaplanır ve `.provisioning_cache.json` içinde saklanır.
+    Sonraki çalıştırmalarda tek toplu shell çağrısıyla okunan değerler önbellekteki
+    parmak iziyle aynıysa hiçbir şey yeniden uygulanmaz.
+
+    Örnek:
+        >>> provisioner = DeviceProvisioner("L2897100765")
+        >>> provisioner.apply()      # ilk seferde uygular, sonrakilerde yalnızca doğrular
+        >>> ...
+        >>> provisioner.restore()    # orijinal ayarlar ve sonradan verilen izinler geri alınır
+        >>> provisioner.apply()      # geri yüklemeden beri değişmeyen cihazda izinler sorgulanmadan uygulanır
+    """
+
+    def __init__(self, device_name: str, profile: Optional[ProvisioningProfile] = None,
+                 adb: Optional[AdbClient] = None, cache_path: str = PROVISIONING_CACHE_PATH):
+        self.device_name = device_name
+        self.profile = profile or ProvisioningProfile()
+        self.adb = adb or AdbClient.for_device(device_name)
+        self.cache_path = cache_path
+
+    # -------------------- Önbellek --------------------
+    def _read_cache(self) -> Dict[str, dict]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _cached_entry(self) -> dict:
+        return self._read_cache().get(self.device_name, {})
+
+    def _store_entry(self, entry: Optional[dict]):
+        with file_lock(self.cache_path):
+            cache = self._read_cache()
+            if entry is None:
+                cache.pop(self.device_name, None)
+            else:
+                cache[self.device_name] = entry
+            atomic_write_json(self.cache_path, cache)
+
+    # -------------------- Durum okuma --------------------
+    def _read_settings(self, keys: Sequence[str]) -> Dict[str, str]:
+        commands = [f"settings get {key.split('/')[0]} {key.split('/')[1]}" for key in keys]
+        return {key: output.strip() for key, output in zip(keys, self.adb.shell_many(commands))}
+
+    def _package_versions(self) -> Dict[str, str]:
+        commands = [f"dumpsys package {package} | grep -m2 -E 'versionCode|lastUpdateTime'"
+                    for package in self.profile.permissions]
+        return {package: " ".join(output.split())
+                for package, output in zip(self.profile.permissions, self.adb.shell_many(commands))}
+
+    def _granted_permissions(self, package: str) -> List[str]:
+        return _GRANTED_PATTERN.findall(self.adb.shell(f"dumpsys package {package}"))
+
+    def fingerprint(self) -> str:
+        """Profil + build + paket sürümleri + mevcut ayar değerlerinin özeti"""
+        settings = self._read_settings(list(self.profile.settings()))
+        state = {
+            "profile": self.profile.digest(),
+            "build": self.adb.shell("getprop ro.build.fingerprint").strip(),
+            "packages": self._package_versions(),
+            "settings": {key: _normalize(value) for key, value in settings.items()},
+        }
+        return hashlib.sha1(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def is_provisioned(self) -> bool:
+        cached = self._cached_entry().get("fingerprint")
+        return cached is not None and cached == self.fingerprint()
+
+    # -------------------- Uygulama --------------------
+    def dismiss_keyguard(self):
+        self.adb.shell_many(["input keyevent KEYCODE_WAKEUP", "wm dismiss-keyguard"])
+
+    def apply(self, force: bool = False) -> bool:
+        """Profili uygular; zaten uygulanmışsa yalnızca kilit ekranını kapatır.
+
+        Returns:
+            True: profil bu çağrıda uygulandı, False: önbellekteki parmak izi geçerliydi
+        """
+        if self.profile.dismiss_keyguard:
+            self.dismiss_keyguard()
+        entry = self._cached_entry()
+        current = self.fingerprint()
+        if not force and entry.get("fingerprint") == current:
+            print(f"[{self.device_name}] Provizyon profili geçerli, yeniden uygulanmadı")
+            return False
+
+        wanted = self.profile.settings()
+        known_missing = None
+        if "restored_fingerprint" in entry:
+            # Önceki çalıştırmanın sonunda geri yüklendi: cihaz orijinal ayarlarda, verilen izinler geri alındı
+            originals = self._read_settings(list(wanted))
+            newly_granted = {}
+            if entry["restored_fingerprint"] == current:
+                # Geri yüklemeden beri cihaz değişmedi; eksik izinler bilinir, paket başına dumpsys atlanır
+                known_missing = entry.get("granted", {})
+        else:
+            # Orijinaller yalnızca ilk provizyonda kaydedilir; sonraki uygulamalar bunları ezmez
+            originals = entry.get("original_settings") or self._read_settings(list(wanted))
+            newly_granted = {package: list(perms) for package, perms in entry.get("granted", {}).items()}
+
+        commands = [f"settings put {key.split('/')[0]} {key.split('/')[1]} {value}"
+                    for key, value in wanted.items()]
+        self.adb.shell_many(commands)
+
+        for package, permissions in self.profile.permissions.items():
+            if known_missing is not None:
+                missing = [permission for permission in known_missing.get(package, []) if permission in permissions]
+            else:
+                already = set(self._granted_permissions(package))
+                missing = [permission for permission in permissions if permission not in already]
+            if not missing:
+                continue
+            results = self.adb.run_many([f"pm grant {package} {permission}" for permission in missing])
+            for permission, (returncode, output) in zip(missing, results):
+                if returncode == 0:
+                    newly_granted.setdefault(package, [])
+                    if permission not in newly_granted[package]:
+                        newly_granted[package].append(permission)
+                else:
+                    # Uygulamanın istemediği veya bu Android sürümünde olmayan izinler atlanır
+                    print(f"[{self.device_name}] pm grant {permission} atlandı: {output.strip()}")
+
+        self._store_entry({
+            "fingerprint": self.fingerprint(),
+            "original_settings": originals,
+            "granted": newly_granted,
+        })
+        print(f"[{self.device_name}] Provizyon profili uygulandı")
+        return True
+
+    def restore(self):
+        """Orijinal ayarları geri yükler ve provizyonun verdiği izinleri geri alır.
+
+        Profil cihazda hiçbir şeyi değiştirmediyse (ayarlar zaten profildeki gibiydi, yeni
+        izin verilmedi) komut gönderilmez ve parmak izi geçerli kalır. Aksi halde önbellek
+        silinmez; geri yüklenen durumun parmak izi saklanır ve sonraki `apply` cihaz
+        değişmediyse izinleri tek tek sorgulamadan yeniden uygular.
+        """
+        entry = self._cached_entry()
+        if not entry or "restored_fingerprint" in entry:
+            return
+        wanted = self.profile.settings()
+        commands = []
+        for key, value in entry.get("original_settings", {}).items():
+            if _normalize(value) == wanted.get(key):
+                continue
+            namespace, name = key.split("/")
+            if value in ("", "null"):
+                commands.append(f"settings delete {namespace} {name}")
+            else:
+                commands.append(f"settings put {namespace} {name} {value}")
+        for package, permissions in entry.get("granted", {}).items():
+            commands.extend(f"pm revoke {package} {permission}" for permission in permissions)
+        if not commands:
+            print(f"[{self.device_name}] Geri yüklenecek ayar yok, provizyon önbelleği korundu")
+            return
+        self.adb.run_many(commands)
+        self._store_entry({
+            "restored_fingerprint": self.fingerprint(),
+            "original_settings": entry.get("original_settings", {}),
+            "granted": entry.get("granted", {}),
+        })
+        print(f"[{self.device_name}] Orijinal cihaz ayarları geri yüklendi")
+
+
+def provision_devices(device_names: Sequence[str], profile: Optional[ProvisioningProfile] = None,
+                      restore: bool = False, max_workers: int = 8) -> Dict[str, bool]:
+    """Profili (veya geri yüklemeyi) cihazlara paralel uygular; {cihaz: başarı} döndürür"""
+    def run(device_name: str) -> bool:
+        try:
+            provisioner = DeviceProvisioner(device_name, profile)
+            if restore:
+                provisioner.restore()
+            else:
+                provisioner.apply()
+            return True
+        except (OSError, AdbError, TimeoutError) as e:
+            action = "Geri yükleme" if restore else "Provizyon"
+            print(f"[{device_name}] {action} hatası: {str(e)}")
+            return False
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(device_names, executor.map(run, device_names)))
+    finally:
+        # Ana süreçte açılan adb oturumları fork ile worker süreçlerine taşınmasın
+        AdbClient.close_all()
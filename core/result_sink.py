@@ -0,0 +1,138 @@
+import atexit
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class ResultSink:
+    """Cihaz başına tamponlu, JSON Lines formatında sonuç yazıcı.
+
+    Her kayıt `results_<cihaz>.jsonl` dosyasına tek satır JSON olarak yazılır.
+    Kayıtlar bellekte biriktirilir ve toplu olarak eklenir; dosya her log
+    satırında açılıp kapanmaz. Hata kayıtlarında, süreç çıkışında ve yakalanmamış
+    istisnada tampon hemen diske yazılır.
+
+    Kayıt alanları:
+        ts (duvar saati, ISO), mono (monotonic sn), device, step, status, message, duration_sec
+
+    Dosya çalıştırmalar boyunca büyür; `started_at` bu süreçteki kaydın başladığı
+    duvar saatidir (epoch sn) ve yalnızca bu çalıştırmayı seçmek için kullanılır.
+    """
+
+    _sinks: Dict[str, "ResultSink"] = {}
+    _lock = threading.Lock()
+    _hooks_installed = False
+
+    def __init__(self, device_name: str, directory: str = ".",
+                 flush_every: int = 50, flush_interval: float = 2.0):
+        self.device_name = device_name
+        self.path = os.path.join(directory, f"results_{device_name}.jsonl")
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._steps: List[tuple] = []
+        self.started_at = time.time()
+
+    @classmethod
+    def for_device(cls, device_name: str, directory: str = ".") -> "ResultSink":
+        """Süreç içinde cihaz başına tek sink döndürür"""
+        with cls._lock:
+            sink = cls._sinks.get(device_name)
+            if sink is None:
+                sink = cls(device_name, directory)
+                cls._sinks[device_name] = sink
+                cls._install_hooks()
+            return sink
+
+    @classmethod
+    def flush_all(cls):
+        for sink in list(cls._sinks.values()):
+            sink.flush()
+
+    @classmethod
+    def _install_hooks(cls):
+        """Süreç çıkışında, çökmede ve SIGTERM'de tamponları diske yazar"""
+        if cls._hooks_installed:
+            return
+        cls._hooks_installed = True
+        atexit.register(cls.flush_all)
+
+        previous_excepthook = sys.excepthook
+
+        def excepthook(exc_type, exc, tb):
+            cls.flush_all()
+            previous_excepthook(exc_type, exc, tb)
+
+        sys.excepthook = excepthook
+
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGTERM"):
+            if signal.getsignal(signal.SIGTERM) in (signal.SIG_DFL, None):
+                def on_sigterm(signum, frame):
+                    cls.flush_all()
+                    sys.exit(128 + signum)
+
+                signal.signal(signal.SIGTERM, on_sigterm)
+
+    # -------------------- Adımlar --------------------
+    @property
+    def current_step(self) -> Optional[str]:
+        return self._steps[-1][0] if self._steps else None
+
+    @contextmanager
+    def step(self, name: str):
+        """Adım başlangıcını ve bitişini (süresiyle) kaydeder; içteki kayıtlar bu adımla etiketlenir"""
+        start = time.monotonic()
+        self._steps.append((name, start))
+        self.record("step_start", name)
+        status = "step_end"
+        try:
+            yield self
+        except Exception:
+            status = "step_failed"
+            raise
+        finally:
+            self._steps.pop()
+            self.record(status, name, step=name, duration_sec=time.monotonic() - start)
+
+    # -------------------- Yazma --------------------
+    def record(self, status: str, message, step: Optional[str] = None,
+               duration_sec: Optional[float] = None, **extra):
+        entry = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "mono": round(time.monotonic(), 6),
+            "device": self.device_name,
+            "step": step if step is not None else self.current_step,
+            "status": status,
+            "message": str(message),
+            "duration_sec": round(duration_sec, 6) if duration_sec is not None else None,
+        }
+        entry.update(extra)
+        line = json.dumps(entry, ensure_ascii=False)
+
+        with self._buffer_lock:
+            self._buffer.append(line)
+            due = (len(self._buffer) >= self.flush_every
+                   or time.monotonic() - self._last_flush >= self.flush_interval
+                   or status in ("Error", "Failure", "step_failed"))
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._buffer_lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            print(f"[{self.device_name}] ⚠ Failed to write results: {str(e)}")
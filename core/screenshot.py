@@ -0,0 +1,141 @@
+import os
+import queue
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from core.adb_client import AdbClient
+
+
+# android.graphics.PixelFormat değerleri -> piksel başına byte
+PIXEL_FORMAT_RGBA_8888 = 1
+PIXEL_FORMAT_RGBX_8888 = 2
+PIXEL_FORMAT_RGB_888 = 3
+PIXEL_FORMAT_BGRA_8888 = 5
+BYTES_PER_PIXEL = {
+    PIXEL_FORMAT_RGBA_8888: 4,
+    PIXEL_FORMAT_RGBX_8888: 4,
+    PIXEL_FORMAT_RGB_888: 3,
+    PIXEL_FORMAT_BGRA_8888: 4,
+}
+
+
+@dataclass
+class RawFrame:
+    """`screencap` (PNG'siz) çıktısı: cihazda kodlama yapılmadan alınan piksel verisi.
+
+    `data` başlıktaki `pixel_format` düzenindedir; PNG'ye çevirirken format dikkate alınır.
+    """
+    width: int
+    height: int
+    pixel_format: int
+    data: bytes
+
+    def to_png(self, compress_level: int = 1) -> bytes:
+        if self.pixel_format == PIXEL_FORMAT_RGB_888:
+            return encode_png(self.width, self.height, self.data, compress_level, channels=3)
+        if self.pixel_format == PIXEL_FORMAT_RGBA_8888:
+            return encode_png(self.width, self.height, self.data, compress_level)
+        pixels = bytearray(self.data)
+        if self.pixel_format == PIXEL_FORMAT_RGBX_8888:
+            # X baytı tanımsızdır; PNG'de tam opak yazılır
+            pixels[3::4] = b"\xff" * (len(pixels) // 4)
+        elif self.pixel_format == PIXEL_FORMAT_BGRA_8888:
+            pixels[0::4], pixels[2::4] = self.data[2::4], self.data[0::4]
+        else:
+            raise ValueError(f"Desteklenmeyen piksel formatı: {self.pixel_format}")
+        return encode_png(self.width, self.height, bytes(pixels), compress_level)
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def encode_png(width: int, height: int, pixels: bytes, compress_level: int = 1,
+               channels: int = 4) -> bytes:
+    """RGBA8888 (channels=4) veya RGB888 (channels=3) piksellerini PNG'ye çevirir (yalnızca zlib kullanır)"""
+    stride = width * channels
+    view = memoryview(pixels)
+    # Her satırın başına filtre tipi 0 (None) eklenir
+    scanlines = b"".join(b"\x00" + view[y * stride:(y + 1) * stride] for y in range(height))
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", header)
+            + _png_chunk(b"IDAT", zlib.compress(scanlines, compress_level))
+            + _png_chunk(b"IEND", b""))
+
+
+class ScreenCapture:
+    """Ekran görüntüsünü `exec-out screencap` ile doğrudan belleğe alır.
+
+    Cihazda dosya yazılmaz ve ayrıca `adb pull` yapılmaz. `capture_raw` PNG
+    kodlamasını da atlar; kodlama gerekiyorsa `ScreenshotWriter` arka planda yapar.
+    """
+
+    def __init__(self, device_name: str, adb: Optional[AdbClient] = None):
+        self.device_name = device_name
+        self.adb = adb or AdbClient.for_device(device_name)
+
+    def capture_png(self) -> bytes:
+        return self.adb.exec_out("screencap -p")
+
+    def capture_raw(self, display_id: Optional[int] = None) -> RawFrame:
+        command = "screencap" if display_id is None else f"screencap -d {display_id}"
+        data = self.adb.exec_out(command)
+        if len(data) < 12:
+            raise ValueError(f"[{self.device_name}] Geçersiz screencap çıktısı ({len(data)} byte)")
+
+        width, height, pixel_format = struct.unpack_from("<III", data, 0)
+        bytes_per_pixel = BYTES_PER_PIXEL.get(pixel_format)
+        if bytes_per_pixel is None:
+            raise ValueError(f"[{self.device_name}] Desteklenmeyen screencap piksel formatı: {pixel_format}")
+        # Android 9+ başlığa renk uzayı alanı ekler (12 yerine 16 byte)
+        header_size = len(data) - width * height * bytes_per_pixel
+        if header_size not in (12, 16):
+            raise ValueError(f"[{self.device_name}] Beklenmeyen screencap başlığı: {header_size} byte")
+        return RawFrame(width, height, pixel_format, data[header_size:])
+
+
+class ScreenshotWriter:
+    """Kareleri kuyruktan alıp arka plan iş parçacığında kodlayan ve diske yazan sınıf"""
+
+    def __init__(self, compress_level: int = 1, max_pending: int = 8):
+        self.compress_level = compress_level
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, frame: Union[RawFrame, bytes]):
+        """Kareyi yazma kuyruğuna ekler; kodlama çağıranı bekletmez"""
+        self._queue.put((path, frame))
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            path, frame = item
+            try:
+                data = frame.to_png(self.compress_level) if isinstance(frame, RawFrame) else frame
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(data)
+            except Exception as e:
+                print(f"Ekran görüntüsü yazılamadı ({path}): {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def close(self):
+        """Kuyruktaki tüm kareler yazılana kadar bekler"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,117 @@
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from appium import webdriver
+
+
+def backoff_delays(base: float = 1.0, cap: float = 30.0):
+    """Jitter'lı üstel bekleme süreleri üretir (1, 2, 4 ... sn, her biri [%50, %100] arası rastgele)"""
+    attempt = 0
+    while True:
+        delay = min(cap, base * (2 ** attempt))
+        yield random.uniform(delay / 2, delay)
+        attempt += 1
+
+
+CreateDriver = Callable[[str, int], Optional["webdriver.Remote"]]
+QuitDriver = Callable[["webdriver.Remote", str], None]
+
+
+class DriverSessionPool:
+    """Cihaz başına Appium oturumu tutan havuz.
+
+    Aynı cihazda art arda çalışan testler UiAutomator2 oturumunu yeniden
+    kullanır. Oturum, teslim edilmeden önce ucuz bir komutla kontrol edilir;
+    yalnızca sunucu oturumun geçersiz olduğunu bildirirse yeniden oluşturulur.
+    Diğer hatalar (ör. yeniden başlayan Appium sunucusuna bağlanılamaması) birkaç
+    kez yeniden denenir, sürerse çağırana iletilir. Test bitince oturum `release` ile havuza
+    geri bırakılır; yalnızca hata durumunda kapatılır.
+
+    Oturum oluşturma/kapatma fonksiyonları `acquire` çağrısında verilebilir; böylece
+    süreç genelindeki havuz ilk kullanan runner'ın ayarlarına bağlı kalmaz.
+
+    Örnek:
+        >>> pool = DriverSessionPool()
+        >>> driver = pool.acquire("L2897100765", 4723, runner._initialize_driver, runner._safe_quit_driver)
+        >>> ...
+        >>> pool.release("L2897100765")
+        >>> pool.close_all()
+    """
+
+    def __init__(self, create_driver: Optional[CreateDriver] = None,
+                 quit_driver: Optional[QuitDriver] = None, health_retries: int = 2):
+        """
+        Args:
+            health_retries: Sağlık kontrolünde geçici hatalar için yeniden deneme sayısı
+        """
+        self.create_driver = create_driver
+        self.quit_driver = quit_driver
+        self.health_retries = health_retries
+        # cihaz adı -> (driver, port, kapatma fonksiyonu)
+        self._sessions: Dict[str, Tuple["webdriver.Remote", int, Optional[QuitDriver]]] = {}
+
+    def is_healthy(self, driver: "webdriver.Remote", device_name: str) -> bool:
+        """Oturum geçersizse False döndürür; diğer hatalar yeniden denenir, sürerse yükseltilir"""
+        delays = backoff_delays(base=0.5, cap=2.0)
+        for attempt in range(self.health_retries + 1):
+            try:
+                driver.current_package
+                return True
+            except Exception as e:
+                from selenium.common.exceptions import InvalidSessionIdException, NoSuchDriverException
+                if isinstance(e, (InvalidSessionIdException, NoSuchDriverException)):
+                    print(f"[{device_name}] Oturum geçersiz, yeniden oluşturulacak: {str(e)}")
+                    return False
+                if attempt == self.health_retries:
+                    raise
+                delay = next(delays)
+                print(f"[{device_name}] Oturum kontrolü başarısız, {delay:.1f} sn sonra tekrar denenecek: {str(e)}")
+                time.sleep(delay)
+
+    def acquire(self, device_name: str, port: int, create_driver: Optional[CreateDriver] = None,
+                quit_driver: Optional[QuitDriver] = None) -> Optional["webdriver.Remote"]:
+        """Sağlıklı mevcut oturumu veya yeni oluşturulan oturumu döndürür.
+
+        Geçersiz oturum dışındaki bir hata yeniden denemelere rağmen sürerse istisna
+        yükseltilir; oturum havuzda kalır.
+        """
+        entry = self._sessions.get(device_name)
+        if entry is not None:
+            driver, session_port, _ = entry
+            if session_port == port and self.is_healthy(driver, device_name):
+                print(f"[{device_name}] Mevcut Appium oturumu yeniden kullanılıyor")
+                return driver
+            self.discard(device_name)
+
+        create_driver = create_driver or self.create_driver
+        if create_driver is None:
+            raise ValueError("Oturum oluşturma fonksiyonu verilmedi")
+        driver = create_driver(device_name, port)
+        if driver is not None:
+            self._sessions[device_name] = (driver, port, quit_driver or self.quit_driver)
+        return driver
+
+    def release(self, device_name: str, failed: bool = False):
+        """Test bitince çağrılır; oturum havuzda kalır, `failed` ise kapatılır"""
+        if failed:
+            self.discard(device_name)
+
+    def discard(self, device_name: str):
+        """Oturumu havuzdan çıkarır ve kapatmayı dener"""
+        entry = self._sessions.pop(device_name, None)
+        if entry is None:
+            return
+        driver, _, quit_driver = entry
+        if quit_driver:
+            quit_driver(driver, device_name)
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close_all(self):
+        for device_name in list(self._sessions):
+            self.discard(device_name)
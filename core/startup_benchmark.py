@@ -0,0 +1,111 @@
+"""
+Başlangıç süresi ölçümü: soğuk import ve spawn ile açılan worker maliyeti.
+
+Kullanım:
+    python -m core.startup_benchmark --module tests.test_cases --repeat 5 --workers 20
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import time
+from statistics import mean, median
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_cold_import(module: str, repeat: int = 5) -> Dict:
+    """Modülü her seferinde yeni bir yorumlayıcıda import edip süreyi ölçer"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=PROJECT_ROOT, check=True)
+        timings.append(time.perf_counter() - start)
+
+    # Yorumlayıcının kendi açılış süresi taban olarak çıkarılır
+    baseline = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        baseline.append(time.perf_counter() - start)
+
+    return {
+        "module": module,
+        "median_sec": median(timings),
+        "interpreter_sec": median(baseline),
+        "import_only_sec": median(timings) - median(baseline),
+    }
+
+
+def slowest_imports(module: str, top: int = 10) -> List[Dict]:
+    """`-X importtime` çıktısından en pahalı (kümülatif) importları döndürür"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)", line)
+        if match:
+            entries.append({"module": match.group(4), "self_ms": int(match.group(1)) / 1000,
+                            "cumulative_ms": int(match.group(2)) / 1000,
+                            "depth": len(match.group(3)) // 2})
+    # Yalnızca üst seviye (depth 0) importlar; iç içe olanlar ebeveynin kümülatifine zaten dahil,
+    # onları da saymak aynı süreyi iki kez listeler
+    top_level = [e for e in entries if e["depth"] == 0]
+    return sorted(top_level, key=lambda e: e["cumulative_ms"], reverse=True)[:top]
+
+
+def _spawn_probe(module: str, started: float, queue):
+    __import__(module)
+    queue.put(time.time() - started)
+
+
+def measure_spawn(module: str, workers: int = 20) -> Dict:
+    """`workers` adet spawn süreci açar; her birinin modülü import edip hazır olma süresini ölçer"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    if PROJECT_ROOT not in sys.path:
+        sys.path.insert(0, PROJECT_ROOT)
+
+    start = time.perf_counter()
+    processes = [context.Process(target=_spawn_probe, args=(module, time.time(), queue))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    ready = [queue.get() for _ in processes]
+    total = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    return {
+        "workers": workers,
+        "all_ready_sec": total,
+        "mean_worker_ready_sec": mean(ready),
+        "max_worker_ready_sec": max(ready),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runner başlangıç süresi ölçümü")
+    parser.add_argument("--module", default="tests.test_cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=20)
+    args = parser.parse_args()
+
+    cold = measure_cold_import(args.module, args.repeat)
+    print(f"Soğuk import ({cold['module']}): {cold['median_sec'] * 1000:.0f} ms "
+          f"(yorumlayıcı {cold['interpreter_sec'] * 1000:.0f} ms, import {cold['import_only_sec'] * 1000:.0f} ms)")
+
+    print("En pahalı importlar:")
+    for entry in slowest_imports(args.module):
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+    spawn = measure_spawn(args.module, args.workers)
+    print(f"Spawn ({spawn['workers']} worker): tümü hazır {spawn['all_ready_sec']:.2f} sn, "
+          f"worker başına ort. {spawn['mean_worker_ready_sec']:.2f} sn, en yavaş {spawn['max_worker_ready_sec']:.2f} sn")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,359 @@
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
-from multiprocessing import Process
+from multiprocessing import Process, Queue
+from queue import Empty
 import time
 from typing import List, Dict, Optional
 from selenium.common.exceptions import WebDriverException
 import subprocess
 from datetime import datetime
 import os
-import pandas as pd
-import numpy as np
-import re
+from core.adb_client import AdbClient, AdbError
+from core.result_sink import ResultSink
+from core.session_pool import DriverSessionPool, backoff_delays
+
+# NumPy kullanan analiz modülleri (perf_parsers, perf_collector, perf_sampler) burada
+# import edilmez; spawn ile açılan her cihaz süreci ölçüm yapmadıkça bu maliyeti ödemez.
+
+# Appium oturumları süreç başına tutulur (driver nesneleri süreçler arası taşınamaz).
+# Oluşturma/kapatma fonksiyonları her acquire çağrısında runner'dan verilir.
+_SESSION_POOL = DriverSessionPool()
+
 
 class BaseTestRunner:
+    # Suite modunda worker'ların hâlâ yaşadığı bu aralıkla (sn) kontrol edilir
+    WORKER_POLL_INTERVAL = 5.0
+
     def __init__(self, devices: List[Dict], 
                  browser_configs: List[Dict], 
                  global_timeout: int = 120, 
-                 output_dir="C:\\Users\\halil.cakir\\Desktop\\parallel_test\\Logs"):
-        
-        
+                 output_dir="C:\\Users\\halil.cakir\\Desktop\\parallel_test\\Logs",
+                 sample_interval: Optional[float] = None,
+                 sample_package: Optional[str] = None,
+                 sample_capacity: int = 3600,
+                 provisioning=None,
+                 restore_provisioning: bool = True,
+                 log_sync: bool = False,
+                 artifact_store: bool = False,
+                 archive_logs: bool = False,
+                 index_logs: bool = False,
+                 timeline: bool = False):
+        """
+        Args:
+            sample_interval: Verilirse test boyunca bu aralıkla (sn) performans örneklenir
+            sample_package: CPU/bellek/FPS ölçümü yapılacak uygulama paketi
+            sample_capacity: Halka tamponda tutulacak en fazla örnek sayısı
+            provisioning: True (varsayılan profil) veya ProvisioningProfile; testlerden önce
+                animasyonları kapatır, izinleri verir, ekranı açık tutar
+            restore_provisioning: Çalıştırma bitince orijinal cihaz ayarlarını geri yükle
+            log_sync: debuglogger'ı her seferinde tümüyle çekmek yerine yalnızca yeni/büyüyen
+                dosyaları aktar (çalıştırma dizinleri hardlink'lerle yine tam görünüm sunar).
+                Varsayılan kapalıdır; `<output_dir>/.sync` altında kalıcı bir ayna tutar
+            artifact_store: Çekilen logları `<output_dir>/.store` içerik adresli deposuna al;
+                cihazlar ve çalıştırmalar arasında aynı dosyalar tek kopya tutulur
+            archive_logs: Çekilen çalıştırma dizinini seek edilebilir sıkıştırılmış
+                `<dizin>.logarc` arşivine çevir ve dizini sil (bkz. core.log_archive).
+                artifact_store ile birlikte kullanılamaz: arşivlenip silinen dizinin depo
+                kaydı gc'de düşer ve blob'lar yalnızca arşivde kalır. log_sync ile de
+                kullanılamaz: silinen yalnızca hardlink'lerdir, veri `.sync` aynasında kalır
+            index_logs: mobilelog satırlarını `<output_dir>/log_index.sqlite` indeksine ekle
+                (seviye/tag/zaman/metin sorguları için, bkz. core.log_index)
+            timeline: Sonuçları, mobilelog, kernel ve tcpdump kayıtlarını tek zaman sıralı
+                `<dizin>/timeline_<cihaz>.tsv` görünümünde birleştir (bkz. core.timeline)
+        """
+        if artifact_store and archive_logs:
+            raise ValueError("artifact_store ve archive_logs birlikte kullanılamaz; birini seçin")
+        if log_sync and archive_logs:
+            raise ValueError("log_sync ve archive_logs birlikte kullanılamaz; birini seçin")
+
         self.devices = devices
         self.browser_configs = browser_configs
         self.global_timeout = global_timeout
         self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.sample_package = sample_package
+        self.sample_capacity = sample_capacity
+        self.provisioning = provisioning
+        self.restore_provisioning = restore_provisioning
+        self.log_sync = log_sync
+        self.artifact_store = artifact_store
+        self.archive_logs = archive_logs
+        self.index_logs = index_logs
+        self.timeline = timeline
+
+    # -------------------- Provizyon --------------------
+    def _provision_devices(self, restore: bool = False):
+        """Provizyon açıksa profili tüm cihazlara paralel uygular (veya geri yükler)"""
+        if not self.provisioning or (restore and not self.restore_provisioning):
+            return
+        from core.provisioning import ProvisioningProfile, provision_devices
+        profile = self.provisioning if isinstance(self.provisioning, ProvisioningProfile) else None
+        provision_devices([device["name"] for device in self.devices], profile, restore=restore)
 
     def run_parallel_tests(self, test_case):
-        processes = []
-        for device in self.devices:
-            process = Process(target=self.run_test, args=(device, test_case))
-            process.start()
-            processes.append(process)
-        
-        for process in processes:
-            process.join()
+        """Tek testi her cihazda ayrı bir süreçte çalıştırır.
+
+        Her çağrı cihaz başına yeni bir süreç açar ve süreç bitince oturumu kapatır;
+        oturum havuzundaki yeniden kullanım burada geçerli değildir. Art arda çalışan
+        testlerde oturumun korunması için `run_suite` kullanın.
+        """
+        self._provision_devices()
+        try:
+            processes = []
+            for device in self.devices:
+                process = Process(target=self._run_test_process, args=(device, test_case))
+                process.start()
+                processes.append(process)
+
+            for process in processes:
+                process.join()
+        finally:
+            self._provision_devices(restore=True)
+
+    def _run_test_process(self, device: Dict, test_case):
+        # Süreç bitince havuzdaki oturum kapatılır; multiprocessing alt süreçlerinde atexit çalışmaz
+        try:
+            self.run_test(device, test_case)
+        finally:
+            _SESSION_POOL.close_all()
 
     def run_test(self, device: Dict, test_case):
+        """Testi cihazda çalıştırır. Oturum test sonunda havuza bırakılır; aynı süreçte
+        sonraki `run_test` çağrıları onu yeniden kullanır, yalnızca hata olursa kapatılır."""
         device_name = device["name"]
         port = device["port"]
+        ResultSink.for_device(device_name)  # Zaman çizelgesi bu andan itibaren filtrelenir
         
         try:
-            driver = self._initialize_driver(device_name, port)
+            driver = _SESSION_POOL.acquire(device_name, port, self._initialize_driver, self._safe_quit_driver)
             if not driver:
                 return
                 
+            failed = True
             try:
-                get_temp = AndroidPerformanceMonitor(device_name)
-                get_temp.get_thermal_status()
-                test_case.run_with_retry(driver, device_name)
-                
+                self._execute_test_case(driver, device_name, test_case)
 
                 self._pull_debug_logs(device_name)
+                failed = False
             finally:
-                self._safe_quit_driver(driver, device_name)
+                _SESSION_POOL.release(device_name, failed=failed)
         except Exception as e:
             print(f"[{device_name}] Test sırasında hata: {str(e)}")
+        finally:
+            ResultSink.flush_all()
+
+    def _execute_test_case(self, driver, device_name: str, test_case) -> bool:
+        """Tek bir testi (isteğe bağlı performans örneklemesiyle) çalıştırır"""
+        monitor = AndroidPerformanceMonitor(device_name)
+        sampler = self._start_sampler(device_name, monitor)
+        if sampler is None:
+            monitor.get_thermal_status()
+            return test_case.run_with_retry(driver, device_name)
+        try:
+            return test_case.run_with_retry(driver, device_name)
+        finally:
+            self._stop_sampler(device_name, sampler)
+
+    def _start_sampler(self, device_name: str, monitor=None):
+        """`sample_interval` verildiyse arka plan örnekleyicisini başlatır, yoksa None döndürür"""
+        if not self.sample_interval:
+            return None
+        from core.perf_sampler import PerformanceSampler
+        sampler = PerformanceSampler(monitor or AndroidPerformanceMonitor(device_name), self.sample_package,
+                                     self.sample_interval, self.sample_capacity)
+        sampler.start()
+        return sampler
+
+    def _stop_sampler(self, device_name: str, sampler):
+        try:
+            sampler.stop()
+        finally:
+            # Test hata verse de o ana kadarki örnekler kaydedilir
+            self._save_performance_report(device_name, sampler.report())
+
+    # -------------------- Suite Modu --------------------
+    def run_suite(self, test_cases: List, shared_queue: bool = False,
+                  pull_logs_per_test: bool = False) -> Dict[str, List[Dict]]:
+        """Test listesini cihaz başına tek, uzun ömürlü worker süreciyle çalıştırır.
+
+        Süreç açma, driver oluşturma ve kapatma her test için değil, cihaz başına
+        bir kez yapılır. Worker'lar işi kuyruktan çeker ve her testin sonucunu
+        ana sürece bildirir.
+
+        Args:
+            test_cases: BaseTest örnekleri
+            shared_queue: False ise her cihaz tüm testleri çalıştırır; True ise testler
+                tek ortak kuyruktan cihazlar arasında paylaştırılır
+            pull_logs_per_test: True ise her testten sonra, False ise suite sonunda log çekilir
+
+        Returns:
+            {cihaz_adı: [{"index", "test", "passed", "duration_sec", "error"}, ...]}. Driver'ı
+            başlatılamayan veya ölen worker'ın çalıştıramadığı testler de `passed=False`
+            ve hata mesajıyla yer alır.
+        """
+        self._provision_devices()
+        try:
+            return self._run_suite_workers(test_cases, shared_queue, pull_logs_per_test)
+        finally:
+            self._provision_devices(restore=True)
+
+    def _run_suite_workers(self, test_cases: List, shared_queue: bool,
+                           pull_logs_per_test: bool) -> Dict[str, List[Dict]]:
+        result_queue = Queue()
+        if shared_queue:
+            queue = Queue()
+            for index in range(len(test_cases)):
+                queue.put(index)
+            work_queues = {device["name"]: queue for device in self.devices}
+        else:
+            work_queues = {}
+            for device in self.devices:
+                work_queues[device["name"]] = Queue()
+                for index in range(len(test_cases)):
+                    work_queues[device["name"]].put(index)
+        # Her worker için bir bitiş işareti (ortak kuyrukta cihaz sayısı kadar)
+        for device in self.devices:
+            work_queues[device["name"]].put(None)
+
+        processes = []
+        for device in self.devices:
+            process = Process(target=self._suite_worker,
+                              args=(device, test_cases, work_queues[device["name"]],
+                                    result_queue, pull_logs_per_test, shared_queue))
+            process.start()
+            processes.append(process)
+
+        results: Dict[str, List[Dict]] = {device["name"]: [] for device in self.devices}
+        workers = {device["name"]: process for device, process in zip(self.devices, processes)}
+        finished = set()
+        unavailable = []  # Driver'ı başlatamayan veya ölen worker'lar
+
+        def handle(message: Dict):
+            if message.get("done"):
+                finished.add(message["device"])
+                if message.get("driver_error"):
+                    unavailable.append(message["device"])
+                return
+            results[message["device"]].append(message)
+            status = "PASS" if message["passed"] else "FAIL"
+            print(f"[{message['device']}] [{status}] {message['test']} ({message['duration_sec']:.1f} sn)")
+
+        while len(finished) < len(workers):
+            try:
+                handle(result_queue.get(timeout=self.WORKER_POLL_INTERVAL))
+                continue
+            except Empty:
+                pass
+            # Sinyalle öldürülen (OOM, SIGKILL) worker bitiş mesajı gönderemez; beklemede kalınmaz
+            dead = [name for name, process in workers.items()
+                    if name not in finished and not process.is_alive()]
+            if not dead:
+                continue
+            # Ölmeden önce kuyruğa yazdıkları kaybolmasın
+            while True:
+                try:
+                    handle(result_queue.get_nowait())
+                except Empty:
+                    break
+            for name in dead:
+                if name not in finished:
+                    error = f"Worker süreci beklenmedik şekilde kapandı (çıkış kodu {workers[name].exitcode})"
+                    print(f"[{name}] {error}; kalan testleri çalıştırılmadı")
+                    finished.add(name)
+                    unavailable.append(name)
+                    if not shared_queue:
+                        reported = {row["index"] for row in results[name]}
+                        for index in range(len(test_cases)):
+                            if index not in reported:
+                                handle(self._result_message(name, index, test_cases[index], False, error))
+
+        if shared_queue:
+            # Kuyrukta kalan ya da ölen worker'la kaybolan testler hiçbir cihazda çalışmadı
+            self._drain(queue)
+            reported = {row["index"] for rows in results.values() for row in rows}
+            missing = [index for index in range(len(test_cases)) if index not in reported]
+            owners = unavailable or [device["name"] for device in self.devices]
+            for position, index in enumerate(missing):
+                handle(self._result_message(owners[position % len(owners)], index, test_cases[index],
+                                            False, "Test hiçbir cihazda çalıştırılamadı"))
+
+        for process in processes:
+            process.join()
+        return results
+
+    @staticmethod
+    def _result_message(device_name: str, index: int, test_case, passed: bool,
+                        error: Optional[str] = None, duration_sec: float = 0.0) -> Dict:
+        return {"device": device_name, "index": index, "test": type(test_case).__name__,
+                "passed": passed, "duration_sec": duration_sec, "error": error}
+
+    @staticmethod
+    def _drain(queue, timeout: float = 0.1) -> List:
+        items = []
+        while True:
+            try:
+                items.append(queue.get(timeout=timeout))
+            except Empty:
+                return items
+
+    def _suite_worker(self, device: Dict, test_cases: List, work_queue, result_queue,
+                      pull_logs_per_test: bool, shared_queue: bool = False):
+        device_name = device["name"]
+        pool = _SESSION_POOL
+        driver_error = None
+        ResultSink.for_device(device_name)  # Zaman çizelgesi bu andan itibaren filtrelenir
+        try:
+            try:
+                driver = pool.acquire(device_name, device["port"], self._initialize_driver, self._safe_quit_driver)
+                if not driver:
+                    raise WebDriverException("Driver başlatılamadı")
+            except Exception as e:
+                driver_error = str(e)
+                print(f"[{device_name}] {driver_error}")
+                # Ortak kuyruktaki testler diğer cihazlara kalır; cihaza özel kuyruk başarısız raporlanır
+                if not shared_queue:
+                    for index in self._drain(work_queue):
+                        if index is not None:
+                            result_queue.put(self._result_message(device_name, index, test_cases[index],
+                                                                  False, driver_error))
+                return
+
+            while True:
+                index = work_queue.get()
+                if index is None:
+                    break
+
+                test_case = test_cases[index]
+                start = time.monotonic()
+                error = None
+                try:
+                    # Oturum sağlıklıysa yeniden kullanılır, geçersizse yeniden oluşturulur
+                    driver = pool.acquire(device_name, device["port"],
+                                          self._initialize_driver, self._safe_quit_driver)
+                    if not driver:
+                        raise WebDriverException("Driver başlatılamadı")
+                    passed = bool(self._execute_test_case(driver, device_name, test_case))
+                except Exception as e:
+                    passed, error = False, str(e)
+                    pool.release(device_name, failed=True)
+                result_queue.put(self._result_message(device_name, index, test_case, passed, error,
+                                                      time.monotonic() - start))
+                if pull_logs_per_test:
+                    self._pull_debug_logs(device_name)
+
+            if not pull_logs_per_test:
+                self._pull_debug_logs(device_name)
+        except Exception as e:
+            print(f"[{device_name}] Suite sırasında hata: {str(e)}")
+        finally:
+            # Worker süreci bitiyor; oturum kapatılır
+            pool.discard(device_name)
+            ResultSink.flush_all()
+            result_queue.put({"device": device_name, "done": True, "driver_error": driver_error})
 
     def _initialize_driver(self, device_name: str, port: int) -> Optional[webdriver.Remote]:
         start_time = time.time()
+        delays = backoff_delays()
         
         while time.time() - start_time < self.global_timeout:
             try:
@@ -70,8 +368,10 @@ class BaseTestRunner:
                 return driver
                     
             except WebDriverException as e:
-                print(f"[{device_name}] Driver başlatma hatası: {str(e)}")
-                time.sleep(5)
+                # Sabit 5 sn yerine jitter'lı üstel bekleme; cihazlar aynı anda yeniden denemez
+                delay = min(next(delays), max(0.0, self.global_timeout - (time.time() - start_time)))
+                print(f"[{device_name}] Driver başlatma hatası: {str(e)} ({delay:.1f} sn sonra tekrar denenecek)")
+                time.sleep(delay)
 
         print(f"[{device_name}] Driver başlatma zaman aşımına uğradı")
         return None
@@ -80,10 +380,9 @@ class BaseTestRunner:
         """Cihazdan debug logger klasörünü çeker"""
         try:
             # Cihazdaki debuglogger klasörünü kontrol et
-            check_cmd = f"adb -s {device_name} shell ls /sdcard/debuglogger"
-            result = subprocess.run(check_cmd, shell=True, capture_output=True, text=True)
+            returncode, _ = AdbClient.for_device(device_name).run("ls /sdcard/debuglogger")
             
-            if result.returncode != 0:
+            if returncode != 0:
                 print(f"[{device_name}] debuglogger klasörü bulunamadı")
                 return
 
@@ -92,26 +391,103 @@ class BaseTestRunner:
             target_dir = os.path.join(self.output_dir, f"{device_name}_{timestamp}")
             os.makedirs(target_dir, exist_ok=True)
 
-            # ADB pull komutu ile logları çek
-            pull_cmd = f"adb -s {device_name} pull /sdcard/debuglogger {target_dir}"
-            subprocess.run(pull_cmd, shell=True, check=True)
+            if self.log_sync:
+                # Yalnızca yeni/büyüyen dosyalar aktarılır, önceki dosyalar hardlink'lenir
+                from core.log_sync import DebugLogSync
+                stats = DebugLogSync(device_name, self.output_dir).sync_into(target_dir)
+                print(f"[{device_name}] debuglogger senkronize edildi: {stats}")
+            else:
+                # ADB pull komutu ile logları çek
+                subprocess.run(["adb", "-s", device_name, "pull", "/sdcard/debuglogger", target_dir], check=True)
             
-            print(f"[{device_name}] debuglogger logları {target_dir} dizinine kopyalandı")
-            
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            try:
-                with open(f"results_{device_name}.txt", "a", encoding="utf-8") as f:
-                    f.write(f"[{device_name}] [{timestamp}] : debuglogger logları {target_dir} dizinine kopyalandı")
-            except Exception as e:
-                print(f"[{device_name}] ⚠ Failed to write results: {str(e)}")
-          
+            self._process_pulled_logs(device_name, target_dir)
 
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, AdbError) as e:
             print(f"[{device_name}] Log çekme hatası: {str(e)}")
         except Exception as e:
             print(f"[{device_name}] Beklenmeyen hata: {str(e)}")
 
 
+    def _process_pulled_logs(self, device_name: str, target_dir: str):
+        """Çekilen çalıştırma dizini için depolama, indeks, zaman çizelgesi ve arşiv adımları.
+
+        Sıra önemlidir: indeks ve zaman çizelgesi dizin arşivlenip silinmeden önce yazılır.
+        """
+        print(f"[{device_name}] debuglogger logları {target_dir} dizinine kopyalandı")
+        self._store_artifacts(device_name, target_dir)
+        self._index_logs(device_name, target_dir)
+        self._build_timeline(device_name, target_dir)
+        self._archive_run(device_name, target_dir)
+        ResultSink.for_device(device_name).record(
+            "Logs", f"debuglogger logları {target_dir} dizinine kopyalandı", path=target_dir)
+
+    def _store_artifacts(self, device_name: str, target_dir: str):
+        """Çalıştırma dizinini içerik adresli depoya alır (aynı dosyalar tek blob'a bağlanır)"""
+        if not self.artifact_store:
+            return
+        from core.artifact_store import ArtifactStore
+        try:
+            stats = ArtifactStore(os.path.join(self.output_dir, ".store")).ingest_tree(target_dir)
+            print(f"[{device_name}] Artifact deposu: {stats}")
+        except OSError as e:
+            print(f"[{device_name}] Artifact deposuna alınamadı: {str(e)}")
+
+    def _index_logs(self, device_name: str, target_dir: str):
+        """mobilelog dosyalarını SQLite indeksine ekler (arşivlemeden önce çalışmalı)"""
+        if not self.index_logs:
+            return
+        import sqlite3
+        from core.log_index import LogIndex
+        try:
+            with LogIndex(os.path.join(self.output_dir, "log_index.sqlite")) as index:
+                result = index.ingest_tree(target_dir)
+            print(f"[{device_name}] Log indeksi güncellendi: {result['files']} dosya, {result['lines']} yeni satır")
+        except (OSError, sqlite3.Error) as e:
+            print(f"[{device_name}] Log indeksi güncellenemedi: {str(e)}")
+
+    def _build_timeline(self, device_name: str, target_dir: str):
+        """Çalıştırmanın birleşik zaman çizelgesini yazar (arşivlemeden önce çalışmalı).
+
+        Sonuç dosyası ve çekilen loglar önceki çalıştırmaları da içerdiği için olaylar
+        bu süreçteki sink'in başladığı andan şimdiye kadar olanlarla sınırlanır.
+        """
+        if not self.timeline:
+            return
+        from core.timeline import TimelineBuilder
+        sink = ResultSink.for_device(device_name)
+        sink.flush()
+        try:
+            path, count = TimelineBuilder(target_dir, device_name, result_paths=[sink.path]).write(
+                since=sink.started_at, until=time.time())
+            print(f"[{device_name}] Zaman çizelgesi yazıldı: {path} ({count} olay)")
+        except (OSError, ValueError) as e:
+            print(f"[{device_name}] Zaman çizelgesi yazılamadı: {str(e)}")
+
+    def _archive_run(self, device_name: str, target_dir: str):
+        if not self.archive_logs:
+            return
+        from core.log_archive import archive_run
+        try:
+            result = archive_run(target_dir, remove_source=True)
+            print(f"[{device_name}] Loglar arşivlendi: {result['path']} "
+                  f"({result['original_bytes'] / 1e6:.1f} MB -> {result['archive_bytes'] / 1e6:.1f} MB)")
+        except (OSError, ImportError) as e:
+            print(f"[{device_name}] Loglar arşivlenemedi: {str(e)}")
+
+    def _save_performance_report(self, device_name: str, report: Dict):
+        """Örnekleyici raporunu .npz olarak kaydeder ve özeti yazdırır"""
+        import numpy as np
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(self.output_dir, f"perf_{device_name}_{timestamp}.npz")
+            np.savez_compressed(path, samples=report["samples"], columns=np.array(report["columns"]))
+            print(f"[{device_name}] Performans özeti ({report['total_samples']} örnek): {report['summary']}")
+            print(f"[{device_name}] Performans zaman serisi {path} dosyasına kaydedildi")
+        except Exception as e:
+            print(f"[{device_name}] Performans raporu kaydedilemedi: {str(e)}")
+
     def _get_driver_options(self, device_name: str) -> UiAutomator2Options:
         options = UiAutomator2Options()
         options.platform_name = "Android"
@@ -142,9 +518,28 @@ class AndroidPerformanceMonitor:
     def __init__(self, device_name: str = None):
         self.device_name = device_name
         self.adb_prefix = f"adb -s {device_name}" if device_name else "adb"
+        self.adb = AdbClient.for_device(device_name)
+
+    @property
+    def parsers(self):
+        """NumPy kullanan parser modülünü ilk ölçümde yükler"""
+        from core import perf_parsers
+        return perf_parsers
 
     def _run_adb_command(self, command: str) -> str:
         """Temel ADB komut çalıştırma metodu"""
+        if command.startswith("shell "):
+            # shell komutları kalıcı adb soket oturumundan geçer (süreç başlatılmaz)
+            try:
+                returncode, output = self.adb.run(command[len("shell "):])
+            except (OSError, AdbError) as e:
+                print(f"ADB command failed: {str(e)}")
+                return ""
+            if returncode != 0:
+                print(f"ADB command failed: {output}")
+                return ""
+            return output
+
         try:
             result = subprocess.run(
                 f"{self.adb_prefix} {command}",
@@ -162,97 +557,43 @@ class AndroidPerformanceMonitor:
     def get_surfaceflinger_fps(self, package_name: str, duration_sec: int = 5) -> Dict:
         """SurfaceFlinger ile frame zamanlamalarını alır"""
         raw_data = self._run_adb_command(f"shell dumpsys SurfaceFlinger --latency {package_name}")
-        frame_times = [line.split() for line in raw_data.strip().split('\n')[1:]]
-        
-        if not frame_times or len(frame_times[0]) < 3:
-            return {"error": "No frame data available"}
-        
-        timestamps = [int(frame[0]) for frame in frame_times]
-        frame_durations = np.diff(timestamps) / 1e6  # nanosaniye -> milisaniye
-        
-        return {
-            "avg_fps": 1000 / np.mean(frame_durations) if frame_durations.size > 0 else 0,
-            "janky_frames": np.sum(frame_durations > 16.67),  # 60fps'de 16.67ms/frame
-            "frame_data": frame_times
-        }
+        return self.parsers.parse_surfaceflinger_latency(raw_data)
 
     def get_gfxinfo_fps(self, package_name: str) -> Dict:
         """gfxinfo ile render performans verilerini alır"""
         raw_data = self._run_adb_command(f"shell dumpsys gfxinfo {package_name} framestats")
-        
-        # Frame timing verilerini parse etme
-        frame_stats = [line.split(',') for line in raw_data.split('\n') 
-                      if re.match(r'^\d+,', line)]
-        
-        if not frame_stats:
-            return {"error": "No gfxinfo data available"}
-        
-        df = pd.DataFrame(frame_stats).astype(float)
-        percentiles = df.describe(percentiles=[.90, .95])
-        
-        return {
-            "90th_percentile": percentiles.loc["95%"].values[0],
-            "95th_percentile": percentiles.loc["95%"].values[0],
-            "total_frames": len(frame_stats)
-        }
+        return self.parsers.parse_gfxinfo_framestats(raw_data)
 
     # -------------------- Sistemsel Metrikler --------------------
     def get_cpu_usage(self, package_name: str) -> Dict:
         """Uygulamanın CPU kullanımını alır"""
         raw_data = self._run_adb_command(f"shell top -n 1 -b | grep {package_name}")
-        if not raw_data:
-            return {"error": "Process not found"}
-        
-        parts = re.split(r'\s+', raw_data.strip())
-        return {
-            "cpu_percent": float(parts[8]),
-            "threads": int(parts[9])
-        }
+        return self.parsers.parse_top(raw_data, package_name)
 
     def get_memory_info(self, package_name: str) -> Dict:
         """Detaylı bellek kullanım bilgisi"""
         raw_data = self._run_adb_command(f"shell dumpsys meminfo {package_name}")
-        if "No process found" in raw_data:
-            return {"error": "Process not found"}
-        
-        # Örnek parse (gerçek uygulamada daha detaylı parsing gerekir)
-        return {
-            "pss_kb": self._parse_mem_value(raw_data, "PSS"),
-            "private_dirty": self._parse_mem_value(raw_data, "Private Dirty")
-        }
+        return self.parsers.parse_meminfo(raw_data)
 
     def _parse_mem_value(self, raw_data: str, key: str) -> int:
         """Bellek bilgisi parse helper"""
-        match = re.search(rf"{key}:\s*(\d+)", raw_data)
-        return int(match.group(1)) if match else 0
+        return self.parsers.parse_mem_value(raw_data, key)
 
     # -------------------- Termal Bilgiler --------------------
     def get_thermal_status(self) -> Dict:
         """Cihazın termal durumunu kontrol eder"""
         raw_data = self._run_adb_command("shell dumpsys thermalservice")
-        throttling = "Current throttling status: 1" in raw_data
-        temps = re.findall(r"Temperature: (\d+)", raw_data)
-        
-        return {
-            "is_throttling": throttling,
-            "temperatures": [int(t) for t in temps]
-        }
+        return self.parsers.parse_thermal(raw_data)
 
     # -------------------- Kapsamlı Rapor --------------------
     def get_performance_report(self, package_name: str) -> Dict:
-        """Tüm metrikleri içeren kapsamlı rapor"""
-        return {
-            "fps_metrics": {
-                "surfaceflinger": self.get_surfaceflinger_fps(package_name),
-                "gfxinfo": self.get_gfxinfo_fps(package_name)
-            },
-            "system_metrics": {
-                "cpu": self.get_cpu_usage(package_name),
-                "memory": self.get_memory_info(package_name),
-                "thermal": self.get_thermal_status()
-            },
-            "device_info": self.get_device_info()
-        }
+        """Tüm metrikleri içeren kapsamlı rapor (tek adb round-trip)"""
+        try:
+            from core.perf_collector import BatchedMetricsCollector
+            return BatchedMetricsCollector(self.device_name, self.adb).collect(package_name)
+        except (OSError, AdbError) as e:
+            print(f"ADB command failed: {str(e)}")
+            return {"error": str(e)}
 
     def get_device_info(self) -> Dict:
         """Temel cihaz bilgilerini alır"""
@@ -0,0 +1,275 @@
+import argparse
+import gzip
+import heapq
+import ipaddress
+import json
+import math
+import os
+import re
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.kernel_telemetry import BOOT_RESET_SEC, KERNEL_FILE_PATTERN, KernelTelemetry
+from core.log_index import BUFFER_FILE_PATTERN, RUN_DIR_PATTERN, parse_threadtime
+
+# (epoch, kaynak, seviye, tag, mesaj)
+Event = Tuple[float, str, str, str, str]
+
+RESULT_TEXT_LINE = re.compile(r"^\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\]\s+\[(\w+)\]:\s*(.*)$")
+KERNEL_LINE = re.compile(r"^<(\d)>\[\s*(\d+\.\d+)\]\s*(?:-?\((\d+)\))?\[(\d+):([^\]]*)\](.*)$")
+LOGCAT_CAPTURE_LINE = re.compile(r"^([^\t]*)\t\s*(\d+\.\d+)\s+\d+\s+\d+ ([VDIWEFSA]) (.*?)\s*: ?(.*)$")
+KERNEL_LEVELS = "EEEEWIID"  # printk 0-3 hata, 4 uyarı, 5-6 bilgi, 7 debug
+
+PCAP_HEADER = struct.Struct("<IHHiIII")
+PCAP_MAGIC = {0xa1b2c3d4: ("<", 1e-6), 0xd4c3b2a1: (">", 1e-6), 0xa1b23c4d: ("<", 1e-9), 0x4d3cb2a1: (">", 1e-9)}
+IP_PROTOCOLS = {1: "ICMP", 6: "TCP", 17: "UDP", 58: "ICMPv6"}
+
+
+# -------------------- Kaynaklar --------------------
+def result_events(path: str) -> Iterator[Event]:
+    """ResultSink (`results_<cihaz>.jsonl`) veya eski `results_<cihaz>.txt` satırları"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                message = entry["message"] if not entry.get("step") else f"[{entry['step']}] {entry['message']}"
+                yield (datetime.fromisoformat(entry["ts"]).timestamp(), "result",
+                       entry["status"], entry.get("device") or "", message)
+            return
+        for line in f:
+            match = RESULT_TEXT_LINE.match(line.rstrip("\n"))
+            if match:
+                message = match.group(3)
+                if message.startswith("{'") and message.endswith("'}"):
+                    message = message[2:-2]
+                yield (datetime.strptime(match.group(1), "%Y-%m-%d %H:%M:%S").timestamp(),
+                       "result", match.group(2), "", message)
+
+
+def mobilelog_events(path: str) -> Iterator[Event]:
+    source = BUFFER_FILE_PATTERN.match(os.path.basename(path)).group(1)
+    for ts, pid, tid, level, tag, message in parse_threadtime(path):
+        yield ts, source, level, tag, f"{pid}/{tid} {message}"
+
+
+def kernel_events(path: str, clock: KernelTelemetry) -> Iterator[Event]:
+    # Yeniden başlatmada uptime sıfırlanır; boot bölümü KernelTelemetry ile aynı kuralla izlenir
+    boot, previous = clock.first_boot(path), None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = KERNEL_LINE.match(line.rstrip("\n"))
+            if not match:
+                continue
+            level, uptime, _, pid, comm, message = match.groups()
+            uptime = float(uptime)
+            if previous is not None and uptime < previous - BOOT_RESET_SEC:
+                boot += 1
+            previous = uptime
+            ts = clock.epoch_of(uptime, boot)
+            if math.isnan(ts):
+                continue  # Çapası olmayan boot bölümü duvar saatine çevrilemez
+            yield ts, "kernel", KERNEL_LEVELS[int(level)], f"{pid}:{comm}", message.strip()
+
+
+def _packet_summary(linktype: int, data: bytes) -> str:
+    """Paketin IP başlığından protokol ve adres/port özetini çıkarır"""
+    if linktype == 276:      # LINUX_SLL2
+        payload = data[20:]
+    elif linktype == 113:    # LINUX_SLL
+        payload = data[16:]
+    elif linktype == 1:      # Ethernet
+        payload = data[14:]
+    else:                    # Ham IP
+        payload = data
+    if not payload:
+        return "?"
+    version = payload[0] >> 4
+    if version == 4 and len(payload) >= 20:
+        header_length = (payload[0] & 0x0F) * 4
+        protocol = payload[9]
+        source, destination = ipaddress.IPv4Address(payload[12:16]), ipaddress.IPv4Address(payload[16:20])
+        transport = payload[header_length:]
+    elif version == 6 and len(payload) >= 40:
+        protocol = payload[6]
+        source, destination = ipaddress.IPv6Address(payload[8:24]), ipaddress.IPv6Address(payload[24:40])
+        transport = payload[40:]
+    else:
+        return "non-IP"
+    name = IP_PROTOCOLS.get(protocol, str(protocol))
+    if protocol in (6, 17) and len(transport) >= 4:
+        source_port, destination_port = struct.unpack_from(">HH", transport)
+        return f"{name} {source}:{source_port} > {destination}:{destination_port}"
+    return f"{name} {source} > {destination}"
+
+
+def pcap_events(path: str, peek: int = 96) -> Iterator[Event]:
+    """Klasik pcap dosyasını paket başlıklarıyla akış halinde okur; paket gövdesi atlanır"""
+    with open(path, "rb") as f:
+        header = f.read(PCAP_HEADER.size)
+        if len(header) < PCAP_HEADER.size:
+            return
+        magic = struct.unpack_from("<I", header)[0]
+        if magic not in PCAP_MAGIC:
+            print(f"pcap biçimi desteklenmiyor (pcapng?): {path}")
+            return
+        order, resolution = PCAP_MAGIC[magic]
+        linktype = struct.unpack_from(order + "I", header, 20)[0] & 0x0FFFFFFF
+        record = struct.Struct(order + "IIII")
+        while True:
+            raw = f.read(record.size)
+            if len(raw) < record.size:
+                return
+            seconds, fraction, captured, original = record.unpack(raw)
+            data = f.read(min(captured, peek))
+            if captured > peek:
+                f.seek(captured - peek, os.SEEK_CUR)
+            yield (seconds + fraction * resolution, "net", "I", "tcpdump",
+                   f"{_packet_summary(linktype, data)} len={original}")
+
+
+def logcat_capture_events(path: str) -> Iterator[Event]:
+    """LogcatCapture parçaları (`<adım>\\t<epoch> pid tid seviye tag: mesaj`)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = LOGCAT_CAPTURE_LINE.match(line.rstrip("\n"))
+            if match:
+                step, ts, level, tag, message = match.groups()
+                yield float(ts), "logcat", level, tag, f"[{step}] {message}" if step != "-" else message
+
+
+# -------------------- Birleştirme --------------------
+class TimelineBuilder:
+    """Bir çalıştırmanın tüm log kaynaklarını zamana göre tek akışta birleştiren sınıf.
+
+    Her kaynak dosyası kendi içinde zaman sıralıdır; dosyalar üreteçlerle satır
+    satır okunur ve `heapq.merge` ile k-yollu birleştirilir. Bellekte her
+    dosyadan yalnızca bir satır tutulduğu için girdi boyutundan bağımsız olarak
+    bellek kullanımı sabittir. (Aynı dosya içinde CPU'lar arası birkaç ms'lik
+    sıra kaymaları olduğu gibi korunur.)
+
+    Kaynaklar: result (ResultSink/results_*.txt), main/sys/events/radio/crash
+    (mobilelog), kernel (uptime, "UTC;android time" çapalarıyla epoch'a çevrilir),
+    net (tcpdump .cap), logcat (LogcatCapture parçaları).
+
+    Örnek:
+        >>> builder = TimelineBuilder("Logs/L2885900115_20250613_145756",
+        ...                           result_paths=["results_L2885900115.jsonl"])
+        >>> builder.write(sources={"result", "kernel", "sys"}, pattern="power|Power")
+    """
+
+    def __init__(self, run_dir: str, device: Optional[str] = None,
+                 result_paths: Iterable[str] = (), logcat_paths: Iterable[str] = ()):
+        self.run_dir = run_dir
+        match = RUN_DIR_PATTERN.match(os.path.basename(os.path.normpath(run_dir)))
+        self.device = device or (match.group(1) if match else "device")
+        self.result_paths = list(result_paths)
+        self.logcat_paths = list(logcat_paths)
+
+    def _files(self) -> Dict[str, List[str]]:
+        files: Dict[str, List[str]] = {"mobilelog": [], "kernel": [], "net": []}
+        for directory, _, names in os.walk(self.run_dir):
+            for name in sorted(names):
+                path = os.path.join(directory, name)
+                if KERNEL_FILE_PATTERN.match(name):
+                    files["kernel"].append(path)
+                elif BUFFER_FILE_PATTERN.match(name):
+                    files["mobilelog"].append(path)
+                elif name.startswith("tcpdump") and name.endswith((".cap", ".pcap")):
+                    files["net"].append(path)
+        return files
+
+    def streams(self, sources: Optional[Iterable[str]] = None) -> List[Iterator[Event]]:
+        """İstenen kaynaklar için dosya başına bir üreteç döndürür"""
+        wanted = set(sources) if sources else None
+
+        def enabled(source: str) -> bool:
+            return wanted is None or source in wanted
+
+        files = self._files()
+        streams: List[Iterator[Event]] = []
+        if enabled("result"):
+            streams.extend(result_events(path) for path in self.result_paths if os.path.exists(path))
+        if enabled("logcat"):
+            streams.extend(logcat_capture_events(path) for path in self.logcat_paths)
+        for path in files["mobilelog"]:
+            if enabled(BUFFER_FILE_PATTERN.match(os.path.basename(path)).group(1)):
+                streams.append(mobilelog_events(path))
+        if enabled("kernel") and files["kernel"]:
+            # Çapalar için tek ön geçiş; sonra satırlar akış halinde okunur
+            clock = KernelTelemetry.from_paths(files["kernel"])
+            if clock.has_clock:
+                streams.extend(kernel_events(path, clock) for path in files["kernel"])
+            else:
+                print(f"[{self.device}] kernel logu duvar saatine çevrilemedi, zaman çizelgesine eklenmedi")
+        if enabled("net"):
+            streams.extend(pcap_events(path) for path in files["net"])
+        return streams
+
+    def events(self, sources: Optional[Iterable[str]] = None, levels: Optional[str] = None,
+               pattern: Optional[str] = None, since: Optional[float] = None,
+               until: Optional[float] = None) -> Iterator[Event]:
+        """Birleştirilmiş ve filtrelenmiş olaylar (zaman sıralı)"""
+        regex = re.compile(pattern) if pattern else None
+        for event in heapq.merge(*self.streams(sources), key=lambda event: event[0]):
+            ts = event[0]
+            if since is not None and ts < since:
+                continue
+            if until is not None and ts >= until:
+                break
+            if levels and event[2] not in levels and event[1] != "result":
+                continue
+            if regex and not (regex.search(event[4]) or regex.search(event[3])):
+                continue
+            yield event
+
+    def write(self, path: Optional[str] = None, **filters) -> Tuple[str, int]:
+        """Birleştirilmiş görünümü TSV olarak yazar: zaman, kaynak, seviye, tag, mesaj"""
+        path = path or os.path.join(self.run_dir, f"timeline_{self.device}.tsv")
+        count = 0
+        with open(path, "w", encoding="utf-8") as out:
+            out.write("time\tsource\tlevel\ttag\tmessage\n")
+            for ts, source, level, tag, message in self.events(**filters):
+                stamp = datetime.fromtimestamp(ts).isoformat(sep=" ", timespec="microseconds")
+                out.write(f"{stamp}\t{source}\t{level}\t{tag}\t{message.replace(chr(9), ' ')}\n")
+                count += 1
+        return path, count
+
+
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çalıştırma loglarını tek zaman çizelgesinde birleştir")
+    parser.add_argument("run_dirs", nargs="+")
+    parser.add_argument("--results", nargs="*", default=[],
+                        help="results_<cihaz>.jsonl/.txt dosyaları (verilmezse cihaz adıyla aranır)")
+    parser.add_argument("--logcat", nargs="*", default=[], help="LogcatCapture .log.gz parçaları")
+    parser.add_argument("--sources", help="Virgülle ayrılmış: result,main,sys,events,radio,crash,kernel,net,logcat")
+    parser.add_argument("--levels", help="Ör. EW (result satırları her zaman dahil)")
+    parser.add_argument("--grep", help="Mesaj veya tag için düzenli ifade")
+    parser.add_argument("--since", help="ISO zaman, ör. 2025-06-13T14:26")
+    parser.add_argument("--until")
+    parser.add_argument("--output", help="Tek çalıştırma için çıktı dosyası")
+    args = parser.parse_args()
+
+    for run_dir in args.run_dirs:
+        builder = TimelineBuilder(run_dir)
+        results = args.results or [path for path in (f"results_{builder.device}.jsonl", f"results_{builder.device}.txt")
+                                   if os.path.exists(path)]
+        builder.result_paths = results
+        builder.logcat_paths = args.logcat
+        path, count = builder.write(
+            args.output if len(args.run_dirs) == 1 else None,
+            sources=args.sources.split(",") if args.sources else None, levels=args.levels,
+            pattern=args.grep, since=_parse_time(args.since), until=_parse_time(args.until))
+        print(f"[{builder.device}] {count} olay -> {path}")
+
+
+if __name__ == "__main__":
+    main()
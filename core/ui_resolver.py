@@ -0,0 +1,189 @@
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+BOUNDS_PATTERN = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+EXSLT_REGEX_NS = {"re": "http://exslt.org/regular-expressions"}
+
+# UiSelector metodu -> (page_source niteliği, karşılaştırma türü)
+UISELECTOR_METHODS = {
+    "text": ("text", "equals"),
+    "textContains": ("text", "contains"),
+    "textStartsWith": ("text", "starts-with"),
+    "textMatches": ("text", "matches"),
+    "description": ("content-desc", "equals"),
+    "descriptionContains": ("content-desc", "contains"),
+    "descriptionStartsWith": ("content-desc", "starts-with"),
+    "descriptionMatches": ("content-desc", "matches"),
+    "resourceId": ("resource-id", "equals"),
+    "resourceIdMatches": ("resource-id", "matches"),
+    "className": ("class", "equals"),
+    "classNameMatches": ("class", "matches"),
+    "packageName": ("package", "equals"),
+    "packageNameMatches": ("package", "matches"),
+    "index": ("index", "equals"),
+    "checkable": ("checkable", "equals"),
+    "checked": ("checked", "equals"),
+    "clickable": ("clickable", "equals"),
+    "enabled": ("enabled", "equals"),
+    "focusable": ("focusable", "equals"),
+    "focused": ("focused", "equals"),
+    "longClickable": ("long-clickable", "equals"),
+    "scrollable": ("scrollable", "equals"),
+    "selected": ("selected", "equals"),
+}
+
+_UISELECTOR_CALL = re.compile(r'\.(\w+)\(\s*("(?:[^"\\]|\\.)*"|\d+|true|false)?\s*\)')
+
+
+def _xpath_literal(value: str) -> str:
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    parts = value.split('"')
+    return "concat(" + ", '\"', ".join(f'"{part}"' for part in parts) + ")"
+
+
+def uiselector_to_xpath(selector: str) -> str:
+    """`new UiSelector().text("YouTube").clickable(true)` biçimini XPath'e çevirir.
+
+    Desteklenmeyen metotlarda (childSelector, fromParent ...) ValueError fırlatılır.
+    """
+    selector = selector.strip().rstrip(";")
+    if not selector.startswith("new UiSelector()"):
+        raise ValueError(f"UiSelector değil: {selector}")
+
+    body = selector[len("new UiSelector()"):]
+    predicates = []
+    instance = None
+    position = 0
+    for match in _UISELECTOR_CALL.finditer(body):
+        if match.start() != position:
+            break
+        position = match.end()
+        method, raw = match.group(1), match.group(2)
+        value = re.sub(r"\\(.)", r"\1", raw[1:-1]) if raw and raw.startswith('"') else raw
+
+        if method == "instance":
+            instance = int(value)
+            continue
+        if method not in UISELECTOR_METHODS:
+            raise ValueError(f"Desteklenmeyen UiSelector metodu: {method}")
+        attribute, kind = UISELECTOR_METHODS[method]
+        literal = _xpath_literal(value if value is not None else "true")
+        if kind == "equals":
+            predicates.append(f"@{attribute}={literal}")
+        elif kind == "contains":
+            predicates.append(f"contains(@{attribute}, {literal})")
+        elif kind == "starts-with":
+            predicates.append(f"starts-with(@{attribute}, {literal})")
+        else:
+            # UiSelector *Matches tüm metni eşler
+            predicates.append(f"re:test(@{attribute}, {_xpath_literal('^(?:' + value + ')$')})")
+
+    if position != len(body):
+        raise ValueError(f"UiSelector çözümlenemedi: {selector}")
+
+    xpath = "//*" + "".join(f"[{predicate}]" for predicate in predicates)
+    if instance is not None:
+        xpath = f"({xpath})[{instance + 1}]"
+    return xpath
+
+
+def to_xpath(locator: str) -> str:
+    return uiselector_to_xpath(locator) if locator.strip().startswith("new UiSelector") else locator
+
+
+@lru_cache(maxsize=512)
+def _compile(xpath: str):
+    from lxml import etree  # lxml yalnızca çözümleyici kullanılırsa yüklenir
+    return etree.XPath(xpath, namespaces=EXSLT_REGEX_NS)
+
+
+@dataclass
+class ResolvedElement:
+    name: str
+    locator: str
+    bounds: Tuple[int, int, int, int]           # (sol, üst, sağ, alt)
+    attributes: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        left, top, right, bottom = self.bounds
+        return (left + right) // 2, (top + bottom) // 2
+
+    @property
+    def text(self) -> str:
+        return self.attributes.get("text", "")
+
+
+class PageSnapshot:
+    """Tek bir page_source anlık görüntüsü üzerinde yerel XPath/UiSelector sorguları"""
+
+    def __init__(self, source: Union[str, bytes]):
+        from lxml import etree
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        self.root = etree.fromstring(source, parser=etree.XMLParser(huge_tree=True, recover=True))
+
+    def find(self, locator: str, name: Optional[str] = None) -> List[ResolvedElement]:
+        matches = []
+        for node in _compile(to_xpath(locator))(self.root):
+            if not hasattr(node, "attrib"):
+                continue
+            bounds = BOUNDS_PATTERN.match(node.get("bounds", ""))
+            if not bounds:
+                continue
+            matches.append(ResolvedElement(name or locator, locator,
+                                           tuple(int(v) for v in bounds.groups()), dict(node.attrib)))
+        return matches
+
+    def resolve(self, candidates: Union[Dict[str, str], Sequence[str]]) -> Dict[str, List[ResolvedElement]]:
+        """Tüm adayları aynı ağaç üzerinde değerlendirir; {aday: [eşleşmeler]} döndürür"""
+        if not isinstance(candidates, dict):
+            candidates = {locator: locator for locator in candidates}
+        return {name: self.find(locator, name) for name, locator in candidates.items()}
+
+    def first(self, candidates: Union[Dict[str, str], Sequence[str]]) -> Optional[ResolvedElement]:
+        """Aday sırasına göre ilk eşleşen elementi döndürür"""
+        for matches in self.resolve(candidates).values():
+            if matches:
+                return matches[0]
+        return None
+
+
+class BatchResolver:
+    """Hiyerarşiyi tek `page_source` çağrısıyla alıp birçok locator'ı yerelde çözen yardımcı.
+
+    Her aday için ayrı `WebDriverWait` (ayrı Appium round-trip'i) yerine tek
+    istek yapılır; eşleşmeler bounds ile döner ve koordinatla tıklanabilir.
+
+    Örnek:
+        >>> resolver = BatchResolver(driver)
+        >>> element = resolver.wait_first(XPATHS_OF_APPS["Settings"]["xpath"], timeout=10)
+        >>> element.center
+        (540, 1210)
+    """
+
+    def __init__(self, driver, interval: float = 0.3):
+        self.driver = driver
+        self.interval = interval
+
+    def snapshot(self) -> PageSnapshot:
+        return PageSnapshot(self.driver.page_source)
+
+    def resolve(self, candidates) -> Dict[str, List[ResolvedElement]]:
+        return self.snapshot().resolve(candidates)
+
+    def wait_first(self, candidates, timeout: float = 5) -> Optional[ResolvedElement]:
+        """Adaylardan biri görünene kadar anlık görüntüleri yoklar"""
+        deadline = time.monotonic() + timeout
+        while True:
+            element = self.snapshot().first(candidates)
+            if element is not None or time.monotonic() >= deadline:
+                return element
+            time.sleep(self.interval)
@@ -0,0 +1,126 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from core.adb_client import AdbClient
+
+
+FOCUS_COMMAND = "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"
+
+
+@dataclass
+class IdleWaitRecord:
+    label: str
+    baseline: float     # Yerine geçilen sabit bekleme (sn)
+    elapsed: float      # Gerçekte beklenen süre (sn)
+    idle: bool          # Sınırdan önce sabitlendi mi
+
+    @property
+    def saved(self) -> float:
+        return self.baseline - self.elapsed
+
+
+class UiIdleWaiter:
+    """Sabit `time.sleep` yerine arayüz sabitlenene kadar bekleyen yardımcı.
+
+    Arayüzün imzası (odaktaki pencere/aktivite ve/veya page_source hash'i) art
+    arda `stable_samples` örnekte (ilk örnek dahil) aynı kalınca bekleme biter.
+    Hızlı cihazlarda boşa beklenmez; yavaş cihazlarda ise `cap` süresine kadar beklenir.
+    Varsayılanlarla sabit bir ekran iki imza okumasıyla tespit edilir.
+
+    Modlar:
+        - "window" (varsayılan): `dumpsys window` odak satırları (uygulama/ekran geçişleri
+          için; kalıcı adb oturumunda tek komut, Appium'a gitmez)
+        - "hierarchy": driver.page_source hash'i (uygulama içi değişiklikler için; her örnek
+          tüm hiyerarşinin Appium'dan çekilmesidir, pahalıdır)
+        - "both": ikisi birlikte
+
+    Örnek:
+        >>> waiter = UiIdleWaiter("L2897100765")
+        >>> waiter.wait(driver, baseline=2, label="after clear_all_apps")
+        >>> waiter.total_saved()
+    """
+
+    def __init__(self, device_name: str, adb: Optional[AdbClient] = None, mode: str = "window",
+                 interval: float = 0.1, stable_samples: int = 2, min_wait: float = 0.1,
+                 cap_factor: float = 3.0, min_cap: float = 2.0):
+        if mode not in ("hierarchy", "window", "both"):
+            raise ValueError(f"Geçersiz bekleme modu: {mode}")
+        self.device_name = device_name
+        self._adb = adb
+        self.mode = mode
+        self.interval = interval
+        self.stable_samples = stable_samples
+        self.min_wait = min_wait
+        self.cap_factor = cap_factor
+        self.min_cap = min_cap
+        self.records: List[IdleWaitRecord] = []
+
+    @property
+    def adb(self) -> AdbClient:
+        if self._adb is None:
+            self._adb = AdbClient.for_device(self.device_name)
+        return self._adb
+
+    def signature(self, driver, mode: Optional[str] = None) -> str:
+        mode = mode or self.mode
+        digest = hashlib.sha1()
+        if mode in ("window", "both"):
+            digest.update(self.adb.shell(FOCUS_COMMAND).encode("utf-8"))
+        if mode in ("hierarchy", "both"):
+            digest.update(driver.page_source.encode("utf-8"))
+        return digest.hexdigest()
+
+    def wait(self, driver, baseline: float, cap: Optional[float] = None,
+             label: Optional[str] = None, mode: Optional[str] = None,
+             min_wait: Optional[float] = None) -> IdleWaitRecord:
+        """Arayüz sabitlenene veya `cap` dolana kadar bekler.
+
+        Args:
+            baseline: Yerine geçilen sabit bekleme süresi (rapor için)
+            cap: Üst sınır; verilmezse max(baseline * cap_factor, min_cap)
+            min_wait: Dokunmanın arayüze yansıması için en az bekleme
+        """
+        cap = cap if cap is not None else max(baseline * self.cap_factor, self.min_cap)
+        min_wait = self.min_wait if min_wait is None else min_wait
+        start = time.monotonic()
+        deadline = start + cap
+        idle = False
+
+        time.sleep(min(min_wait, cap))
+        try:
+            previous = self.signature(driver, mode)
+            stable = 1  # İlk örnek de sayılır
+            while stable < self.stable_samples and time.monotonic() < deadline:
+                time.sleep(self.interval)
+                current = self.signature(driver, mode)
+                if current == previous:
+                    stable += 1
+                else:
+                    stable = 1
+                    previous = current
+            idle = stable >= self.stable_samples
+        except Exception as e:
+            # İmza alınamazsa eski davranışa (sabit bekleme) dönülür
+            print(f"[{self.device_name}] UI imzası alınamadı, sabit bekleme uygulanıyor: {str(e)}")
+            time.sleep(max(0.0, baseline - (time.monotonic() - start)))
+
+        record = IdleWaitRecord(label or "wait", baseline, time.monotonic() - start, idle)
+        self.records.append(record)
+        return record
+
+    def total_saved(self) -> float:
+        return sum(record.saved for record in self.records)
+
+    def summary(self) -> dict:
+        return {
+            "waits": len(self.records),
+            "baseline_sec": round(sum(r.baseline for r in self.records), 3),
+            "elapsed_sec": round(sum(r.elapsed for r in self.records), 3),
+            "saved_sec": round(self.total_saved(), 3),
+            "timed_out": sum(1 for r in self.records if not r.idle),
+        }
+
+    def reset(self):
+        self.records = []
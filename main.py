@@ -56,6 +56,10 @@ def main():
     # test_runner = BaseTestRunner(devices=DEVICES, browser_configs=BROWSER_CONFIGS)
     # test_runner.run_parallel_tests(click_power_button)
 
+    # Birden fazla testi cihaz başına tek worker ile çalıştırmak için:
+    # test_runner = BaseTestRunner(devices=DEVICES, browser_configs=BROWSER_CONFIGS)
+    # test_runner.run_suite([openapp, starttest_log])
+
 if __name__ == "__main__":
     main()
 
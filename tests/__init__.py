@@ -1,10 +1,23 @@
 """
 Test senaryolarının bulunduğu paket
 """
+import importlib
 
-# Temel test sınıfını dışa aktar
-from .test_cases import  BaseTest, OpenApp
+# Temel test sınıfını dışa aktar; test_cases (Appium) ilk erişimde yüklenir,
+# böylece tests.unit altındaki birim testleri Appium olmadan çalışır
+_EXPORTS = {
+    'BaseTest': '.test_cases',
+    'OpenApp': '.test_cases',
+}
 
 
 # Yeni test senaryoları eklendikçe buraya ekleyin
-__all__ = ['BaseTest', 'OpenApp' ]
\ No newline at end of file
+__all__ = ['BaseTest', 'OpenApp' ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -2,6 +2,14 @@ from abc import ABC, abstractmethod
 from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
 from core.test_runner import BaseTestRunner
+from core.adb_client import AdbClient
+from core.result_sink import ResultSink
+from core.ui_wait import UiIdleWaiter
+from core.locator_cache import LocatorCache
+from core.ui_resolver import BatchResolver
+from core.debuglogger import DebugLoggerController
+from core.logcat_capture import LogcatCapture, DEFAULT_BUFFERS
+from core.screenshot import ScreenCapture, ScreenshotWriter
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.actions import interaction
 from selenium.webdriver.common.actions.action_builder import ActionBuilder
@@ -20,9 +28,29 @@ from datetime import datetime
 import time
 
 class BaseTest(ABC):
-    def __init__(self, retry_count=4, retry_delay=3):
+    def __init__(self, retry_count=4, retry_delay=3, idle_wait=False, idle_mode="window", idle_report=False,
+                 idle_margin=0.5, logcat=False, logcat_buffers=None, logcat_dir="logcat", logcat_dump_seconds=30):
+        """
+        Args:
+            idle_wait: Sabit beklemeler yerine arayüz sabitlenene kadar bekle (varsayılan False: eski sabit sleep'ler)
+            idle_mode: "window" (varsayılan, ucuz), "hierarchy" veya "both" (bkz. UiIdleWaiter)
+            idle_margin: Bir bekleme en fazla eski sabit süre + bu pay (sn) kadar sürer
+            idle_report: Her beklemede ve test sonunda kazanılan süreyi logla
+            logcat: Test boyunca logcat'i adımlarla etiketleyerek arka planda kaydet (bkz. LogcatCapture)
+            logcat_buffers: logcat tamponları (varsayılan main, system, crash; ör. "kernel", "events" eklenebilir)
+            logcat_dump_seconds: Başarısız denemede diske dökülecek son logcat süresi (sn)
+        """
         self.retry_count = retry_count
         self.retry_delay = retry_delay
+        self.idle_wait = idle_wait
+        self.idle_mode = idle_mode
+        self.idle_report = idle_report
+        self.idle_margin = idle_margin
+        self.logcat = logcat
+        self.logcat_buffers = logcat_buffers
+        self.logcat_dir = logcat_dir
+        self.logcat_dump_seconds = logcat_dump_seconds
+        self._idle_waiters = {}
 
     @abstractmethod
     def execute(self, driver: WebDriver, device_name: str):
@@ -32,13 +60,46 @@ class BaseTest(ABC):
         """Helper method for consistent logging with device context"""
 
         print(f"[{device_name}] [ACTION] {message}")
-        self._write_test_result(device_name," [ACTION]", {message})
+        self._write_test_result(device_name, "ACTION", message)
     
     def _log_error(self, device_name: str, message: str):
         """Helper method for error logging with device context"""
         print(f"[{device_name}] [ERROR] {message}")
         self._write_test_result(device_name, "Error", message)
 
+    def wait_idle(self, driver, device_name: str, baseline: float, label: str = None, **kwargs):
+        """`time.sleep(baseline)` yerine arayüz sabitlenene kadar bekler
+
+        Args:
+            baseline: Eski sabit bekleme süresi; bekleme en fazla baseline + idle_margin sürer
+            kwargs: UiIdleWaiter.wait parametreleri (cap, mode, min_wait)
+        """
+        if not self.idle_wait:
+            time.sleep(baseline)
+            return None
+
+        kwargs.setdefault("cap", baseline + self.idle_margin)
+
+        waiter = self._idle_waiters.get(device_name)
+        if waiter is None:
+            waiter = self._idle_waiters[device_name] = UiIdleWaiter(device_name, mode=self.idle_mode)
+        record = waiter.wait(driver, baseline, label=label, **kwargs)
+        if self.idle_report:
+            self._write_test_result(device_name, "IdleWait", record.label,
+                                    duration_sec=record.elapsed, baseline_sec=record.baseline,
+                                    saved_sec=round(record.saved, 3), idle=record.idle)
+        return record
+
+    def _report_idle_savings(self, device_name: str):
+        waiter = self._idle_waiters.get(device_name)
+        if not self.idle_report or waiter is None or not waiter.records:
+            return
+        summary = waiter.summary()
+        self._log_action(device_name, f"UI idle waits: {summary['waits']} waits, "
+                                      f"{summary['elapsed_sec']:.1f} s instead of {summary['baseline_sec']:.1f} s "
+                                      f"(saved {summary['saved_sec']:.1f} s, {summary['timed_out']} hit the cap)")
+        waiter.reset()
+
         
 
     def scroll_up(self, driver: WebDriver, device_name: str, 
@@ -110,18 +171,89 @@ class BaseTest(ABC):
             self._log_error(device_name, f"Element not found: {str(e)}")
             return False
 
+    def _find_app_cached(self, driver: WebDriver, device_name: str, xpath: str, cached: dict) -> bool:
+        """Önbellekteki scroll'ları başarısız denemeler olmadan tekrarlar ve elementi arar.
+
+        Kayıtta bounds varsa ve element hâlâ orada ise doğrudan o noktaya dokunulur;
+        yoksa normal bul-tıkla yapılır ve yeni bounds kaydedilir. Bulunamazsa
+        uygulanan scroll'lar ters yönde geri alınır; tüm stratejiler yine
+        başlangıç ekranından denenir.
+        """
+        self._log_action(device_name, f"Cached strategy {cached['strategy']} "
+                                      f"({len(cached['scrolls'])} scrolls) for {xpath}")
+        applied = []
+        for scroll in cached["scrolls"]:
+            if not self.scroll_up(driver, device_name, ratio_y=scroll["ratio_y"], ratio_end=scroll["ratio_end"]):
+                break
+            applied.append(scroll)
+            self.wait_idle(driver, device_name, 0.5, label="find_app cached scroll")
+        else:
+            if cached.get("bounds") and self._tap_cached_bounds(driver, device_name, xpath, cached["bounds"]):
+                self._log_action(device_name, "App opened successfully (cached bounds)")
+                return True
+            found = {}
+            if self._try_find_and_click(driver, device_name, xpath, "cached", found=found):
+                LocatorCache.default().put(LocatorCache.device_model(device_name), xpath,
+                                           cached["strategy"], cached["scrolls"], found.get("bounds"))
+                self._log_action(device_name, "App opened successfully (cached strategy)")
+                return True
+
+        # Başlangıç ekranına dön: önbellekten uygulanan scroll'lar ters sırada, ters yönde yapılır
+        for scroll in reversed(applied):
+            self.scroll_up(driver, device_name, ratio_y=scroll["ratio_end"], ratio_end=scroll["ratio_y"])
+            self.wait_idle(driver, device_name, 0.5, label="find_app undo cached scroll")
+        return False
+
+    def _tap_cached_bounds(self, driver: WebDriver, device_name: str, xpath: str, bounds: dict) -> bool:
+        """Önbellekteki bounds'un ortasına adb ile dokunur.
+
+        Dokunmadan önce locator'ın ilk eşleşmesinin aynı dikdörtgende olduğu beklemesiz
+        tek bir sorguyla doğrulanır; yer değişmişse False döner.
+        """
+        if xpath.strip().startswith("new UiSelector"):
+            locator = (AppiumBy.ANDROID_UIAUTOMATOR, xpath)
+        else:
+            locator = (AppiumBy.XPATH, xpath)
+        try:
+            elements = driver.find_elements(*locator)
+            if not elements or dict(elements[0].rect) != bounds:
+                self._log_action(device_name, "Cached bounds moved, locating element")
+                return False
+            x = int(bounds["x"] + bounds["width"] / 2)
+            y = int(bounds["y"] + bounds["height"] / 2)
+            AdbClient.for_device(device_name).shell(f"input tap {x} {y}")
+            return True
+        except Exception as e:
+            self._log_error(device_name, f"Cached tap failed: {str(e)}")
+            return False
+
     def find_app(self, driver: WebDriver, device_name: str, xpath: str) -> bool:
-        """Enhanced app finding with strategy pattern"""
+        """Enhanced app finding with strategy pattern
+
+        İşe yarayan strateji (uygulanan scroll'lar ve bounds) model+locator anahtarıyla
+        diske kaydedilir; sonraki çalıştırmalarda önce o denenir, bulunamazsa
+        ekran başlangıç konumuna döndürülür, kayıt silinir ve tüm stratejilere dönülür.
+        """
+        cache = LocatorCache.default()
+        model = LocatorCache.device_model(device_name)
+        cached = cache.get(model, xpath)
+        if cached:
+            if self._find_app_cached(driver, device_name, xpath, cached):
+                return True
+            self._log_action(device_name, "Cached strategy missed, invalidating")
+            cache.invalidate(model, xpath)
+
         strategies = [
             {"name": "Initial attempt", "scroll": False},
             {"name": "Scroll down", "scroll": True, "ratio_y": 0.8, "ratio_end": 0.2},
             {"name": "Alternative scroll", "scroll": True, "ratio_y": 0.5, "ratio_end": 0.3},
             {"name": "Alternative scroll", "scroll": True, "ratio_y": 0.8, "ratio_end": 0.3}
         ]
+        scrolls = []  # Başarıya kadar uygulanan scroll'lar (önbelleğe yazılır)
         
         for i, strategy in enumerate(strategies, 1):
             self._log_action(device_name, f"Strategy {i}: {strategy['name']}")
-            time.sleep(0.5)  # Her strateji öncesi bekleme
+            self.wait_idle(driver, device_name, 0.5, label=f"find_app strategy {i}")  # Her strateji öncesi arayüzün durulması beklenir
             
             try:
                 # Scroll gerekliyse yap
@@ -132,10 +264,13 @@ class BaseTest(ABC):
                                         ratio_end=strategy['ratio_end']):
                         self._log_error(device_name, f"Scroll failed in strategy {i}")
                         continue
+                    scrolls.append({"ratio_y": strategy['ratio_y'], "ratio_end": strategy['ratio_end']})
                 
                 # Elementi bul ve tıkla (scroll yapılmayan stratejilerde de çalışır)
-                if self._try_find_and_click(driver, device_name, xpath, i):
+                found = {}
+                if self._try_find_and_click(driver, device_name, xpath, i, found=found):
                     self._log_action(device_name, "App opened successfully")
+                    cache.put(model, xpath, i, scrolls, found.get("bounds"))
                     return True
                     
             except Exception as e:
@@ -148,8 +283,11 @@ class BaseTest(ABC):
 
 
 
-    def _try_find_and_click(self, driver, device_name, xpath, attempt_num) -> bool:
-        """Helper method to find and click an element"""
+    def _try_find_and_click(self, driver, device_name, xpath, attempt_num, found: dict = None) -> bool:
+        """Helper method to find and click an element
+
+        `found` verilirse tıklanan elementin bounds'u (x, y, width, height) içine yazılır.
+        """
         try:
             self._log_action(device_name, f"Attempt {attempt_num}: Locating element @ {xpath}")
             
@@ -160,6 +298,8 @@ class BaseTest(ABC):
                 
             element = WebDriverWait(driver, 5).until(  # Zaman aşımını 5 saniyeye çıkar
                 EC.element_to_be_clickable(locator))
+            if found is not None:
+                found["bounds"] = dict(element.rect)
             element.click()
             return True
         
@@ -169,32 +309,56 @@ class BaseTest(ABC):
 
     def run_with_retry(self, driver: WebDriver, device_name: str) -> bool:
         """Enhanced retry mechanism with better logging"""
-        for attempt in range(1, self.retry_count + 1):
-            self._log_action(device_name, 
-                            f"Test attempt {attempt}/{self.retry_count}")
-            try:
-                self.execute(driver, device_name)
-                self._write_test_result(device_name, "Success", "Test passed")
-                return True
-            except Exception as e:
-                self._log_error(device_name, 
-                               f"Attempt {attempt} failed: {str(e)}")
-                if attempt < self.retry_count:
-                    time.sleep(self.retry_delay)
-        
-        self._write_test_result(device_name, "Failure", "All attempts failed")
-        return False
+        capture = self._start_logcat(device_name)
+        try:
+            for attempt in range(1, self.retry_count + 1):
+                self._log_action(device_name, 
+                                f"Test attempt {attempt}/{self.retry_count}")
+                start = time.monotonic()
+                try:
+                    with self.step(device_name, f"{type(self).__name__}#{attempt}"):
+                        self.execute(driver, device_name)
+                    self._write_test_result(device_name, "Success", "Test passed",
+                                            duration_sec=time.monotonic() - start)
+                    self._report_idle_savings(device_name)
+                    return True
+                except Exception as e:
+                    self._log_error(device_name, 
+                                   f"Attempt {attempt} failed: {str(e)}")
+                    if capture:
+                        # Hatadan hemen önceki loglar cihazdan ayrıca çekmeden kaydedilir
+                        capture.dump_recent(self.logcat_dump_seconds)
+                    if attempt < self.retry_count:
+                        time.sleep(self.retry_delay)
+            
+            self._report_idle_savings(device_name)
+            self._write_test_result(device_name, "Failure", "All attempts failed")
+            return False
+        finally:
+            if capture:
+                capture.stop()
+
+    def _start_logcat(self, device_name: str):
+        """logcat açıksa cihaz için arka plan kaydını başlatır"""
+        if not self.logcat:
+            return None
+        return LogcatCapture(device_name, self.logcat_dir,
+                             buffers=self.logcat_buffers or DEFAULT_BUFFERS).start()
 
     
     
-    def _write_test_result(self, device_name: str, test_name: str, result: str):
-        """Improved result writing with timestamp"""
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        try:
-            with open(f"results_{device_name}.txt", "a", encoding="utf-8") as f:
-                f.write(f"[{timestamp}] {test_name}: {result}\n")
-        except Exception as e:
-            print(f"[{device_name}] ⚠ Failed to write results: {str(e)}")
+    def _write_test_result(self, device_name: str, test_name: str, result: str, **fields):
+        """Sonucu cihazın tamponlu JSONL sink'ine yazar (results_<cihaz>.jsonl)"""
+        ResultSink.for_device(device_name).record(test_name, result, **fields)
+
+    def step(self, device_name: str, name: str):
+        """Adımı süresiyle kaydeder; içindeki tüm kayıtlar bu adım adıyla etiketlenir
+
+        Örnek:
+            >>> with self.step(device_name, "start_log"):
+            ...     self._start_log(driver, device_name)
+        """
+        return ResultSink.for_device(device_name).step(name)
 
    
    
@@ -277,6 +441,29 @@ class BaseTest(ABC):
 
 
 
+    def _click_at_coordinates(self, driver, x, y, duration=0.1):
+        """Belirtilen koordinatlara tıklama işlemi yapar"""
+        actions = ActionChains(driver)
+        actions.w3c_actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
+        actions.w3c_actions.pointer_action.move_to_location(x, y)
+        actions.w3c_actions.pointer_action.pointer_down()
+        actions.w3c_actions.pointer_action.pause(duration)
+        actions.w3c_actions.pointer_action.release()
+        actions.perform()
+
+    def find_any(self, driver, device_name: str, candidates, timeout: float = 10):
+        """Aday locator'lardan (XPath/UiSelector) ilk görüneni tek anlık görüntüyle bulur
+
+        Returns:
+            ResolvedElement veya None (bounds ve center ile)
+        """
+        element = BatchResolver(driver).wait_first(candidates, timeout=timeout)
+        if element is None:
+            self._log_error(device_name, f"None of {len(candidates)} candidates found")
+        else:
+            self._log_action(device_name, f"Resolved {element.locator} @ {element.bounds}")
+        return element
+
     def clear_all_apps(self,driver, model_name: str):
         button_combinations = ["Apps_Button","Clear_All","Main_Button"]
         for i in range(3):
@@ -340,11 +527,13 @@ class OpenApp(BaseTest):
     """Mobil cihazlarda belirtilen bir uygulamayı başlatmayı sağlar.
     Attributes:
         app_xpath (str): Hedef uygulamanın XPATH değeri.
+        frame_layer (str): Verilirse scroll döngüsü boyunca bu SurfaceFlinger layer'ının frame zamanları izlenir.
     """
 
-    def __init__(self, app_xpath=None, **kwargs):
+    def __init__(self, app_xpath=None, frame_layer=None, **kwargs):
         super().__init__(**kwargs)
         self.app_xpath = app_xpath 
+        self.frame_layer = frame_layer
 
     def __call__(self,driver,device_name):
         print("OpenApp is called!")
@@ -354,11 +543,11 @@ class OpenApp(BaseTest):
         """Main test execution with proper xpath handling"""
         self._log_action(device_name, 
                         f"Starting app test with xpath: {self.app_xpath}")
-        time.sleep(1)
+        self.wait_idle(driver, device_name, 1, label="OpenApp start")
         
         self.clear_all_apps(driver,"Era 50")
 
-        time.sleep(2)
+        self.wait_idle(driver, device_name, 2, label="OpenApp after clear_all_apps")
 
         if not self.find_app(driver, device_name, self.app_xpath):
             
@@ -377,17 +566,28 @@ class OpenApp(BaseTest):
             self._log_error(device_name, "YouTube için izin verme işlemi başarısız")
 
 
+        tracker = None
+        if self.frame_layer:
+            from core.frame_trackers import SurfaceFlingerTracker  # NumPy yalnızca izleme açıksa yüklenir
+            tracker = SurfaceFlingerTracker(device_name, self.frame_layer)
+            tracker.poll()  # Scroll öncesi frame'ler referans alınır
+
         for i in range(25): # 25 scroll 
             try:
                 self.scroll_up(driver,device_name,duration_ms=500,ratio_x=0.5,ratio_y=0.8, ratio_end=0.2)
+                if tracker:
+                    tracker.poll()
             except:
                 break
+
+        if tracker:
+            self._log_action(device_name, f"Scroll frame stats: {tracker.stats()}")
     
         
         
         
        
-        time.sleep(1)
+        self.wait_idle(driver, device_name, 1, label="OpenApp end")
 
         
 
@@ -479,26 +679,17 @@ class ConnectWifi(BaseTest):
         except Exception as e:
             return False, f"WiFi şifre girişi başarısız: {str(e)}"
 
-    def _click_at_coordinates(self, driver, x, y, duration=0.1):
-        """Belirtilen koordinatlara tıklama işlemi yapar"""
-        actions = ActionChains(driver)
-        actions.w3c_actions = ActionBuilder(driver, mouse=PointerInput(interaction.POINTER_TOUCH, "touch"))
-        actions.w3c_actions.pointer_action.move_to_location(x, y)
-        actions.w3c_actions.pointer_action.pointer_down()
-        actions.w3c_actions.pointer_action.pause(duration)
-        actions.w3c_actions.pointer_action.release()
-        actions.perform()
 
     def execute(self, driver, device_name):
         """WiFi bağlantı işlemini gerçekleştirir"""
         results = []
         self.clear_all_apps(driver,"Era 50")
         try:
-            # Adım 1: Ayarlar uygulamasını aç (sadece bir kez kontrol et)
-            settings = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((AppiumBy.XPATH, '//android.widget.TextView[@text="Settings"]'))
-            )
-            settings.click()
+            # Adım 1: Ayarlar uygulamasını aç (dil/cihaz farkları için tüm adaylar tek seferde aranır)
+            settings = self.find_any(driver, device_name, XPATHS_OF_APPS["Settings"]["xpath"], timeout=10)
+            if settings is None:
+                raise Exception("Ayarlar uygulaması bulunamadı")
+            self._click_at_coordinates(driver, *settings.center)
             results.append((True, "Ayarlar açıldı"))
             time.sleep(1)
             
@@ -548,25 +739,47 @@ class StartTest_GetLog(BaseTest):
     """
 
 
-    def __init__(self, testname:callable, model_name: str,**kwargs)->None:
+    def __init__(self, testname:callable, model_name: str, use_adb_logger: bool = True,
+                 clear_previous_logs: bool = False, **kwargs)->None:
+        """
+        Args:
+            use_adb_logger: Logu önce adb broadcast ile başlat/durdur; başarısız olursa UI yoluna dön
+            clear_previous_logs: adb ile başlatmadan önce cihazdaki eski logları sil. Kapalıyken
+                loglar korunur ve artımlı senkronizasyon yalnızca yeni veriyi çeker
+        """
         self.testname = testname
         self.model_name = model_name
+        self.use_adb_logger = use_adb_logger
+        self.clear_previous_logs = clear_previous_logs
         super().__init__(**kwargs)
 
 
-    # Log Kaydını Başlat    
+    # Log Kaydını Başlat
     def _start_log(self, driver, device_name):
+        if self.use_adb_logger:
+            logger = DebugLoggerController(device_name)
+            try:
+                # Önceki kayıt açık kaldıysa durdurulur, istenirse eski loglar silinir, yeni kayıt başlatılır
+                if logger.stop() and (not self.clear_previous_logs or logger.clear()) and logger.start():
+                    self._log_action(device_name, "DebugLogger adb ile başlatıldı")
+                    return
+            except Exception as e:
+                self._log_error(device_name, f"DebugLogger adb hatası: {str(e)}")
+            self._log_action(device_name, "DebugLogger adb ile başlatılamadı, UI yolu kullanılıyor")
+        self._start_log_ui(driver, device_name)
+
+    def _start_log_ui(self, driver, device_name):
 
         self.clear_all_apps(driver,self.model_name)
-        time.sleep(2)
+        self.wait_idle(driver, device_name, 2, label="start_log after clear_all_apps")
         try:
             self.find_app(driver,device_name,'//android.widget.TextView[@content-desc="Phone"]')
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="start_log dialer opened", mode="window")
             self.find_app(driver,device_name,'//android.widget.ImageButton[@content-desc="key pad"]')
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="start_log keypad opened")
             keypad = WebDriverWait(driver, 1).until(EC.element_to_be_clickable((AppiumBy.XPATH, '//android.widget.EditText[@resource-id="com.google.android.dialer:id/digits"]')))
             keypad.send_keys(KEYCODES["Log_Screen"])
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="start_log log screen code", mode="window")
 
             permissions = [
                 ("Record_Video", 1),  # Tuple of (permission_name, timeout)
@@ -578,28 +791,29 @@ class StartTest_GetLog(BaseTest):
             max_wait_time = 5  # İzinlerin çıkması için maksimum bekleme süresi
             start_time = time.time()
 
-            while time.time() - start_time < max_wait_time:
+            resolver = BatchResolver(driver)
+            while permissions and time.time() - start_time < max_wait_time:
                 found_permission = False
-                
-                for permission, timeout in permissions:
-                    try:
-                        permission_xpath = XPATHS_OF_PERMISSIONS.get(permission)
-                        if not permission_xpath:
-                            continue
-                            
-                        # Daha kısa bir timeout ile elementin çıkıp çıkmadığını kontrol et
-                        allow_btn = WebDriverWait(driver, 0.5).until(EC.element_to_be_clickable((AppiumBy.XPATH, permission_xpath)))
-                        allow_btn.click()
-                        self._log_action(device_name, f"Allowed {permission} permission")
-                        time.sleep(0.5)
-                        found_permission = True
-                        
-                        # İşlenen izini listeden çıkar (opsiyonel)
-                        permissions = [(p, t) for p, t in permissions if p != permission]
-                        break  # Yeni bir döngüye başla
-                        
-                    except Exception as e:
+
+                # Tüm izin butonları tek page_source anlık görüntüsünde yerel olarak aranır
+                candidates = {p: XPATHS_OF_PERMISSIONS[p] for p, _ in permissions if p in XPATHS_OF_PERMISSIONS}
+                try:
+                    matches = resolver.resolve(candidates)
+                except Exception as e:
+                    self._log_error(device_name, f"Permission snapshot failed: {str(e)}")
+                    matches = {}
+
+                for permission, _ in permissions:
+                    if not matches.get(permission):
                         continue  # Bu izin şu an görünür değil, diğerlerini kontrol et
+                    self._click_at_coordinates(driver, *matches[permission][0].center)
+                    self._log_action(device_name, f"Allowed {permission} permission")
+                    self.wait_idle(driver, device_name, 0.5, label=f"start_log {permission} allowed")
+                    found_permission = True
+
+                    # İşlenen izini listeden çıkar (opsiyonel)
+                    permissions = [(p, t) for p, t in permissions if p != permission]
+                    break  # Yeni bir döngüye başla
                 
                 if not found_permission:
                     # Hiçbir izin bulunamadıysa kısa bir bekle
@@ -620,7 +834,7 @@ class StartTest_GetLog(BaseTest):
             }
 
             self.perform_multiple_swipes(driver, count=4, **swipe_params)
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="start_log swipes")
             self.find_element(driver,device_name,'//android.widget.TextView[@resource-id="android:id/title" and @text="DebugLoggerUI"]')
             
             if self.clear_logs(driver,device_name):
@@ -628,7 +842,8 @@ class StartTest_GetLog(BaseTest):
                 xpath_start_log = '//android.widget.ToggleButton[@resource-id="com.debug.loggerui:id/startStopToggleButton"]'
                             
                 self.find_element(driver, device_name,xpath_start_log)
-                time.sleep(5)
+                # Logger servisi başlarken arayüz birkaç kez yenilenir; en az 1 sn beklenir
+                self.wait_idle(driver, device_name, 5, label="start_log logger started", min_wait=1.0)
                 
         except:
             pass
@@ -636,17 +851,28 @@ class StartTest_GetLog(BaseTest):
 
 
     # Logu başlattıktan sonra, logun kaydedildiği yer
-    def _end_log(self, driver,device_name):
+    def _end_log(self, driver, device_name):
+        if self.use_adb_logger:
+            try:
+                if DebugLoggerController(device_name).stop():
+                    self._log_action(device_name, "DebugLogger adb ile durduruldu")
+                    return
+            except Exception as e:
+                self._log_error(device_name, f"DebugLogger adb hatası: {str(e)}")
+            self._log_action(device_name, "DebugLogger adb ile durdurulamadı, UI yolu kullanılıyor")
+        self._end_log_ui(driver, device_name)
+
+    def _end_log_ui(self, driver,device_name):
         self.clear_all_apps(driver,self.model_name)
-        time.sleep(2)
+        self.wait_idle(driver, device_name, 2, label="end_log after clear_all_apps")
         try:
             self.find_app(driver,device_name,'//android.widget.TextView[@content-desc="Phone"]')
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="end_log dialer opened", mode="window")
             self.find_app(driver,device_name,'//android.widget.ImageButton[@content-desc="key pad"]')
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="end_log keypad opened")
             keypad = WebDriverWait(driver, 1).until(EC.element_to_be_clickable((AppiumBy.XPATH, '//android.widget.EditText[@resource-id="com.google.android.dialer:id/digits"]')))
             keypad.send_keys(KEYCODES["Log_Screen"])
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="end_log log screen code", mode="window")
             swipe_params = {
                 'start_x': 950,
                 'start_y': 1200,
@@ -655,7 +881,7 @@ class StartTest_GetLog(BaseTest):
                 'duration': 250
             }
             self.perform_multiple_swipes(driver, count=4, **swipe_params)
-            time.sleep(0.5)
+            self.wait_idle(driver, device_name, 0.5, label="end_log swipes")
             self.find_element(driver,device_name,'//android.widget.TextView[@resource-id="android:id/title" and @text="DebugLoggerUI"]')
             xpath_start_log = '//android.widget.ToggleButton[@resource-id="com.debug.loggerui:id/startStopToggleButton"]'     
             self.find_element(driver, device_name,xpath_start_log)
@@ -692,13 +918,16 @@ class StartTest_GetLog(BaseTest):
             self.wake_screen_up(1.0) 
 
             # Log kaydını başlat
-            self._start_log(driver,device_name)
+            with self.step(device_name, "start_log"):
+                self._start_log(driver,device_name)
 
             self.click_main(driver,self.model_name,"Main_Button")
             # Testi çalıştır
-            self.testname(driver,device_name)
+            with self.step(device_name, getattr(self.testname, "__name__", type(self.testname).__name__)):
+                self.testname(driver,device_name)
             # Log kaydını sonlandır
-            self._end_log(driver,device_name)
+            with self.step(device_name, "end_log"):
+                self._end_log(driver,device_name)
 
             return True, "Test başarıyla tamamlandı."
         
@@ -712,8 +941,16 @@ class StartTest_GetLog(BaseTest):
 
 class power_button(BaseTest):
 
-    def __init__(self, model_name: str, **kwargs, ):
+    def __init__(self, model_name: str, settle_delay: float = 0.5, raw_capture: bool = True, **kwargs, ):
+        """
+        Args:
+            model_name: Cihaz model ismi
+            settle_delay: keyevent 26 sonrası ekran görüntüsü alınmadan önceki bekleme (sn)
+            raw_capture: True ise kareler cihazda PNG'ye kodlanmadan (ham RGBA) alınır
+        """
         self.model_name = model_name
+        self.settle_delay = settle_delay
+        self.raw_capture = raw_capture
         super().__init__(**kwargs)
     
     
@@ -728,18 +965,18 @@ class power_button(BaseTest):
             folder_name = f"{device_name}_{timestamp}"
             os.makedirs(folder_name, exist_ok=True)
 
-            for i in range(20):
-                subprocess.run(f"adb -s {device_name} shell screencap -p /sdcard/{i}ö.png", shell=True)
-                time.sleep(0.1)
-                subprocess.run(f"adb -s {device_name} pull /sdcard/{i}ö.png {folder_name}/{i}ö.png", shell=True)
-                time.sleep(0.1)
-                subprocess.run(f"adb -s {device_name} shell input keyevent 26", shell=True)
-                time.sleep(0.5)
-                subprocess.run(f"adb -s {device_name} shell screencap -p /sdcard/{i}s.png", shell=True)
-                time.sleep(0.1)
-                subprocess.run(f"adb -s {device_name} pull /sdcard/{i}s.png {folder_name}/{i}s.png", shell=True)
-                time.sleep(0.1)
-                self._log_action(device_name, f"Power button clicked {i} times")
+            adb = AdbClient.for_device(device_name)
+            capture = ScreenCapture(device_name, adb)
+            grab = capture.capture_raw if self.raw_capture else capture.capture_png
+
+            # Kareler bellekte alınır, PNG kodlama ve diske yazma arka planda yapılır
+            with ScreenshotWriter() as writer:
+                for i in range(20):
+                    writer.submit(f"{folder_name}/{i}ö.png", grab())
+                    adb.shell("input keyevent 26")
+                    time.sleep(self.settle_delay)
+                    writer.submit(f"{folder_name}/{i}s.png", grab())
+                    self._log_action(device_name, f"Power button clicked {i} times")
 
             return True, "Power button clicked"
         except Exception as e:
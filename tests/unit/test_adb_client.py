@@ -0,0 +1,187 @@
+import re
+import socket
+import socketserver
+import threading
+import unittest
+
+from core.adb_client import AdbClient, AdbError, encode_request, host_request, list_devices, open_service
+
+SCRIPT_PATTERN = re.compile(
+    rb"\{ (?P<command>.*?)\n\} </dev/null 2>&1; printf '\\n(?P<marker>__ADB_DONE_\w+__):%d\\n' \$\?\n", re.S)
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """adb sunucusunun smart-socket el sıkışmasını ve `exec:sh` oturumunu taklit eder.
+
+    Shell komutları gerçek sh yerine küçük bir tablodan yanıtlanır:
+    `echo X` -> X, `false` -> çıkış kodu 1, `hang` -> yanıt yok, `die` -> bağlantı kapatılır.
+    """
+
+    def _recv_exact(self, size):
+        data = b""
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                raise EOFError
+            data += chunk
+        return data
+
+    def _read_request(self):
+        return self._recv_exact(int(self._recv_exact(4), 16)).decode("utf-8")
+
+    def handle(self):
+        server = self.server
+        try:
+            request = self._read_request()
+            server.requests.append(request)
+            if request == "host:devices":
+                payload = b"SERIAL1\tdevice\nSERIAL2\toffline\n"
+                self.request.sendall(b"OKAY" + b"%04x" % len(payload) + payload)
+                return
+            if server.fail_transports > 0:
+                server.fail_transports -= 1
+                message = b"device offline"
+                self.request.sendall(b"FAIL" + b"%04x" % len(message) + message)
+                return
+            self.request.sendall(b"OKAY")
+            service = self._read_request()
+            server.requests.append(service)
+            self.request.sendall(b"OKAY")
+            if service == "exec:sh":
+                server.sessions.append(self.request)
+                self._shell()
+            elif service.startswith("exec:echo "):
+                self.request.sendall(service[len("exec:echo "):].encode("utf-8") * 1000)
+            elif service.startswith("exec:{ echo ") and service.endswith("\n} 2>&1"):
+                # AsyncAdbClient.shell'in tek seferlik exec sarmalayıcısı
+                self.request.sendall(service[len("exec:{ echo "):-len("\n} 2>&1")].encode("utf-8") + b"\n")
+        except (EOFError, OSError):
+            pass
+
+    def _shell(self):
+        buffer = b""
+        while True:
+            chunk = self.request.recv(65536)
+            if not chunk:
+                return
+            buffer += chunk
+            while True:
+                match = SCRIPT_PATTERN.search(buffer)
+                if match is None:
+                    break
+                buffer = buffer[match.end():]
+                command = match.group("command").decode("utf-8")
+                self.server.commands.append(command)
+                if command == "die":
+                    self.request.shutdown(socket.SHUT_RDWR)
+                    return
+                if command == "hang":
+                    continue
+                output, returncode = "", 0
+                if command.startswith("echo "):
+                    output = command[len("echo "):] + "\n"
+                elif command == "false":
+                    returncode = 1
+                marker = match.group("marker").decode("ascii")
+                # Yanıt parçalı gönderilir; istemci bitiş işaretçisini birleştirmelidir
+                response = f"{output}\n{marker}:{returncode}\n".encode("utf-8")
+                for index in range(0, len(response), 7):
+                    self.request.sendall(response[index:index + 7])
+
+
+class FakeAdbServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeAdbHandler)
+        self.requests = []
+        self.commands = []
+        self.sessions = []
+        self.fail_transports = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def connections(self, service="exec:sh"):
+        return self.requests.count(service)
+
+    def drop_sessions(self):
+        for sock in self.sessions:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.sessions.clear()
+
+
+class AdbClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAdbServer()
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.adb = AdbClient("SERIAL1", "127.0.0.1", self.server.port, timeout=5)
+
+    def tearDown(self):
+        self.adb.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_encode_request(self):
+        self.assertEqual(encode_request("host:devices"), b"000chost:devices")
+        self.assertEqual(encode_request("exec:ls ş"), b"000aexec:ls \xc5\x9f")
+
+    def test_host_request_and_devices(self):
+        self.assertEqual(list_devices("127.0.0.1", self.server.port),
+                         {"SERIAL1": "device", "SERIAL2": "offline"})
+        self.assertIn("SERIAL1", host_request("host:devices", "127.0.0.1", self.server.port))
+
+    def test_fail_status_raises_with_message(self):
+        self.server.fail_transports = 1
+        with self.assertRaisesRegex(AdbError, "device offline"):
+            open_service("SERIAL1", "exec:sh", "127.0.0.1", self.server.port)
+
+    def test_run_reads_output_and_returncode(self):
+        self.assertEqual(self.adb.run("echo merhaba"), (0, "merhaba\n"))
+        self.assertEqual(self.adb.run("false"), (1, ""))
+        self.assertEqual(self.adb.shell("echo ikinci"), "ikinci\n")
+        self.assertEqual(self.server.connections(), 1)  # Oturum komutlar arasında korunur
+
+    def test_run_many_is_pipelined(self):
+        results = self.adb.run_many(["echo a", "false", "echo c"])
+        self.assertEqual(results, [(0, "a\n"), (1, ""), (0, "c\n")])
+        self.assertEqual(self.adb.run_many([]), [])
+        self.assertEqual(self.server.connections(), 1)
+
+    def test_exec_out_reads_until_close(self):
+        self.assertEqual(self.adb.exec_out("echo xy"), b"xy" * 1000)
+
+    def test_reconnects_when_idle_session_was_closed(self):
+        self.adb.run("echo a")
+        self.server.drop_sessions()
+        self.assertEqual(self.adb.run("echo b"), (0, "b\n"))
+        self.assertEqual(self.server.connections(), 2)
+        self.assertEqual(self.server.commands, ["echo a", "echo b"])
+
+    def test_retries_transport_failure_before_send(self):
+        self.server.fail_transports = 1
+        self.assertEqual(self.adb.run("echo a"), (0, "a\n"))
+        self.assertEqual(self.server.commands, ["echo a"])
+
+    def test_mid_stream_failure_is_not_retried(self):
+        with self.assertRaises(AdbError):
+            self.adb.run("die")
+        self.assertEqual(self.server.commands, ["die"])  # Komut ikinci kez gönderilmez
+        self.assertEqual(self.adb.run("echo sonra"), (0, "sonra\n"))
+        self.assertEqual(self.server.connections(), 2)
+
+    def test_per_call_timeout_drops_session(self):
+        with self.assertRaises(socket.timeout):
+            self.adb.run("hang", timeout=0.2)
+        self.assertEqual(self.server.commands, ["hang"])
+        self.assertEqual(self.adb.run("echo a"), (0, "a\n"))
+        self.assertEqual(self.server.connections(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from core import artifact_store
+from core.artifact_store import ArtifactStore
+
+
+class ArtifactStoreTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = directory.name
+        self.store_dir = os.path.join(self.root, ".store")
+
+    def _run(self, name, files):
+        run_dir = os.path.join(self.root, name)
+        for relative, data in files.items():
+            path = os.path.join(run_dir, *relative.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+        return run_dir
+
+    def test_duplicates_become_hardlinks_to_one_blob(self):
+        run1 = self._run("D1_20250101_000000", {"mobilelog/main_log": b"same", "kernel_log": b"k1"})
+        run2 = self._run("D1_20250101_010000", {"mobilelog/main_log": b"same", "kernel_log": b"k2"})
+        store = ArtifactStore(self.store_dir)
+        self.assertEqual(store.ingest_tree(run1).new_blobs, 2)
+        stats = store.ingest_tree(run2)
+        self.assertEqual((stats.new_blobs, stats.deduplicated, stats.bytes_saved), (1, 1, 4))
+        first = os.stat(os.path.join(run1, "mobilelog", "main_log"))
+        second = os.stat(os.path.join(run2, "mobilelog", "main_log"))
+        self.assertEqual(first.st_ino, second.st_ino)
+        self.assertEqual(store.verify(), [])
+        # Geçici dosya kalmaz
+        leftovers = [name for _, _, names in os.walk(self.root) for name in names if name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+    def test_inode_index_is_persisted_across_instances(self):
+        run = self._run("D1_20250101_000000", {"main_log": b"a" * 100, "sys_log": b"b"})
+        ArtifactStore(self.store_dir).ingest_tree(run)
+        store = ArtifactStore(self.store_dir)
+        with mock.patch.object(artifact_store, "sha256_file", side_effect=AssertionError("hash")), \
+                mock.patch.object(ArtifactStore, "_scan_inodes", side_effect=AssertionError("scan")):
+            stats = store.ingest_tree(run)
+        self.assertEqual(stats.skipped, 2)
+
+    def test_stale_index_entry_is_rehashed(self):
+        run = self._run("D1_20250101_000000", {"main_log": b"a"})
+        store = ArtifactStore(self.store_dir)
+        store.ingest_tree(run)
+        digest = store.ingest_file(os.path.join(run, "main_log"))
+        os.remove(store.blob_path(digest))  # Blob depo dışında silindi
+        self.assertEqual(ArtifactStore(self.store_dir).ingest_file(os.path.join(run, "main_log")), digest)
+        self.assertTrue(os.path.exists(store.blob_path(digest)))
+
+    def test_gc_and_verify(self):
+        run1 = self._run("D1_20250101_000000", {"main_log": b"keep"})
+        run2 = self._run("D1_20250101_010000", {"main_log": b"drop"})
+        store = ArtifactStore(self.store_dir)
+        store.ingest_tree(run1)
+        dropped = store.ingest_file(os.path.join(run2, "main_log"))
+        store.ingest_tree(run2)
+        shutil.rmtree(run2)
+        self.assertEqual(store.gc(dry_run=True)["removed"], 1)
+        self.assertEqual(store.gc(), {"removed": 1, "freed_bytes": 4})
+        self.assertFalse(os.path.exists(store.blob_path(dropped)))
+
+        kept = store.ingest_file(os.path.join(run1, "main_log"))
+        os.remove(os.path.join(run1, "main_log"))  # Hardlink kırılmadan blob'u bozmak için
+        with open(store.blob_path(kept), "ab") as f:
+            f.write(b"!")
+        self.assertEqual(store.verify(), [kept])
+
+
+if __name__ == "__main__":
+    unittest.main()
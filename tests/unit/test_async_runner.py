@@ -0,0 +1,150 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from core.adb_client import AdbError, AsyncAdbClient
+from test_adb_client import FakeAdbServer
+
+try:
+    from core import async_runner
+except ImportError:  # appium-python-client / selenium kurulu değil
+    async_runner = None
+
+FAKE_ADB = """
+import os, sys
+args = sys.argv[1:]
+if args[-2] == "/yok":
+    sys.stderr.write("remote object '/yok' does not exist\\n")
+    raise SystemExit(1)
+with open(os.path.join(args[-1], "pulled.txt"), "w") as f:
+    f.write(" ".join(args) + "\\n" + os.environ["ANDROID_ADB_SERVER_PORT"])
+"""
+
+
+class AsyncAdbClientTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeAdbServer()
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.adb = AsyncAdbClient("SERIAL1", "127.0.0.1", self.server.port)
+
+    def test_exec_out_reads_until_close(self):
+        self.assertEqual(asyncio.run(self.adb.exec_out("echo xy")), b"xy" * 1000)
+        self.assertEqual(self.server.requests[:2], ["host:transport:SERIAL1", "exec:echo xy"])
+
+    def test_shell_wraps_command_and_decodes(self):
+        self.assertEqual(asyncio.run(self.adb.shell("echo merhaba")), "merhaba\n")
+        self.assertEqual(self.server.requests[-1], "exec:{ echo merhaba\n} 2>&1")
+
+    def test_commands_run_concurrently(self):
+        async def many():
+            return await asyncio.gather(*(self.adb.shell(f"echo {i}") for i in range(20)))
+        self.assertEqual(asyncio.run(many()), [f"{i}\n" for i in range(20)])
+
+    def test_fail_status_raises(self):
+        self.server.fail_transports = 1
+        with self.assertRaisesRegex(AdbError, "device offline"):
+            asyncio.run(self.adb.exec_out("echo a"))
+
+    @unittest.skipIf(os.name == "nt", "sahte adb betiği shebang ile çalıştırılır")
+    def test_pull_uses_adb_client_against_same_server(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        command = os.path.join(directory.name, "adb")
+        with open(command, "w", encoding="utf-8") as f:
+            f.write(f"#!{sys.executable}\n{FAKE_ADB}")
+        os.chmod(command, 0o755)
+        path = directory.name + os.pathsep + os.environ.get("PATH", "")
+        with mock.patch.dict(os.environ, {"PATH": path}):
+            self.assertEqual(asyncio.run(self.adb.pull("/sdcard/debuglogger", directory.name)), 0)
+            with mock.patch("builtins.print") as printed:
+                self.assertEqual(asyncio.run(self.adb.pull("/yok", directory.name)), 1)
+        with open(os.path.join(directory.name, "pulled.txt"), encoding="utf-8") as f:
+            args, port = f.read().splitlines()
+        self.assertEqual(args, f"-s SERIAL1 pull /sdcard/debuglogger {directory.name}")
+        self.assertEqual(port, str(self.server.port))
+        self.assertIn("does not exist", printed.call_args[0][0])
+
+
+class StubTest:
+    """Senkron BaseTest yerine geçen, çağrıları kaydeden test"""
+
+    def __init__(self, passed=True):
+        self.passed = passed
+        self.calls = []
+
+    def run_with_retry(self, driver, device_name):
+        self.calls.append((driver, device_name, threading.current_thread().name))
+        return self.passed
+
+
+@unittest.skipIf(async_runner is None, "appium-python-client kurulu değil")
+class AsyncTestRunnerTest(unittest.TestCase):
+    DEVICES = [{"name": "D1", "port": 4723}, {"name": "D2", "port": 4724}]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.runner = async_runner.AsyncTestRunner(self.DEVICES, [], output_dir=directory.name)
+        self.quit = []
+        patches = [
+            mock.patch.object(self.runner, "_initialize_driver", side_effect=lambda name, port: f"driver-{name}"),
+            mock.patch.object(self.runner, "_safe_quit_driver", side_effect=lambda driver, name: self.quit.append(driver)),
+            mock.patch.object(self.runner, "_pull_debug_logs_async", new=mock.AsyncMock()),
+            mock.patch.object(async_runner.ResultSink, "for_device"),
+            mock.patch("core.test_runner.AndroidPerformanceMonitor"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_default_pool_has_a_thread_per_device(self):
+        self.assertEqual(self.runner.max_threads, 2)
+
+    def test_runs_coroutine_and_sync_tests(self):
+        async def scenario(ctx):
+            size = await ctx.call(len, ctx.driver)
+            return size > 0 and ctx.device_name in ctx.driver
+
+        sync_test = StubTest(passed=False)
+        with mock.patch("builtins.print"):
+            results = self.runner.run([scenario, sync_test])
+
+        self.assertEqual(set(results), {"D1", "D2"})
+        for device, rows in results.items():
+            self.assertEqual([row["test"] for row in rows], ["scenario", "StubTest"])
+            self.assertEqual([row["passed"] for row in rows], [True, False])
+            self.assertTrue(all(row["device"] == device for row in rows))
+        # Senkron test, event loop'u değil havuzdaki bir thread'i kullanır
+        self.assertEqual(sorted(call[:2] for call in sync_test.calls), [("driver-D1", "D1"), ("driver-D2", "D2")])
+        self.assertTrue(all(call[2] != threading.main_thread().name for call in sync_test.calls))
+        self.assertEqual(sorted(self.quit), ["driver-D1", "driver-D2"])
+        self.assertEqual(self.runner._pull_debug_logs_async.await_count, 2)
+
+    def test_sync_test_is_sampled_through_execute_test_case(self):
+        self.runner.sample_interval = 0.5
+        sampler = mock.MagicMock()
+        with mock.patch.object(self.runner, "_start_sampler", return_value=sampler) as start, \
+                mock.patch.object(self.runner, "_stop_sampler") as stop, mock.patch("builtins.print"):
+            results = self.runner.run(StubTest())
+        self.assertTrue(all(rows[0]["passed"] for rows in results.values()))
+        self.assertEqual(start.call_count, 2)
+        self.assertEqual(sorted(call.args[0] for call in stop.call_args_list), ["D1", "D2"])
+
+    def test_exception_is_reported_as_failure(self):
+        async def broken(ctx):
+            raise RuntimeError("bozuk")
+
+        with mock.patch("builtins.print"):
+            results = self.runner.run(broken)
+        self.assertEqual(results["D1"][0]["error"], "bozuk")
+        self.assertFalse(results["D1"][0]["passed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
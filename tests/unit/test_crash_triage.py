@@ -0,0 +1,112 @@
+import glob
+import json
+import os
+import tempfile
+import unittest
+
+from core.crash_triage import CrashTriage, normalize_subject, parse_aee_db, parse_anr, to_iso
+
+LOGS = os.path.join(os.path.dirname(__file__), "..", "..", "core", "Logs")
+ANR_RUN = os.path.join(LOGS, "L2885900115_20250613_151747")
+AEE_RUN = os.path.join(LOGS, "L2885900175_20250613_151754")
+
+SYNTHETIC_ANR = """Subject: Input dispatching timed out (Waiting because 0x7f12 window {a1b2 u0 com.example/.Main} is not responding)
+RssCurrentKb: 1000
+VmSwapKb: 20
+
+----- pid 4321 at 2025-06-13 14:30:01.123+0300 -----
+Cmd line: com.example
+
+"main" prio=5 tid=1 Blocked
+  | group="main" sCount=1
+  native: #00 pc 000a1b2c  /apex/com.android.runtime/lib64/bionic/libc.so (syscall+28)
+  at com.example.Store.load(Store.java:42)
+  - waiting to lock <0x0abc> (a com.example.Store) held by thread 12
+  at com.example.Main.onCreate(Main.java:10)
+
+"Signal Catcher" daemon prio=10 tid=2 Runnable
+  at java.lang.Object.wait(Native method)
+"""
+
+
+class ParserTest(unittest.TestCase):
+    def test_to_iso_formats(self):
+        self.assertEqual(to_iso("2025-06-06 17:51:14.35+0300"), "2025-06-06T17:51:14")
+        self.assertEqual(to_iso("Fri Jun  6 18:07:22 +03 2025"), "2025-06-06T18:07:22")
+        self.assertEqual(to_iso("bilinmiyor"), "bilinmiyor")
+
+    def test_normalize_subject_drops_addresses_and_numbers(self):
+        self.assertEqual(normalize_subject("Broadcast of Intent { act=android.intent.action.TIME_TICK }"),
+                         "Broadcast of Intent")
+        self.assertEqual(normalize_subject("Input dispatching timed out (0x7f12 window)"),
+                         "Input dispatching timed out")
+
+    def test_synthetic_anr_main_thread_only(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "anr_2025-06-13-14-30-01-123")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SYNTHETIC_ANR)
+            result = parse_anr(path)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SYNTHETIC_ANR.replace("4321", "9999").replace("0x7f12", "0x1"))
+            again = parse_anr(path)
+        self.assertEqual((result["process"], result["pid"], result["state"], result["time"]),
+                         ("com.example", 4321, "Blocked", "2025-06-13T14:30:01"))
+        self.assertEqual(result["rss"], {"RssCurrentKb": 1000, "VmSwapKb": 20})
+        self.assertEqual(result["frames"], ["libc.so!syscall", "com.example.Store.load",
+                                            "lock:com.example.Store", "com.example.Main.onCreate"])
+        self.assertEqual(result["top"], ["com.example.Store.load", "lock:com.example.Store",
+                                         "com.example.Main.onCreate"])
+        # Başka pid ve adreslerle aynı donma aynı imzayı alır, ayrı olay sayılır
+        self.assertEqual(again["signature"], result["signature"])
+        self.assertNotEqual(again["occurrence"], result["occurrence"])
+
+    def test_file_without_pid_header_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "anr_empty")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("Subject: yarım dosya\n")
+            self.assertIsNone(parse_anr(path))
+
+    @unittest.skipUnless(os.path.isdir(ANR_RUN), "core/Logs örnekleri yok")
+    def test_sample_anr_traces(self):
+        results = [parse_anr(path) for path in sorted(glob.glob(os.path.join(ANR_RUN, "debuglogger", "pri", "anr", "*")))]
+        self.assertTrue(results and all(results))
+        instagram = [r for r in results if r["process"] == "com.instagram.android"]
+        self.assertGreater(len(instagram), 1)
+        self.assertEqual(len({r["signature"] for r in instagram}), 1)
+        self.assertEqual(len({r["occurrence"] for r in instagram}), len(instagram))
+        self.assertEqual(instagram[0]["top"][0], "android.os.BinderProxy.transactNative")
+
+    @unittest.skipUnless(os.path.isdir(AEE_RUN), "core/Logs örnekleri yok")
+    def test_sample_aee_db(self):
+        [event] = parse_aee_db(os.path.join(AEE_RUN, "debuglogger", "pri", "vendor_aee_exp", "db.fatal.02.HANG"))
+        self.assertEqual((event["class"], event["type"], event["time"]), ("HANG", "HANG_DETECT", "2025-06-06T18:07:22"))
+
+
+@unittest.skipUnless(os.path.isdir(ANR_RUN) and os.path.isdir(AEE_RUN), "core/Logs örnekleri yok")
+class CrashTriageTest(unittest.TestCase):
+    def test_run_clusters_and_remembers_signatures(self):
+        with tempfile.TemporaryDirectory() as directory:
+            known_path = os.path.join(directory, "known_signatures.json")
+            triage = CrashTriage(known_path, max_workers=2)
+            first = triage.run([ANR_RUN, AEE_RUN])
+            clusters = {c["title"]: c for c in first["new"]}
+            self.assertEqual(first["known"], [])
+            self.assertGreater(first["signatures"], 3)
+
+            # db_history ve db.fatal.02.HANG aynı olayı anlatır; küme bir kez sayar
+            hang = clusters["AEE HANG: HANG_DETECT"]
+            self.assertEqual(hang["devices"], ["L2885900175"])
+            self.assertEqual(hang["count"], 5)  # db_history'deki HANG_DETECT satırları
+
+            with open(known_path, "r", encoding="utf-8") as f:
+                self.assertEqual(set(json.load(f)), {c["signature"] for c in first["new"]})
+            second = triage.run([ANR_RUN, AEE_RUN])
+            self.assertEqual(second["new"], [])
+            self.assertEqual(len(second["known"]), first["signatures"])
+            self.assertIn("BİLİNEN", triage.format_report(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
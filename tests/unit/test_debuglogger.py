@@ -0,0 +1,70 @@
+import time
+import unittest
+
+from core.debuglogger import DebugLoggerController
+
+CONFIG = {
+    "package": "com.debug.loggerui",
+    "action": "com.debug.loggerui.ADB_CMD",
+    "log_types": 7,
+    "status_props": ["vendor.MB.running"],
+    "log_dir": "/sdcard/debuglogger",
+}
+
+
+class FakeLoggerAdb:
+    """Durum özelliği olmayan cihaz: log dosyaları yalnızca alıcı varsa ve kayıt sürüyorsa büyür"""
+
+    def __init__(self, receiver=True, running=False):
+        self.receiver = receiver
+        self.running = running
+        self.size = 100
+        self.commands = []
+
+    def run(self, command, timeout=None):
+        self.commands.append(command)
+        if command.startswith("am broadcast"):
+            if self.receiver:
+                self.running = "cmd_name start" in command
+            # Alıcı olmasa da am broadcast başarılı yazar
+            return 0, "Broadcasting: Intent { act=com.debug.loggerui.ADB_CMD }\nBroadcast completed: result=0\n"
+        if command.startswith("find"):
+            if self.running:
+                self.size += 4096
+            return 0, f"{self.size}\n512\n"
+        return 0, ""
+
+    def shell_many(self, commands):
+        return ["" for _ in commands]
+
+
+class DebugLoggerControllerTest(unittest.TestCase):
+    def _controller(self, adb):
+        return DebugLoggerController("D1", adb, CONFIG, poll_interval=0.01, settle_seconds=0.05)
+
+    def test_start_and_stop_verified_by_log_growth(self):
+        adb = FakeLoggerAdb()
+        logger = self._controller(adb)
+        self.assertTrue(logger.start(timeout=2))
+        self.assertTrue(adb.running)
+        self.assertTrue(logger.stop(timeout=2))
+        self.assertFalse(adb.running)
+
+    def test_broadcast_without_receiver_is_not_trusted(self):
+        adb = FakeLoggerAdb(receiver=False, running=True)
+        logger = self._controller(adb)
+        started = time.monotonic()
+        self.assertFalse(logger.stop(timeout=0.3))  # Loglar büyümeye devam ediyor; UI yoluna düşülür
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+        adb = FakeLoggerAdb(receiver=False)
+        self.assertFalse(self._controller(adb).start(timeout=0.3))
+
+    def test_clear_is_not_part_of_start(self):
+        adb = FakeLoggerAdb()
+        self._controller(adb).start(timeout=2)
+        self.assertFalse(any(command.startswith("rm ") for command in adb.commands))
+
+
+if __name__ == "__main__":
+    unittest.main()
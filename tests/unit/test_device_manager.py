@@ -0,0 +1,179 @@
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.device_manager import AppiumServerPool, find_free_port, wait_until_ready
+
+# Appium yerine başlatılan sahte sunucu: --port ile /status yanıtlar.
+# --crash hemen çıkar, --ready-after N ilk N saniye "ready": false döner.
+FAKE_APPIUM = r'''
+import json, sys, time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+args = sys.argv[1:]
+if "--crash" in args:
+    sys.exit(3)
+port = int(args[args.index("--port") + 1])
+ready_at = time.monotonic() + (float(args[args.index("--ready-after") + 1]) if "--ready-after" in args else 0)
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"value": {"ready": time.monotonic() >= ready_at}}).encode()
+        self.send_response(200 if self.path == "/status" else 404)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+HTTPServer(("127.0.0.1", port), Handler).serve_forever()
+'''
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        server.hits += 1
+        if self.path != "/status":
+            self.send_response(404)
+            self.end_headers()
+            return
+        ready = "true" if server.hits > server.not_ready_hits else "false"
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(f'{{"value": {{"ready": {ready}}}}}'.encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class WaitUntilReadyTest(unittest.TestCase):
+    def _serve(self, not_ready_hits=0):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+        server.hits = 0
+        server.not_ready_hits = not_ready_hits
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_ready_status(self):
+        server = self._serve()
+        self.assertTrue(wait_until_ready(server.server_address[1], timeout=5, interval=0.01))
+
+    def test_waits_until_ready_flag(self):
+        server = self._serve(not_ready_hits=3)
+        self.assertTrue(wait_until_ready(server.server_address[1], timeout=5, interval=0.01))
+        self.assertGreater(server.hits, 3)
+
+    def test_times_out_without_server(self):
+        started = time.monotonic()
+        self.assertFalse(wait_until_ready(find_free_port(), timeout=0.3, interval=0.05))
+        self.assertLess(time.monotonic() - started, 3)
+
+    def test_stop_event_ends_wait(self):
+        stop = threading.Event()
+        threading.Timer(0.2, stop.set).start()
+        started = time.monotonic()
+        self.assertFalse(wait_until_ready(find_free_port(), timeout=30, interval=5, stop_event=stop))
+        self.assertLess(time.monotonic() - started, 3)
+
+    def test_fails_fast_when_process_exits(self):
+        import subprocess
+        process = subprocess.Popen([sys.executable, "-c", "raise SystemExit(2)"])
+        process.wait()
+        started = time.monotonic()
+        self.assertFalse(wait_until_ready(find_free_port(), timeout=30, process=process))
+        self.assertLess(time.monotonic() - started, 1)
+
+
+@unittest.skipIf(os.name == "nt", "sahte appium betiği shebang ile çalıştırılır")
+class AppiumServerPoolTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.command = os.path.join(directory.name, "fake-appium")
+        with open(self.command, "w", encoding="utf-8") as f:
+            f.write(f"#!{sys.executable}\n{FAKE_APPIUM}")
+        os.chmod(self.command, 0o755)
+
+    def _pool(self, *extra_args, **kwargs):
+        kwargs.setdefault("watchdog_interval", None)
+        pool = AppiumServerPool(self.command, extra_args, ready_timeout=10, **kwargs)
+        self.addCleanup(pool.stop_all)
+        return pool
+
+    def test_start_and_stop(self):
+        pool = self._pool("--ready-after", "0.3")
+        ports = pool.start(["a", "b"])
+        self.assertEqual(set(ports), {"a", "b"})
+        self.assertTrue(wait_until_ready(ports["a"], timeout=1))
+        processes = [server.process for server in pool.servers.values()]
+        pool.stop_all()
+        self.assertTrue(all(process.poll() is not None for process in processes))
+        with socket.socket() as sock:
+            self.assertNotEqual(sock.connect_ex(("127.0.0.1", ports["a"])), 0)
+
+    def test_start_for_devices_assigns_ports(self):
+        pool = self._pool()
+        devices = pool.start_for_devices([{"name": "D1", "udid": "X"}])
+        self.assertEqual(devices[0]["udid"], "X")
+        self.assertEqual(devices[0]["port"], pool.servers["D1"].port)
+
+    def test_crashing_server_fails_fast(self):
+        pool = self._pool("--crash")
+        started = time.monotonic()
+        self.assertEqual(pool.start(["a"]), {})
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_watchdog_restarts_crashed_server(self):
+        pool = self._pool(watchdog_interval=0.05, restart_backoff=0.05)
+        port = pool.start(["a"])["a"]
+        pool.servers["a"].process.kill()
+        deadline = time.monotonic() + 10
+        while pool.servers["a"].restarts == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(pool.servers["a"].restarts, 1)
+        self.assertTrue(wait_until_ready(port, timeout=10))
+
+    def test_stop_all_interrupts_restart_in_progress(self):
+        pool = self._pool(watchdog_interval=0.02, restart_backoff=0.01)
+        pool.start(["a"])
+        pool.ready_timeout = 60
+        pool.extra_args += ["--ready-after", "60"]  # Yeniden başlatılan sunucu uzun süre hazır olmaz
+        pool.servers["a"].process.kill()
+        server = pool.servers["a"]
+        deadline = time.monotonic() + 10
+        while server.restarts == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(server.restarts, 1)
+        started = time.monotonic()
+        pool.stop_all()
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIsNotNone(server.process.poll())  # Yeniden başlatılan süreç de kapatıldı
+
+    def test_start_after_stop_all(self):
+        pool = self._pool()
+        pool.start(["a"])
+        pool.stop_all()
+        self.assertEqual(set(pool.start(["b"])), {"b"})
+
+    def test_watchdog_gives_up_after_max_restarts(self):
+        pool = self._pool(watchdog_interval=0.02, restart_backoff=0.01, max_restarts=2)
+        pool.start(["a"])
+        pool.extra_args.append("--crash")  # Sonraki başlatmaların hepsi çöker
+        pool.servers["a"].process.kill()
+        deadline = time.monotonic() + 10
+        while not pool.servers["a"].given_up and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertTrue(pool.servers["a"].given_up)
+        self.assertEqual(pool.servers["a"].restarts, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
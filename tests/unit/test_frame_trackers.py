@@ -0,0 +1,143 @@
+import unittest
+
+import numpy as np
+
+from core.frame_trackers import GfxinfoWindow, SurfaceFlingerTracker
+from core.perf_parsers import (SF_PENDING_FENCE, framestats_stage_durations, parse_framestats,
+                               parse_gfxinfo_framestats, parse_latency_array, parse_surfaceflinger_latency)
+
+REFRESH_NS = 16_666_666
+FRAME_NS = 16_000_000
+
+
+def latency_output(presents, pending=0):
+    """`dumpsys SurfaceFlinger --latency` biçiminde çıktı (sonda boş satırlar, fence bekleyenler)"""
+    lines = [str(REFRESH_NS)]
+    lines += [f"{p - 1000} {p} {p - 500}" for p in presents]
+    lines += [f"0 {SF_PENDING_FENCE} 0"] * pending
+    return "\n".join(lines) + "\n\n"
+
+
+class LatencyParserTest(unittest.TestCase):
+    def test_parses_rows_and_drops_pending_and_empty(self):
+        refresh, frames = parse_latency_array(latency_output([100, 200], pending=2) + "0 0 0\n")
+        self.assertEqual(refresh, REFRESH_NS)
+        np.testing.assert_array_equal(frames, [[-900, 100, -400], [-800, 200, -300]])
+
+    def test_non_numeric_output_is_empty(self):
+        refresh, frames = parse_latency_array("Error: layer not found\n")
+        self.assertEqual((refresh, frames.shape), (0, (0, 3)))
+        self.assertIn("error", parse_surfaceflinger_latency(""))
+
+    def test_interleaved_warning_keeps_numeric_rows(self):
+        raw = "W/SurfaceFlinger: layer name truncated\n" + latency_output([100, 200], pending=1)
+        raw += "Error: 1 layer skipped\n"
+        refresh, frames = parse_latency_array(raw)
+        self.assertEqual(refresh, REFRESH_NS)
+        np.testing.assert_array_equal(frames, [[-900, 100, -400], [-800, 200, -300]])
+
+    def test_fps_from_present_times(self):
+        result = parse_surfaceflinger_latency(latency_output([i * FRAME_NS for i in range(1, 62)]))
+        self.assertAlmostEqual(result["avg_fps"], 62.5)
+        self.assertEqual(result["janky_frames"], 0)
+
+
+class SurfaceFlingerTrackerTest(unittest.TestCase):
+    def setUp(self):
+        self.tracker = SurfaceFlingerTracker("D", "layer", adb=object())
+
+    def test_overlapping_reads_are_not_double_counted(self):
+        self.assertEqual(self.tracker.ingest(latency_output([i * FRAME_NS for i in range(1, 11)])), 10)
+        self.assertEqual(self.tracker.ingest(latency_output([i * FRAME_NS for i in range(6, 16)])), 5)
+        stats = self.tracker.stats()
+        self.assertEqual((stats["total_frames"], stats["buffer_gaps"], stats["janky_frames"]), (15, 0, 0))
+        self.assertAlmostEqual(stats["avg_fps"], 62.5)
+        self.assertAlmostEqual(stats["p50_ms"], 16.1, places=6)  # 0.1 ms'lik kutunun üst sınırı
+
+    def test_wrapped_buffer_is_counted_as_gap(self):
+        self.tracker.ingest(latency_output([FRAME_NS, 2 * FRAME_NS]))
+        self.tracker.ingest(latency_output([10 * FRAME_NS, 11 * FRAME_NS, 14 * FRAME_NS]))
+        stats = self.tracker.stats()
+        self.assertEqual((stats["total_frames"], stats["buffer_gaps"]), (5, 1))
+        self.assertEqual(stats["janky_frames"], 1)  # 48 ms'lik aralık; aradaki kayıp boşluk sayılmaz
+        self.assertAlmostEqual(stats["max_ms"], 48.0)
+
+
+FRAMESTATS_HEADER = ("Flags,FrameTimelineVsyncId,IntendedVsync,Vsync,InputEventId,HandleInputStart,"
+                     "AnimationStart,PerformTraversalsStart,DrawStart,FrameDeadline,FrameInterval,"
+                     "FrameStartTime,SyncQueued,SyncStart,IssueDrawCommandsStart,SwapBuffers,"
+                     "FrameCompleted,DequeueBufferDuration,QueueBufferDuration,GpuCompleted,"
+                     "SwapBuffersCompleted,DisplayPresentTime,CommandSubmissionCompleted,")
+
+
+def framestats_row(flags, start, total_ms, input_start=0):
+    ms = 1_000_000
+    values = {
+        "Flags": flags, "IntendedVsync": start, "Vsync": start, "HandleInputStart": input_start,
+        "AnimationStart": start + 1 * ms, "PerformTraversalsStart": start + 2 * ms,
+        "DrawStart": start + 4 * ms, "FrameInterval": REFRESH_NS, "SyncQueued": start + 6 * ms,
+        "SyncStart": start + 6 * ms, "IssueDrawCommandsStart": start + 7 * ms,
+        "SwapBuffers": start + 9 * ms, "FrameCompleted": start + total_ms * ms,
+    }
+    return ",".join(str(values.get(name, 0)) for name in FRAMESTATS_HEADER.split(",") if name) + ","
+
+
+def gfxinfo_output(*windows):
+    parts = ["Applications Graphics Acceleration Info:"]
+    for rows in windows:
+        parts += ["---PROFILEDATA---", FRAMESTATS_HEADER, *rows, "---PROFILEDATA---", "View hierarchy:"]
+    return "\n".join(parts) + "\n"
+
+
+class FramestatsParserTest(unittest.TestCase):
+    def test_blocks_are_concatenated(self):
+        header, frames = parse_framestats(gfxinfo_output(
+            [framestats_row(0, 1000, 10)], [framestats_row(0, 2000, 12), framestats_row(1, 3000, 50)]))
+        self.assertEqual(header[0], "Flags")
+        self.assertEqual(len(header), 23)
+        self.assertEqual(frames.shape, (3, 23))
+
+    def test_stage_durations_skip_flagged_frames(self):
+        header, frames = parse_framestats(gfxinfo_output(
+            [framestats_row(0, 1000, 10, input_start=500), framestats_row(4, 2000, 90)]))
+        durations = framestats_stage_durations(header, frames)
+        np.testing.assert_allclose(durations["total"], [10.0])
+        np.testing.assert_allclose(durations["draw"], [2.0])
+        np.testing.assert_allclose(durations["swap"], [1.0])
+        # HandleInputStart dolu: girdi süresi hesaplanır
+        np.testing.assert_allclose(durations["input"], [(1000 + 1_000_000 - 500) / 1e6])
+
+    def test_missing_input_event_is_zero(self):
+        header, frames = parse_framestats(gfxinfo_output([framestats_row(0, 1000, 10)]))
+        np.testing.assert_allclose(framestats_stage_durations(header, frames)["input"], [0.0])
+
+    def test_gfxinfo_without_profile_data(self):
+        self.assertIn("error", parse_gfxinfo_framestats("No process found for: com.example\n"))
+
+
+class FakeShell:
+    def __init__(self, output):
+        self.output = output
+        self.commands = []
+
+    def shell(self, command):
+        self.commands.append(command)
+        return self.output
+
+
+class GfxinfoWindowTest(unittest.TestCase):
+    def test_window_collects_and_resets(self):
+        rows = [framestats_row(0, (i + 1) * REFRESH_NS, 10) for i in range(9)] + [framestats_row(0, 20 * REFRESH_NS, 40)]
+        adb = FakeShell(gfxinfo_output(rows))
+        gfx = GfxinfoWindow("D", "com.example", adb=adb)
+        with gfx.window("scroll"):
+            pass
+        result = gfx.results["scroll"]
+        self.assertEqual((result["frames"], result["janky_frames"]), (10, 1))
+        self.assertAlmostEqual(result["total"]["max"], 40.0)
+        self.assertEqual(adb.commands[0], "dumpsys gfxinfo com.example reset")
+        self.assertIn("framestats; dumpsys gfxinfo com.example reset", adb.commands[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
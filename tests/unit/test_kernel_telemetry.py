@@ -0,0 +1,140 @@
+import glob
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+
+from core import kernel_telemetry
+from core.kernel_telemetry import PPM_COLUMNS, KernelTelemetry
+
+LOGS = os.path.join(os.path.dirname(__file__), "..", "..", "core", "Logs")
+SAMPLE_RUNS = sorted(glob.glob(os.path.join(LOGS, "L2885900115_*")))
+
+# Yakıt ölçer ve wlan satırları aynı uptime ile iki kez basılmış; çapa satırı yok
+SYNTHETIC = """----- timezone:UTC
+<4>[  100.000000]  (1)[5725:kworker/u16:2]vol = 4433  current = 127 cap = 100 temp = 290
+<4>[  100.000000]  (1)[5725:kworker/u16:2]vol = 4433  current = 127 cap = 100 temp = 290
+<4>[  101.500000]  (1)[5725:kworker/u16:2]vol = 4420  current = -50 cap = 99 temp = 301
+<5>[  101.600000]  (3)[7901:kworker/u17:3][Power/PPM] (0xa0)(17406)(0)(0-7)(15)(0)(6)(6) (15)(8)(2)(2) 
+<6>[  102.000000]  (4)[1670:hif_thread][wlan][1670]halSetFWOwn:(INIT INFO) FW OWN:1, IntSta:0x00000001
+<6>[  102.000000]  (4)[1670:hif_thread][wlan][1670]halSetFWOwn:(INIT INFO) FW OWN:1, IntSta:0x00000001
+<6>[  102.300000]  (2)[1670:hif_thread][wlan][1670]halSetDriverOwn:(INIT INFO) DRIVER OWN Done[2220 us]
+<6>[  102.300000]  (2)[1670:hif_thread][wlan][1670]halSetDriverOwn:(INIT INFO) DRIVER OWN Done[2220 us]
+<6>[  102.300000]  (2)[1670:hif_thread][wlan][1670]halSetDriverOwn:(INIT INFO) DRIVER OWN Done[90 us]
+<6>[  110.000000]  (0)[1:init]son satır
+"""
+
+# Dosyanın ortasında yeniden başlatma: uptime 60'tan 2'ye düşer, her bölümün kendi çapası var
+REBOOT = """----- timezone:UTC
+<6>[   50.000000] -(0)[761:surfaceflinger][thread:761] 2025-06-13 10:00:00.000000 UTC;android time 2025-06-13 10:00:00.000000
+<4>[   60.000000]  (1)[5725:kworker/u16:2]vol = 4000  current = 10 cap = 80 temp = 300
+<6>[    2.000000] -(0)[761:surfaceflinger][thread:761] 2025-06-13 11:00:00.000000 UTC;android time 2025-06-13 11:00:00.000000
+<4>[    3.000000]  (1)[5725:kworker/u16:2]vol = 3900  current = 20 cap = 79 temp = 310
+"""
+
+
+def utc(*fields):
+    return datetime(*fields, tzinfo=timezone.utc).timestamp()
+
+
+class KernelTelemetryTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        self.path = os.path.join(self.dir, "kernel_log_6__2025_0613_143020")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(SYNTHETIC)
+
+    def test_repeated_lines_are_dropped(self):
+        metrics = KernelTelemetry.from_paths([self.path]).metrics
+        np.testing.assert_array_equal(metrics["battery"]["uptime"], [100.0, 101.5])
+        np.testing.assert_array_equal(metrics["battery"]["temp_c"], [29.0, 30.1])
+        np.testing.assert_array_equal(metrics["wlan_fw_own"]["uptime"], [102.0])
+        # Aynı uptime ama farklı süre: ayrı olay olarak kalır
+        np.testing.assert_array_equal(metrics["wlan_driver_own"]["duration_us"], [2220, 90])
+
+    def test_ppm_columns(self):
+        ppm = KernelTelemetry.from_paths([self.path]).metrics["ppm"]
+        self.assertEqual([int(ppm[name][0]) for name in PPM_COLUMNS], [0xa0, 17406, 0, 15, 0, 6, 6, 15, 8, 2, 2])
+
+    def test_file_name_is_fallback_clock(self):
+        telemetry = KernelTelemetry.from_paths([self.path])
+        self.assertTrue(telemetry.has_clock)
+        # Dosya adındaki zaman son satıra (110 sn) karşılık gelir
+        named = datetime(2025, 6, 13, 14, 30, 20, tzinfo=timezone.utc).timestamp()
+        self.assertAlmostEqual(telemetry.epoch_of(110.0), named)
+        self.assertAlmostEqual(telemetry.metrics["battery"]["epoch"][0], named - 10.0)
+
+    def test_empty_input(self):
+        telemetry = KernelTelemetry.from_paths([])
+        self.assertFalse(telemetry.has_clock)
+        self.assertEqual(telemetry.metrics["battery"]["uptime"].size, 0)
+        self.assertEqual(telemetry.summary()["battery"], {"count": 0})
+
+    def test_reboot_inside_file_uses_each_boots_anchor(self):
+        path = os.path.join(self.dir, "kernel_log_8__2025_0613_110010")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(REBOOT)
+        telemetry = KernelTelemetry.from_paths([path])
+        battery = telemetry.metrics["battery"]
+        np.testing.assert_array_equal(battery["boot"], [0, 1])
+        np.testing.assert_array_equal(battery["vol_mv"], [4000, 3900])
+        np.testing.assert_allclose(battery["epoch"], [utc(2025, 6, 13, 10, 0, 10), utc(2025, 6, 13, 11, 0, 1)])
+        self.assertAlmostEqual(telemetry.epoch_of(3.0, boot=1), utc(2025, 6, 13, 11, 0, 1))
+        self.assertAlmostEqual(telemetry.epoch_of(60.0), utc(2025, 6, 13, 10, 0, 10))
+
+    def test_reboot_between_files_is_sorted_by_epoch(self):
+        # İkinci dosya yeniden başlatmadan sonra: uptime küçük ama zaman daha ileri
+        after = os.path.join(self.dir, "kernel_log_7__2025_0613_150000")
+        with open(after, "w", encoding="utf-8") as f:
+            f.write("----- timezone:UTC\n"
+                    "<4>[    5.000000]  (1)[5725:kworker/u16:2]vol = 4100  current = 1 cap = 90 temp = 280\n"
+                    "<6>[   20.000000]  (0)[1:init]son satır\n")
+        battery = KernelTelemetry.from_paths([self.path, after]).metrics["battery"]
+        np.testing.assert_array_equal(battery["uptime"], [100.0, 101.5, 5.0])
+        np.testing.assert_array_equal(battery["boot"], [0, 0, 1])
+        # Her dosya kendi adındaki zamana (son satırı) göre çevrilir
+        np.testing.assert_allclose(battery["epoch"], [utc(2025, 6, 13, 14, 30, 10), utc(2025, 6, 13, 14, 30, 11, 500000),
+                                                      utc(2025, 6, 13, 14, 59, 45)])
+        self.assertTrue(np.all(np.diff(battery["epoch"]) > 0))
+
+    def test_cli_writes_one_npz_per_input(self):
+        other = os.path.join(self.dir, "diger", "kernel_log_7__2025_0613_150000")
+        os.makedirs(os.path.dirname(other))
+        with open(other, "w", encoding="utf-8") as f:
+            f.write(SYNTHETIC)
+        target = os.path.join(self.dir, "out.npz")
+        argv = ["kernel_telemetry", self.path, other, "--npz", target]
+        with mock.patch.object(sys, "argv", argv), redirect_stdout(io.StringIO()):
+            kernel_telemetry.main()
+        written = sorted(os.path.basename(path) for path in glob.glob(os.path.join(self.dir, "out*.npz")))
+        self.assertEqual(written, ["out_kernel_log_6__2025_0613_143020.npz", "out_kernel_log_7__2025_0613_150000.npz"])
+        with np.load(os.path.join(self.dir, written[0])) as data:
+            np.testing.assert_array_equal(data["battery.vol_mv"], [4433, 4420])
+
+
+@unittest.skipUnless(SAMPLE_RUNS, "core/Logs örnekleri yok")
+class SampleKernelLogTest(unittest.TestCase):
+    def test_sample_run_uses_utc_anchor(self):
+        telemetry = KernelTelemetry.from_run(SAMPLE_RUNS[0])
+        battery = telemetry.metrics["battery"]
+        self.assertGreater(battery["uptime"].size, 10)
+        self.assertTrue(np.all(np.diff(battery["uptime"]) >= 0))
+        self.assertTrue(np.all((battery["temp_c"] > 10) & (battery["temp_c"] < 60)))
+        # İlk çapa: "<6>[16080.684092] ... 2025-06-13 11:26:46.488260 UTC;android time"
+        anchor = datetime(2025, 6, 13, 11, 26, 46, 488260, tzinfo=timezone.utc).timestamp()
+        self.assertAlmostEqual(telemetry.epoch_of(16080.684092), anchor, places=5)
+        summary = telemetry.summary()
+        self.assertTrue(summary["battery"]["start"].startswith("2025-06-13T14:2"))  # Istanbul yerel saati
+        self.assertEqual(summary["wlan_fw_own"]["count"], telemetry.metrics["wlan_fw_own"]["uptime"].size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from core.locator_cache import LocatorCache, atomic_write_json, file_lock
+
+XPATH = '//android.widget.TextView[@text="YouTube"]'
+BOUNDS = {"x": 10, "y": 20, "width": 100, "height": 40}
+
+
+class FileLockTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.json")
+
+    def test_lock_file_exists_only_while_held(self):
+        with file_lock(self.path):
+            with open(self.path + ".lock", encoding="ascii") as f:
+                self.assertEqual(f.read(), str(os.getpid()))
+        self.assertFalse(os.path.exists(self.path + ".lock"))
+
+    def test_held_lock_times_out(self):
+        with file_lock(self.path):
+            started = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                with file_lock(self.path, timeout=0.2):
+                    pass
+            self.assertLess(time.monotonic() - started, 2)
+
+    def test_stale_lock_is_removed(self):
+        # Çöken sürecin bıraktığı kilit
+        with open(self.path + ".lock", "w", encoding="ascii") as f:
+            f.write("99999")
+        old = time.time() - 60
+        os.utime(self.path + ".lock", (old, old))
+        with file_lock(self.path, timeout=0.5, stale_after=30):
+            pass
+        self.assertFalse(os.path.exists(self.path + ".lock"))
+
+    def test_lock_serializes_threads(self):
+        inside, overlaps = [], []
+
+        def worker():
+            with file_lock(self.path):
+                if inside:
+                    overlaps.append(True)
+                inside.append(True)
+                time.sleep(0.02)
+                inside.pop()
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(overlaps, [])
+
+
+class AtomicWriteJsonTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_writes_creates_directory_and_leaves_no_temp(self):
+        path = os.path.join(self.dir, "alt", "data.json")
+        atomic_write_json(path, {"b": 1, "a": "ş"})
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"a": "ş", "b": 1})
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["data.json"])
+
+    def test_retries_permission_error_then_gives_up(self):
+        path = os.path.join(self.dir, "data.json")
+        real_replace = os.replace
+        calls = []
+
+        def flaky(src, dst):
+            calls.append(src)
+            if len(calls) < 3:
+                raise PermissionError("kilitli")
+            real_replace(src, dst)
+
+        with mock.patch("core.locator_cache.os.replace", side_effect=flaky), \
+                mock.patch("core.locator_cache.time.sleep"):
+            atomic_write_json(path, [1])
+        self.assertEqual(len(calls), 3)
+
+        with mock.patch("core.locator_cache.os.replace", side_effect=PermissionError("kilitli")), \
+                mock.patch("core.locator_cache.time.sleep"):
+            with self.assertRaises(PermissionError):
+                atomic_write_json(path, [2])
+        self.assertEqual(sorted(os.listdir(self.dir)), ["data.json"])  # Geçici dosya silinir
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [1])
+
+
+class LocatorCacheTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "locators.json")
+        self.cache = LocatorCache(self.path)
+
+    def test_miss_then_hit_with_bounds(self):
+        self.assertIsNone(self.cache.get("Era 50", XPATH))
+        scrolls = [{"ratio_y": 0.8, "ratio_end": 0.2}]
+        self.cache.put("Era 50", XPATH, 2, scrolls, BOUNDS)
+        entry = self.cache.get("Era 50", XPATH)
+        self.assertEqual((entry["strategy"], entry["scrolls"], entry["bounds"]), (2, scrolls, BOUNDS))
+        self.assertIsNone(self.cache.get("Başka model", XPATH))
+
+    def test_unchanged_put_does_not_rewrite(self):
+        self.cache.put("Era 50", XPATH, 1, [], BOUNDS)
+        with mock.patch.object(self.cache, "_update") as update:
+            self.cache.put("Era 50", XPATH, 1, [], BOUNDS)
+            update.assert_not_called()
+            self.cache.put("Era 50", XPATH, 1, [], dict(BOUNDS, y=60))  # Element yer değiştirdi
+            update.assert_called_once()
+
+    def test_invalidate_removes_entry(self):
+        self.cache.put("Era 50", XPATH, 1, [])
+        self.cache.put("Era 50", "//başka", 1, [])
+        self.cache.invalidate("Era 50", XPATH)
+        self.assertIsNone(self.cache.get("Era 50", XPATH))
+        self.assertIsNotNone(self.cache.get("Era 50", "//başka"))
+        with mock.patch.object(self.cache, "_update") as update:
+            self.cache.invalidate("Era 50", XPATH)  # Olmayan kayıt dosyaya dokunmaz
+            update.assert_not_called()
+
+    def test_writers_merge_and_readers_see_changes(self):
+        other = LocatorCache(self.path)
+        self.cache.put("Era 50", XPATH, 1, [])
+        other.put("Era 50", "//başka", 3, [])
+        # Diğer sürecin yazdığı kayıt okununca görünür, kendi kaydı da ezilmemiştir
+        self.assertEqual(self.cache.get("Era 50", "//başka")["strategy"], 3)
+        self.assertEqual(other.get("Era 50", XPATH)["strategy"], 1)
+        other.invalidate("Era 50", XPATH)
+        self.assertIsNone(self.cache.get("Era 50", XPATH))
+
+    def test_write_failure_is_reported_not_raised(self):
+        with mock.patch("core.locator_cache.file_lock", side_effect=TimeoutError("kilit")), \
+                mock.patch("builtins.print") as printed:
+            self.cache.put("Era 50", XPATH, 1, [])
+        self.assertIn("yazılamadı", printed.call_args[0][0])
+        self.assertIsNone(self.cache.get("Era 50", XPATH))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from core.log_archive import LogArchive, _zstd, archive_run, write_archive
+
+SAMPLE_RUNS = sorted(glob.glob(os.path.join(os.path.dirname(__file__), "..", "..", "core", "Logs", "L*_*")))
+CHUNK_SIZE = 256 << 10
+
+
+def read_tree(root):
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, root).replace(os.sep, "/")] = f.read()
+    return files
+
+
+@unittest.skipUnless(SAMPLE_RUNS, "core/Logs örnekleri yok")
+class LogArchiveRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.tmp = directory.name
+        self.run_dir = os.path.join(self.tmp, os.path.basename(SAMPLE_RUNS[0]))
+        shutil.copytree(SAMPLE_RUNS[0], self.run_dir)
+        self.original = read_tree(self.run_dir)
+
+    def round_trip(self, codec):
+        path = os.path.join(self.tmp, f"run.{codec}.logarc")
+        result = write_archive(self.run_dir, path, chunk_size=CHUNK_SIZE, codec=codec)
+        self.assertEqual(result["members"], len(self.original))
+        self.assertEqual(result["original_bytes"], sum(len(data) for data in self.original.values()))
+        self.assertLess(result["archive_bytes"], result["original_bytes"])
+        with LogArchive(path) as archive:
+            self.assertEqual(archive.members(), sorted(self.original))
+            self.assertEqual(archive.verify(), [])
+            for name, data in self.original.items():
+                with archive.open(name) as f:
+                    self.assertEqual(f.read(), data, name)
+
+    def test_zlib_round_trip(self):
+        self.round_trip("zlib")
+
+    @unittest.skipUnless(_zstd(), "zstandard kurulu değil")
+    def test_zstd_round_trip(self):
+        self.round_trip("zstd")
+
+    def test_ranged_reads_cross_frame_boundaries(self):
+        path = os.path.join(self.tmp, "run.logarc")
+        write_archive(self.run_dir, path, chunk_size=CHUNK_SIZE, codec="zlib")
+        name, data = max(self.original.items(), key=lambda item: len(item[1]))
+        self.assertGreater(len(data), 2 * CHUNK_SIZE)
+        with LogArchive(path, cache_frames=2) as archive:
+            for offset, length in ((0, 10), (CHUNK_SIZE - 5, 10), (CHUNK_SIZE * 2 - 1, CHUNK_SIZE + 2),
+                                   (len(data) - 3, 100), (len(data) + 10, 5)):
+                self.assertEqual(archive.read(name, offset, length), data[offset:offset + length])
+            with archive.open(name) as f:
+                f.seek(CHUNK_SIZE + 7)
+                self.assertEqual(f.read(32), data[CHUNK_SIZE + 7:CHUNK_SIZE + 39])
+                f.seek(-16, os.SEEK_END)
+                self.assertEqual(f.read(), data[-16:])
+            with self.assertRaises(KeyError):
+                archive.size("yok")
+
+    def test_text_lines_and_extract(self):
+        path = os.path.join(self.tmp, "run.logarc")
+        write_archive(self.run_dir, path, chunk_size=CHUNK_SIZE, codec="zlib")
+        name = next(name for name in sorted(self.original) if "main_log" in name)
+        with LogArchive(path) as archive:
+            with archive.open_text(name) as f:
+                lines = f.readlines()
+            self.assertEqual("".join(lines), self.original[name].decode("utf-8", errors="replace"))
+            target = os.path.join(self.tmp, "extracted", "main_log")
+            archive.extract(name, target)
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), self.original[name])
+
+    def test_corruption_is_detected(self):
+        path = os.path.join(self.tmp, "run.logarc")
+        write_archive(self.run_dir, path, chunk_size=CHUNK_SIZE, codec="zlib")
+        with LogArchive(path) as archive:
+            name = archive.members()[0]
+            offset, length = archive.info(name)["frames"][0]
+        with open(path, "r+b") as f:
+            # Frame'i geçerli ama farklı bir içerikle değiştir
+            replacement = zlib.compress(b"x")
+            self.assertLessEqual(len(replacement), length)
+            f.seek(offset)
+            f.write(replacement + b"\0" * (length - len(replacement)))
+        with LogArchive(path) as archive:
+            self.assertIn(name, archive.verify())
+
+    def test_archive_run_removes_source_after_verify(self):
+        result = archive_run(self.run_dir, remove_source=True, chunk_size=CHUNK_SIZE, codec="zlib")
+        self.assertFalse(os.path.exists(self.run_dir))
+        self.assertEqual(result["path"], self.run_dir + ".logarc")
+        with LogArchive(result["path"]) as archive:
+            self.assertEqual(archive.verify(), [])
+
+    def test_invalid_file_is_rejected(self):
+        path = os.path.join(self.tmp, "bozuk.logarc")
+        with open(path, "wb") as f:
+            f.write(b"not an archive")
+        with self.assertRaises(ValueError):
+            LogArchive(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
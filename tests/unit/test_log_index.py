@@ -0,0 +1,155 @@
+import glob
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from core import log_index
+from core.log_index import LogIndex, parse_threadtime
+
+LOGS = os.path.join(os.path.dirname(__file__), "..", "..", "core", "Logs")
+SAMPLE_RUNS = sorted(glob.glob(os.path.join(LOGS, "L2885900115_*")))
+
+
+def epoch(text, tz=timezone.utc):
+    return datetime.fromisoformat(text).replace(tzinfo=tz).timestamp()
+
+
+class ThreadtimeParserTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_fields_and_timezone_header(self):
+        path = self.write("main_log_1__2025_0613_143020", (
+            "----- timezone:UTC\n"
+            "06-13 14:26:35.202510   753   837 I ActivityManager: Start proc 1234\n"
+            "--------- beginning of crash\n"
+            "06-13 14:26:35.500000  1570  6445 E AndroidRuntime  : FATAL EXCEPTION: main\n"
+            "----- timezone:Europe/Istanbul\n"
+            "06-13 14:27:00.000000     1     1 W init: boş mesaj:\n"))
+        records = list(parse_threadtime(path))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0][1:], (753, 837, "I", "ActivityManager", "Start proc 1234"))
+        self.assertAlmostEqual(records[0][0], epoch("2025-06-13T14:26:35.202510"), places=5)
+        self.assertEqual(records[1][4:], ("AndroidRuntime", "FATAL EXCEPTION: main"))
+        # Istanbul UTC+3: aynı duvar saati üç saat önceye düşer
+        self.assertAlmostEqual(records[2][0], epoch("2025-06-13T11:27:00"), places=5)
+        self.assertEqual(records[2][5], "boş mesaj:")
+
+    def test_year_rollover_uses_previous_year(self):
+        path = self.write("main_log_1__2025_0102_000500", "----- timezone:UTC\n"
+                                                         "12-31 23:59:59.000000  1  1 I Tag: eski yıl\n")
+        [record] = parse_threadtime(path)
+        self.assertAlmostEqual(record[0], epoch("2024-12-31T23:59:59"), places=5)
+        # Aralık sonunda açılmış dosyaya yılbaşından sonra yazılan satırlar
+        path = self.write("main_log_1__2024_1231_235500", "----- timezone:UTC\n"
+                                                         "12-31 23:59:59.000000  1  1 I Tag: eski yıl\n"
+                                                         "01-01 00:00:01.000000  1  1 I Tag: yeni yıl\n")
+        old, new = parse_threadtime(path)
+        self.assertAlmostEqual(old[0], epoch("2024-12-31T23:59:59"), places=5)
+        self.assertAlmostEqual(new[0], epoch("2025-01-01T00:00:01"), places=5)
+
+    def test_unknown_timezone_falls_back_to_local_with_one_warning(self):
+        path = self.write("main_log_1__2025_0613_143020", "----- timezone:Yok/Boyle\n"
+                                                         "06-13 14:26:35.000000  1  1 I Tag: a\n"
+                                                         "----- timezone:Yok/Boyle\n"
+                                                         "06-13 14:26:36.000000  1  1 I Tag: b\n")
+        log_index._warned_timezones.discard("Yok/Boyle")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            records = list(parse_threadtime(path))
+        local = datetime.now().astimezone().tzinfo
+        self.assertAlmostEqual(records[0][0], epoch("2025-06-13T14:26:35", local), places=5)
+        self.assertEqual(output.getvalue().count("Saat dilimi bulunamadı (Yok/Boyle)"), 1)
+
+
+class GrowingFileTest(unittest.TestCase):
+    HEAD = "----- timezone:UTC\n" + "".join(
+        f"06-13 14:26:{i:02d}.000000  1  1 I Tag: satır {i}\n" for i in range(3))
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        self.index = LogIndex(os.path.join(self.dir, "log_index.sqlite"))
+        self.addCleanup(self.index.close)
+
+    def pull(self, stamp, text):
+        """Aynı cihazdan yeni bir çekim: aynı göreli yolda güncel dosya içeriği"""
+        folder = os.path.join(self.dir, f"L0000000001_20250613_{stamp}", "mobilelog", "APLog_1")
+        os.makedirs(folder)
+        with open(os.path.join(folder, "main_log_1__2025_0613_142600"), "w", encoding="utf-8") as f:
+            f.write(text)
+        return self.index.ingest_tree(os.path.dirname(os.path.dirname(folder)))
+
+    def test_grown_file_adds_only_new_lines(self):
+        self.assertEqual(self.pull("143000", self.HEAD)["lines"], 3)
+        grown = self.HEAD + "06-13 14:26:10.000000  1  1 E Tag: yeni satır\n06-13 14:26:11.000000  1  1 I Tag: yar"
+        self.assertEqual(self.pull("143100", grown)["lines"], 1)  # Yarım satır bir sonraki çekime kalır
+        self.assertEqual(self.pull("143200", grown + "ım\n")["lines"], 1)
+        messages = [row["message"] for row in self.index.query(limit=None)]
+        self.assertEqual(len(messages), 5)
+        self.assertEqual(messages[-2:], ["yeni satır", "yarım"])
+        self.assertEqual(len(self.index.query(level="E", limit=None)), 1)
+        self.assertEqual(len(self.index.query(text="yeni", limit=None)), 1)
+        files = self.index.conn.execute("SELECT line_count FROM files").fetchall()
+        self.assertEqual([row["line_count"] for row in files], [5])
+        runs = self.index.conn.execute("SELECT COUNT(*) FROM file_runs").fetchone()[0]
+        self.assertEqual(runs, 3)
+
+    def test_rewritten_file_is_added_as_new(self):
+        self.pull("143000", self.HEAD)
+        rewritten = "----- timezone:UTC\n06-13 15:00:00.000000  2  2 W Tag: yeni dosya\n"
+        self.assertEqual(self.pull("143100", rewritten)["lines"], 1)
+        self.assertEqual(self.index.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0], 2)
+
+
+@unittest.skipUnless(len(SAMPLE_RUNS) >= 2, "core/Logs örnekleri yok")
+class LogIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.index = LogIndex(os.path.join(cls.directory.name, "log_index.sqlite"))
+        cls.first = cls.index.ingest_tree(SAMPLE_RUNS[0])
+        cls.second = cls.index.ingest_tree(SAMPLE_RUNS[1])
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.index.close()
+        cls.directory.cleanup()
+
+    def test_same_files_are_parsed_once(self):
+        self.assertGreater(self.first["lines"], 0)
+        self.assertEqual(self.first["files"], self.second["files"])
+        self.assertEqual(self.second["lines"], 0)  # Aynı APLog tekrar çekilmiş
+        runs = self.index.conn.execute("SELECT COUNT(*) FROM runs WHERE device = 'L2885900115'").fetchone()[0]
+        self.assertEqual(runs, 2)
+
+    def test_query_filters(self):
+        rows = self.index.query(level="E", tag="AndroidRuntime", buffer="crash", device="L2885900115")
+        self.assertTrue(rows)
+        self.assertTrue(all(row["level"] == "E" and row["tag"] == "AndroidRuntime" for row in rows))
+        self.assertEqual([row["ts"] for row in rows], sorted(row["ts"] for row in rows))
+        self.assertEqual(self.index.query(device="L0000000000"), [])
+
+    def test_time_window_and_text(self):
+        rows = self.index.query(text="FATAL", limit=None)
+        self.assertTrue(rows and all("FATAL" in row["message"] for row in rows))
+        start = rows[0]["ts"]
+        window = self.index.query(since=start, until=start + 1, limit=None)
+        self.assertTrue(window and all(start <= row["ts"] < start + 1 for row in window))
+        self.assertEqual(len(self.index.query(limit=3)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import shlex
+import tempfile
+import unittest
+
+from core.log_sync import DebugLogSync
+
+REMOTE_DIR = "/sdcard/debuglogger"
+
+
+class DirectoryAdb:
+    """Cihazdaki log klasörünü yerel bir dizinle taklit eden AdbClient yerine geçen sınıf"""
+
+    def __init__(self, root):
+        self.root = root
+        self.commands = []
+
+    def _path(self, remote):
+        return os.path.join(self.root, *remote[len(REMOTE_DIR) + 1:].split("/"))
+
+    def run(self, command, timeout=None):
+        self.commands.append(command)
+        lines = []
+        for directory, _, names in os.walk(self.root):
+            for name in sorted(names):
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+                st = os.stat(path)
+                lines.append(f"{st.st_size}|{int(st.st_mtime)}|{st.st_ino}|{REMOTE_DIR}/{relative}")
+        return 0, "\n".join(lines)
+
+    def run_many(self, commands, timeout=None):
+        results = []
+        for command in commands:
+            self.commands.append(command)
+            args = shlex.split(command.split("|")[0])  # head -c N 'yol'
+            with open(self._path(args[3]), "rb") as f:
+                results.append((0, hashlib.sha1(f.read(int(args[2]))).hexdigest() + "  -\n"))
+        return results
+
+    def exec_out_to(self, command, out):
+        self.commands.append(command)
+        args = shlex.split(command)
+        with open(self._path(args[-1]), "rb") as f:
+            if args[0] == "tail":
+                f.seek(int(args[2][1:]) - 1)
+            data = f.read()
+        out.write(data)
+        return len(data)
+
+
+class DebugLogSyncTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.remote = os.path.join(directory.name, "device")
+        self.output = os.path.join(directory.name, "output")
+        os.makedirs(os.path.join(self.remote, "mobilelog"))
+        self.adb = DirectoryAdb(self.remote)
+        self.sync = DebugLogSync("D1", self.output, REMOTE_DIR, adb=self.adb, max_workers=2)
+
+    def _write(self, relative, data, mode="wb", mtime=None):
+        path = os.path.join(self.remote, *relative.split("/"))
+        with open(path, mode) as f:
+            f.write(data)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def _run_view(self, name, relative):
+        with open(os.path.join(self.output, name, "debuglogger", *relative.split("/")), "rb") as f:
+            return f.read()
+
+    def test_new_grown_and_unchanged_files(self):
+        self._write("mobilelog/main_log", b"a" * 5000, mtime=1000)
+        self._write("kernel_log", b"k" * 10, mtime=1000)
+        stats = self.sync.sync_into(os.path.join(self.output, "run1"))
+        self.assertEqual((stats.new, stats.bytes_transferred), (2, 5010))
+
+        self._write("mobilelog/main_log", b"b" * 100, "ab", mtime=1010)
+        stats = self.sync.sync_into(os.path.join(self.output, "run2"))
+        self.assertEqual((stats.grown, stats.unchanged, stats.bytes_transferred), (1, 1, 100))
+        # Önceki çalıştırmanın görünümü değişmez, yenisi tam dosyayı içerir
+        self.assertEqual(self._run_view("run1", "mobilelog/main_log"), b"a" * 5000)
+        self.assertEqual(self._run_view("run2", "mobilelog/main_log"), b"a" * 5000 + b"b" * 100)
+
+    def test_grows_in_place_without_other_links(self):
+        self._write("main_log", b"a" * 100, mtime=1000)
+        self.sync.sync()
+        mirror = self.sync._local("main_log")
+        inode = os.stat(mirror).st_ino
+        self._write("main_log", b"b" * 10, "ab", mtime=1001)
+        stats = self.sync.sync()
+        self.assertEqual(stats.grown, 1)
+        self.assertEqual(os.stat(mirror).st_ino, inode)
+        with open(mirror, "rb") as f:
+            self.assertEqual(f.read(), b"a" * 100 + b"b" * 10)
+
+    def test_truncated_and_regrown_file_is_fetched_again(self):
+        self._write("main_log", b"a" * 100, mtime=1000)
+        self.sync.sync()
+        self._write("main_log", b"z" * 150, mtime=1005)  # Aynı inode, kesilip yeniden yazıldı
+        stats = self.sync.sync()
+        self.assertEqual((stats.grown, stats.replaced, stats.bytes_transferred), (0, 1, 150))
+        with open(self.sync._local("main_log"), "rb") as f:
+            self.assertEqual(f.read(), b"z" * 150)
+
+    def test_deleted_file_is_removed_from_mirror(self):
+        self._write("old_log", b"x", mtime=1000)
+        self.sync.sync()
+        os.remove(os.path.join(self.remote, "old_log"))
+        stats = self.sync.sync()
+        self.assertEqual(stats.deleted, 1)
+        self.assertFalse(os.path.exists(self.sync._local("old_log")))
+        self.assertEqual(self.sync.load_manifest(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import glob
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core.logcat_capture import LogcatCapture
+from core.result_sink import ResultSink
+
+SAMPLE = glob.glob(os.path.join(os.path.dirname(__file__), "..", "..", "core", "Logs", "*", "debuglogger",
+                                "debuglogger", "mobilelog", "*", "main_log_*"))
+
+
+class LogcatRingTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = directory.name
+        self.capture = LogcatCapture("D", os.path.join(self.output, "logcat"),
+                                     ring_lines=5, ring_seconds=60, chunk_bytes=200)
+        # Sonuçlar çalışma dizinine değil geçici dizine yazılsın
+        self.capture.sink = ResultSink("D", self.output)
+        # recent()/dump_recent() yaş filtresi de aynı sabit saate göre çalışır
+        self.clock = mock.patch("core.logcat_capture.time.time", return_value=1000.0)
+        self.clock.start()
+        self.addCleanup(self.clock.stop)
+
+    def feed(self, lines, now):
+        with mock.patch("core.logcat_capture.time.time", return_value=now):
+            self.capture._handle_lines(lines)
+
+    def test_ring_keeps_latest_lines_and_skips_banners(self):
+        self.feed(["--------- beginning of main"] + [f"satır {i}" for i in range(8)] + [""], 1000.0)
+        self.assertEqual([line for _, _, line in self.capture.recent()], [f"satır {i}" for i in range(3, 8)])
+        self.assertEqual(self.capture.line_count, 8)
+
+    def test_old_lines_expire_by_age(self):
+        self.feed(["eski"], 1000.0)
+        self.feed(["yeni"], 1061.0)
+        self.assertEqual([line for _, _, line in self.capture.recent()], ["yeni"])
+
+    def test_lines_are_tagged_with_current_step(self):
+        with self.capture.sink.step("Giriş"):
+            self.feed(["adımda"], 1000.0)
+        self.feed(["adımsız"], 1000.0)
+        self.assertEqual([line for _, _, line in self.capture.recent(step="Giriş")], ["adımda"])
+        self.assertEqual(self.capture.recent(step="-")[0][2], "adımsız")
+
+    def test_epoch_timestamp_is_used_for_resume(self):
+        self.feed(["  1749814008.006589  1570  6445 D Tag: mesaj"], 1000.0)
+        self.assertTrue(self.capture._command().endswith("-T 1749814008.007"))
+
+    @unittest.skipUnless(SAMPLE, "core/Logs örnekleri yok")
+    def test_sample_log_is_chunked_and_dumped(self):
+        with open(SAMPLE[0], "r", encoding="utf-8", errors="replace") as f:
+            lines = [line.rstrip("\n") for _, line in zip(range(40), f)]
+        for index in range(0, len(lines), 10):
+            self.feed(lines[index:index + 10], 1000.0)
+        self.capture._close_chunk()
+
+        self.assertGreater(len(self.capture.chunks), 1)  # chunk_bytes aşılınca yeni parça açılır
+        written = []
+        for path in self.capture.chunks:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                written.extend(line.rstrip("\n").split("\t", 1)[1] for line in f)
+        self.assertEqual(written, lines)
+
+        path = self.capture.dump_recent(30, os.path.join(self.output, "failure.log"))
+        with open(path, "r", encoding="utf-8") as f:
+            self.assertEqual([line.rstrip("\n").split("\t", 1)[1] for line in f], lines[-5:])
+
+
+if __name__ == "__main__":
+    unittest.main()
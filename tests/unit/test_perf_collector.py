@@ -0,0 +1,99 @@
+import unittest
+
+from core.perf_collector import SECTION_MARKER, BatchedMetricsCollector, split_sections
+
+PACKAGE = "com.google.android.youtube"
+
+# Cihazdan alınmış toplu çıktı (kısaltılmış); surfaceflinger bölümünde araya uyarı karışmış
+CAPTURED = f"""{SECTION_MARKER}surfaceflinger@@
+16666666
+W/SurfaceFlinger: layer name truncated
+100 1000 200
+1100 17000000 1200
+2100 33000000 2200
+0 0 0
+
+{SECTION_MARKER}cpu@@
+Tasks: 512 total,   1 running, 511 sleeping,   0 stopped,   0 zombie
+  PID USER         PR  NI VIRT  RES  SHR S[%CPU] THR     TIME+ ARGS
+ 4312 u0_a145      10 -10  15G 310M 180M S 23.3   87   1:02.11 {PACKAGE}
+{SECTION_MARKER}memory@@
+Applications Memory Usage (in Kilobytes):
+           TOTAL PSS:   184312            TOTAL RSS:   301220       TOTAL SWAP PSS:      120
+{SECTION_MARKER}thermal@@
+IsStatusOverride: false
+Current throttling status: 1
+Current temperatures from HAL:
+	Temperature{{mValue=41.5, mType=0, mName=CPU0, mStatus=1}}
+{SECTION_MARKER}model@@
+Pixel 7
+{SECTION_MARKER}android_version@@
+14
+"""
+
+
+class FakeAdb:
+    def __init__(self, output):
+        self.output = output
+        self.scripts = []
+
+    def run(self, script):
+        self.scripts.append(script)
+        return 0, self.output
+
+
+class SplitSectionsTest(unittest.TestCase):
+    def test_captured_output(self):
+        sections = split_sections(CAPTURED)
+        self.assertEqual(list(sections),
+                         ["surfaceflinger", "cpu", "memory", "thermal", "model", "android_version"])
+        self.assertTrue(sections["surfaceflinger"].startswith("16666666\n"))
+        self.assertNotIn(SECTION_MARKER, sections["cpu"])
+        self.assertEqual(sections["android_version"], "14\n")
+
+    def test_text_before_first_marker_and_empty_section(self):
+        sections = split_sections(f"uyarı\n{SECTION_MARKER}thermal@@\n{SECTION_MARKER}model@@\nPixel 7")
+        self.assertEqual(sections, {"thermal": "", "model": "Pixel 7"})
+
+    def test_no_markers(self):
+        self.assertEqual(split_sections("/system/bin/sh: dumpsys: not found"), {})
+
+
+class BatchedMetricsCollectorTest(unittest.TestCase):
+    def setUp(self):
+        self.adb = FakeAdb(CAPTURED)
+        self.collector = BatchedMetricsCollector("D1", adb=self.adb)
+
+    def test_build_script_marks_each_section(self):
+        script = self.collector.build_script(PACKAGE, ["surfaceflinger", "model"])
+        self.assertEqual(script.splitlines(), [
+            f"echo '{SECTION_MARKER}surfaceflinger@@'",
+            f"dumpsys SurfaceFlinger --latency {PACKAGE} 2>&1",
+            f"echo '{SECTION_MARKER}model@@'",
+            "getprop ro.product.model 2>&1",
+        ])
+
+    def test_build_script_skips_package_sections_without_package(self):
+        script = self.collector.build_script(None, ["cpu", "memory", "thermal"])
+        self.assertEqual(script.splitlines(), [f"echo '{SECTION_MARKER}thermal@@'", "dumpsys thermalservice 2>&1"])
+
+    def test_collect_parses_captured_output_in_one_round_trip(self):
+        report = self.collector.collect(PACKAGE)
+        self.assertEqual(len(self.adb.scripts), 1)
+        surfaceflinger = report["fps_metrics"]["surfaceflinger"]
+        self.assertEqual(surfaceflinger["refresh_period_ns"], 16666666)
+        self.assertEqual(surfaceflinger["frame_data"].shape, (3, 3))  # Uyarı satırı bölümü bozmaz
+        self.assertIsNone(report["fps_metrics"]["gfxinfo"])  # Çıktıda olmayan bölüm
+        self.assertEqual(report["system_metrics"]["cpu"], {"cpu_percent": 23.3, "threads": 87})
+        self.assertEqual(report["system_metrics"]["memory"]["pss_kb"], 184312)
+        self.assertTrue(report["system_metrics"]["thermal"]["is_throttling"])
+        self.assertEqual(report["device_info"], {"model": "Pixel 7", "android_version": "14"})
+
+    def test_parse_error_is_reported_per_section(self):
+        parsed = self.collector.parse({"cpu": f"1 2 3 {PACKAGE}", "model": "Pixel 7\n"}, PACKAGE)
+        self.assertIn("Parse failed", parsed["cpu"]["error"])
+        self.assertEqual(parsed["model"], "Pixel 7")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from core.perf_sampler import PerformanceSampler, RingBuffer
+
+
+class RingBufferTest(unittest.TestCase):
+    def test_partial_buffer_returns_rows_in_order(self):
+        buffer = RingBuffer(4, 2)
+        buffer.append([1, 10])
+        buffer.append([2, 20])
+        np.testing.assert_array_equal(buffer.to_array(), [[1, 10], [2, 20]])
+        self.assertEqual((buffer.count, buffer.dropped), (2, 0))
+
+    def test_wraps_and_keeps_latest_rows(self):
+        buffer = RingBuffer(3, 1)
+        for value in range(7):
+            buffer.append([value])
+        np.testing.assert_array_equal(buffer.to_array()[:, 0], [4, 5, 6])
+        self.assertEqual((buffer.count, buffer.dropped), (7, 4))
+
+    def test_to_array_is_a_copy(self):
+        buffer = RingBuffer(2, 1)
+        buffer.append([1])
+        snapshot = buffer.to_array()
+        snapshot[0, 0] = 99
+        self.assertEqual(buffer.to_array()[0, 0], 1)
+
+
+class FakeCollector:
+    def __init__(self, responses):
+        self.responses = list(responses)
+
+    def collect_sections(self, package_name, sections):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeMonitor:
+    device_name = "D"
+
+
+class PerformanceSamplerTest(unittest.TestCase):
+    def test_failed_sample_is_nan_and_excluded_from_summary(self):
+        sampler = PerformanceSampler(FakeMonitor(), "com.example", capacity=2)
+        sampler.collector = FakeCollector([
+            {"cpu": {"cpu_percent": 10.0}, "memory": {"pss_kb": 1000},
+             "thermal": {"temperatures": [35.0, 41.5], "is_throttling": False},
+             "surfaceflinger": {"avg_fps": 60.0, "janky_frames": 2}},
+            OSError("bağlantı koptu"),
+            {"cpu": {"cpu_percent": 30.0}, "surfaceflinger": {"error": "yok"}},
+        ])
+        sampler._start_time = 0.0
+        for _ in range(3):
+            sampler.sample_once()
+
+        report = sampler.report()
+        self.assertEqual((report["total_samples"], report["dropped_samples"]), (3, 1))
+        self.assertEqual(report["samples"].shape, (2, len(PerformanceSampler.COLUMNS)))
+        self.assertTrue(np.isnan(report["samples"][0, 1:]).all())  # Hatalı örnek
+        self.assertEqual(report["summary"]["cpu_percent"]["max"], 30.0)
+        self.assertNotIn("fps", report["summary"])  # FPS'li örnek halkadan düştü
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import re
+import tempfile
+import unittest
+
+from core.provisioning import DeviceProvisioner, ProvisioningProfile
+
+PERMISSION = "android.permission.CAMERA"
+
+
+class FakeDeviceAdb:
+    """settings/pm komutlarını bellekteki durum üzerinde çalıştıran AdbClient yerine geçen sınıf"""
+
+    def __init__(self, settings=None, granted=()):
+        self.settings = dict(settings or {})
+        self.granted = set(granted)
+        self.commands = []
+
+    def _run(self, command):
+        self.commands.append(command)
+        match = re.match(r"settings (get|put|delete) (\w+) (\w+)(?: (\S+))?", command)
+        if match:
+            action, key, value = match[1], f"{match[2]}/{match[3]}", match[4]
+            if action == "get":
+                return 0, self.settings.get(key, "null")
+            if action == "put":
+                self.settings[key] = value
+            else:
+                self.settings.pop(key, None)
+            return 0, ""
+        match = re.match(r"pm (grant|revoke) \S+ (\S+)", command)
+        if match:
+            (self.granted.add if match[1] == "grant" else self.granted.discard)(match[2])
+            return 0, ""
+        if command.startswith("dumpsys package") and "grep" not in command:
+            return 0, "\n".join(f"    {permission}: granted=true" for permission in self.granted)
+        return 0, "build-1"
+
+    def shell(self, command):
+        return self._run(command)[1]
+
+    def shell_many(self, commands):
+        return [self._run(command)[1] for command in commands]
+
+    def run_many(self, commands):
+        return [self._run(command) for command in commands]
+
+
+class DeviceProvisionerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.cache_path = os.path.join(directory.name, "provisioning.json")
+        self.profile = ProvisioningProfile(permissions={"com.example": [PERMISSION]})
+
+    def _provisioner(self, adb):
+        return DeviceProvisioner("D1", self.profile, adb, self.cache_path)
+
+    def test_apply_is_cached_by_fingerprint(self):
+        adb = FakeDeviceAdb({"global/window_animation_scale": "1.0"})
+        provisioner = self._provisioner(adb)
+        self.assertTrue(provisioner.apply())
+        self.assertEqual(adb.settings["global/window_animation_scale"], "0")
+        self.assertIn(PERMISSION, adb.granted)
+        self.assertFalse(provisioner.apply())
+
+    def test_restore_keeps_cache_and_reapplies_without_dumpsys(self):
+        adb = FakeDeviceAdb({"global/window_animation_scale": "1.0"})
+        provisioner = self._provisioner(adb)
+        provisioner.apply()
+        provisioner.restore()
+        self.assertEqual(adb.settings["global/window_animation_scale"], "1.0")
+        self.assertNotIn("global/transition_animation_scale", adb.settings)
+        self.assertNotIn(PERMISSION, adb.granted)
+        self.assertIn("restored_fingerprint", provisioner._cached_entry())
+
+        adb.commands.clear()
+        self.assertTrue(provisioner.apply())
+        self.assertIn(PERMISSION, adb.granted)
+        self.assertNotIn("dumpsys package com.example", adb.commands)
+        self.assertFalse(provisioner.apply())
+
+    def test_restore_without_changes_keeps_fingerprint(self):
+        adb = FakeDeviceAdb(self.profile.settings(), granted=[PERMISSION])
+        provisioner = self._provisioner(adb)
+        provisioner.apply()
+        adb.commands.clear()
+        provisioner.restore()
+        self.assertFalse(any(command.startswith(("settings put", "settings delete", "pm revoke"))
+                             for command in adb.commands))
+        self.assertFalse(provisioner.apply())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from core.result_sink import ResultSink
+
+
+class ResultSinkTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        self.sink = ResultSink("D1", self.dir, flush_every=3, flush_interval=3600)
+
+    def read(self):
+        if not os.path.exists(self.sink.path):
+            return []
+        with open(self.sink.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_jsonl_fields(self):
+        self.sink.record("Success", {"açıldı": True}, duration_sec=1.23456789, package="com.x")
+        self.sink.flush()
+        [entry] = self.read()
+        self.assertEqual(os.path.basename(self.sink.path), "results_D1.jsonl")
+        self.assertEqual(set(entry), {"ts", "mono", "device", "step", "status", "message",
+                                      "duration_sec", "package"})
+        self.assertEqual((entry["device"], entry["status"], entry["step"]), ("D1", "Success", None))
+        self.assertEqual(entry["message"], "{'açıldı': True}")
+        self.assertEqual(entry["duration_sec"], 1.234568)
+        self.assertEqual(entry["package"], "com.x")
+        datetime.fromisoformat(entry["ts"])
+        with open(self.sink.path, encoding="utf-8") as f:
+            self.assertIn("açıldı", f.read())  # ensure_ascii=False
+
+    def test_batches_until_flush_every(self):
+        self.sink.record("Info", "1")
+        self.sink.record("Info", "2")
+        self.assertEqual(self.read(), [])
+        self.sink.record("Info", "3")
+        self.assertEqual([entry["message"] for entry in self.read()], ["1", "2", "3"])
+        self.sink.record("Info", "4")
+        self.assertEqual(len(self.read()), 3)
+
+    def test_flushes_after_interval(self):
+        self.sink.flush_interval = 2.0
+        with mock.patch("core.result_sink.time.monotonic", return_value=self.sink._last_flush + 1):
+            self.sink.record("Info", "erken")
+        self.assertEqual(self.read(), [])
+        with mock.patch("core.result_sink.time.monotonic", return_value=self.sink._last_flush + 5):
+            self.sink.record("Info", "geç")
+        self.assertEqual(len(self.read()), 2)
+
+    def test_errors_flush_immediately(self):
+        for status in ("Error", "Failure"):
+            self.sink.record(status, "hata")
+            self.assertEqual(self.read()[-1]["status"], status)
+
+    def test_step_stack_labels_and_durations(self):
+        with self.sink.step("Dış"):
+            self.sink.record("Info", "dışta")
+            with self.sink.step("İç"):
+                self.sink.record("Info", "içte")
+            self.assertEqual(self.sink.current_step, "Dış")
+        self.assertIsNone(self.sink.current_step)
+        self.sink.flush()
+        rows = [(entry["status"], entry["step"], entry["message"]) for entry in self.read()]
+        self.assertEqual(rows, [("step_start", "Dış", "Dış"), ("Info", "Dış", "dışta"),
+                                ("step_start", "İç", "İç"), ("Info", "İç", "içte"),
+                                ("step_end", "İç", "İç"), ("step_end", "Dış", "Dış")])
+        ends = [entry for entry in self.read() if entry["status"] == "step_end"]
+        self.assertTrue(all(entry["duration_sec"] >= 0 for entry in ends))
+
+    def test_failed_step_flushes_and_reraises(self):
+        with self.assertRaises(ValueError):
+            with self.sink.step("Giriş"):
+                raise ValueError("bozuk")
+        # step_failed tamponu hemen diske yazar
+        self.assertEqual([entry["status"] for entry in self.read()], ["step_start", "step_failed"])
+        self.assertIsNone(self.sink.current_step)
+
+    def test_write_error_is_reported(self):
+        sink = ResultSink("D1", os.path.join(self.dir, "yok"))
+        with mock.patch("builtins.print") as printed:
+            sink.record("Error", "hata")
+        self.assertIn("Failed to write results", printed.call_args[0][0])
+
+    def test_for_device_returns_one_sink_per_device(self):
+        with mock.patch.dict(ResultSink._sinks, clear=True), mock.patch.object(ResultSink, "_install_hooks"):
+            first = ResultSink.for_device("D2", self.dir)
+            self.assertIs(ResultSink.for_device("D2"), first)
+            self.assertIsNot(ResultSink.for_device("D3", self.dir), first)
+            first.record("Info", "tamponda")
+            ResultSink.flush_all()
+        with open(first.path, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.read())["message"], "tamponda")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import struct
+import unittest
+import zlib
+
+from core.screenshot import RawFrame, ScreenCapture
+
+
+def decode_png(png):
+    """Test için: IHDR renk tipini ve filtre baytları atılmış piksel verisini döndürür"""
+    pos, idat, color_type, width = 8, b"", None, 0
+    while pos < len(png):
+        length, tag = struct.unpack_from(">I4s", png, pos)
+        body = png[pos + 8:pos + 8 + length]
+        if tag == b"IHDR":
+            width, _, _, color_type = struct.unpack_from(">IIBB", body)
+        elif tag == b"IDAT":
+            idat += body
+        pos += 12 + length
+    raw = zlib.decompress(idat)
+    stride = width * (4 if color_type == 6 else 3) + 1
+    return color_type, b"".join(raw[i + 1:i + stride] for i in range(0, len(raw), stride))
+
+
+class FakeAdb:
+    def __init__(self, data):
+        self.data = data
+
+    def exec_out(self, command):
+        return self.data
+
+
+class ScreenshotTest(unittest.TestCase):
+    def test_rgba_is_encoded_as_is(self):
+        pixels = bytes([1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual(decode_png(RawFrame(2, 1, 1, pixels).to_png()), (6, pixels))
+
+    def test_bgra_channels_are_swapped(self):
+        frame = RawFrame(2, 1, 5, bytes([1, 2, 3, 4, 5, 6, 7, 8]))
+        self.assertEqual(decode_png(frame.to_png()), (6, bytes([3, 2, 1, 4, 7, 6, 5, 8])))
+
+    def test_rgbx_is_written_opaque(self):
+        frame = RawFrame(2, 1, 2, bytes([1, 2, 3, 0, 5, 6, 7, 9]))
+        self.assertEqual(decode_png(frame.to_png()), (6, bytes([1, 2, 3, 255, 5, 6, 7, 255])))
+
+    def test_capture_raw_uses_format_pixel_size(self):
+        # Android 9+ başlığı (16 byte), RGB_888: piksel başına 3 byte
+        pixels = bytes(range(12))
+        capture = ScreenCapture("D", FakeAdb(struct.pack("<IIII", 2, 2, 3, 0) + pixels))
+        frame = capture.capture_raw()
+        self.assertEqual((frame.width, frame.height, frame.pixel_format, frame.data), (2, 2, 3, pixels))
+        self.assertEqual(decode_png(frame.to_png()), (2, pixels))
+
+    def test_unsupported_format_is_rejected(self):
+        capture = ScreenCapture("D", FakeAdb(struct.pack("<III", 1, 1, 4) + b"\x00\x00"))
+        with self.assertRaisesRegex(ValueError, "piksel formatı"):
+            capture.capture_raw()
+
+
+if __name__ == "__main__":
+    unittest.main()
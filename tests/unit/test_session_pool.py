@@ -0,0 +1,136 @@
+import itertools
+import unittest
+from unittest import mock
+
+from core.session_pool import DriverSessionPool, backoff_delays
+
+try:
+    from selenium.common.exceptions import InvalidSessionIdException
+except ImportError:  # selenium kurulu değil
+    InvalidSessionIdException = None
+
+
+class FakeDriver:
+    """`current_package` sırayla verilen sonuçları döndüren (veya fırlatan) sahte driver"""
+
+    def __init__(self, name, outcomes=()):
+        self.name = name
+        self.outcomes = list(outcomes)
+        self.checks = 0
+        self.quit_calls = 0
+
+    @property
+    def current_package(self):
+        self.checks += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "com.android.launcher"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class BackoffDelaysTest(unittest.TestCase):
+    def test_exponential_with_jitter_and_cap(self):
+        delays = list(itertools.islice(backoff_delays(base=1.0, cap=8.0), 6))
+        for delay, ceiling in zip(delays, [1, 2, 4, 8, 8, 8]):
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_jitter_spreads_values(self):
+        first = {next(backoff_delays(base=1.0)) for _ in range(20)}
+        self.assertGreater(len(first), 1)
+
+
+class PoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        self.quit = []
+        self.pool = DriverSessionPool(self.create, self.quit_driver)
+
+    def create(self, device_name, port):
+        driver = FakeDriver(f"{device_name}-{len(self.created)}")
+        self.created.append(driver)
+        return driver
+
+    def quit_driver(self, driver, device_name):
+        self.quit.append(driver.name)
+
+
+class DriverSessionPoolTest(PoolTestCase):
+    def test_acquire_reuses_healthy_session(self):
+        first = self.pool.acquire("D1", 4723)
+        with mock.patch("builtins.print"):
+            self.assertIs(self.pool.acquire("D1", 4723), first)
+        self.assertEqual(len(self.created), 1)
+        self.assertEqual(first.checks, 1)
+
+    def test_port_change_recreates_session(self):
+        first = self.pool.acquire("D1", 4723)
+        second = self.pool.acquire("D1", 4725)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.quit, [first.name])
+
+    def test_release_keeps_session_unless_failed(self):
+        first = self.pool.acquire("D1", 4723)
+        self.pool.release("D1")
+        with mock.patch("builtins.print"):
+            self.assertIs(self.pool.acquire("D1", 4723), first)
+        self.pool.release("D1", failed=True)
+        self.assertEqual(self.quit, [first.name])
+        self.assertIsNot(self.pool.acquire("D1", 4723), first)
+
+    def test_discard_falls_back_to_driver_quit(self):
+        pool = DriverSessionPool(self.create)
+        driver = pool.acquire("D1", 4723)
+        pool.discard("D1")
+        pool.discard("D1")  # İkinci çağrı etkisiz
+        self.assertEqual(driver.quit_calls, 1)
+
+    def test_acquire_level_functions_override_defaults(self):
+        pool = DriverSessionPool()
+        with self.assertRaises(ValueError):
+            pool.acquire("D1", 4723)
+        driver = pool.acquire("D1", 4723, self.create, self.quit_driver)
+        pool.close_all()
+        self.assertEqual(self.quit, [driver.name])
+
+    def test_failed_creation_is_not_pooled(self):
+        pool = DriverSessionPool(lambda name, port: None)
+        self.assertIsNone(pool.acquire("D1", 4723))
+        self.assertEqual(pool._sessions, {})
+
+
+@unittest.skipIf(InvalidSessionIdException is None, "selenium kurulu değil")
+class SessionHealthTest(PoolTestCase):
+    def test_transient_error_is_retried(self):
+        driver = self.pool.acquire("D1", 4723)
+        driver.outcomes = [ConnectionError("bağlantı reddedildi")]
+        with mock.patch("core.session_pool.time.sleep") as sleep, mock.patch("builtins.print"):
+            self.assertIs(self.pool.acquire("D1", 4723), driver)
+        sleep.assert_called_once()
+        self.assertEqual(self.quit, [])
+
+    def test_persistent_error_propagates_and_keeps_session(self):
+        driver = self.pool.acquire("D1", 4723)
+        driver.outcomes = [ConnectionError("kapalı")] * 3
+        with mock.patch("core.session_pool.time.sleep"), mock.patch("builtins.print"):
+            with self.assertRaises(ConnectionError):
+                self.pool.acquire("D1", 4723)
+        self.assertEqual(driver.checks, 3)
+        self.assertEqual(self.quit, [])
+        self.assertEqual(len(self.created), 1)
+
+    def test_invalid_session_is_recreated(self):
+        driver = self.pool.acquire("D1", 4723)
+        driver.outcomes = [InvalidSessionIdException("session deleted")]
+        with mock.patch("builtins.print"):
+            fresh = self.pool.acquire("D1", 4723)
+        self.assertIsNot(fresh, driver)
+        self.assertEqual(self.quit, [driver.name])
+        self.assertEqual(driver.checks, 1)  # Geçersiz oturum yeniden denenmez
+
+
+if __name__ == "__main__":
+    unittest.main()
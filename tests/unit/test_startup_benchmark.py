@@ -0,0 +1,36 @@
+import subprocess
+import unittest
+from unittest import mock
+
+from core.startup_benchmark import slowest_imports
+
+# `python -X importtime -c "import tests.test_cases"` çıktısından (kısaltılmış)
+IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       900 |        900 |   numpy.core
+import time:      1200 |       4100 | numpy
+import time:       300 |        300 |     lxml._elementpath
+import time:       700 |       1000 |   lxml.etree
+import time:       200 |       1200 | lxml
+import time:      2500 |       2500 | appium
+"""
+
+
+class SlowestImportsTest(unittest.TestCase):
+    def run_with(self, stderr, **kwargs):
+        completed = subprocess.CompletedProcess([], 0, stdout="", stderr=stderr)
+        with mock.patch("core.startup_benchmark.subprocess.run", return_value=completed):
+            return slowest_imports("tests.test_cases", **kwargs)
+
+    def test_only_top_level_imports_are_ranked(self):
+        entries = self.run_with(IMPORTTIME)
+        # numpy.core ve lxml.etree ebeveynlerinin kümülatifinde zaten var, ayrıca listelenmez
+        self.assertEqual([(e["module"], e["cumulative_ms"]) for e in entries],
+                         [("numpy", 4.1), ("appium", 2.5), ("lxml", 1.2)])
+        self.assertEqual(entries[0]["self_ms"], 1.2)
+
+    def test_top_limits_result(self):
+        self.assertEqual([e["module"] for e in self.run_with(IMPORTTIME, top=1)], ["numpy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from core import test_runner
+except ImportError:  # appium-python-client / selenium kurulu değil
+    test_runner = None
+
+DEVICES = [{"name": "D1", "port": 4723}, {"name": "D2", "port": 4724}]
+
+
+class StubDriver:
+    current_package = "com.android.launcher"
+
+
+class Passing:
+    def run_with_retry(self, driver, device_name):
+        return True
+
+
+class FailsOnD2:
+    def run_with_retry(self, driver, device_name):
+        return device_name != "D2"
+
+
+class KillsD2:
+    """D2'de worker sürecini sinyalle ölmüş gibi sonlandırır"""
+
+    def run_with_retry(self, driver, device_name):
+        if device_name == "D2":
+            os._exit(3)
+        return True
+
+
+@unittest.skipIf(test_runner is None, "appium-python-client kurulu değil")
+@unittest.skipIf(os.name == "nt", "stub'lar worker'lara fork ile aktarılır")
+class SuiteRunnerTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.runner = test_runner.BaseTestRunner(DEVICES, [], output_dir=directory.name)
+        self.runner.WORKER_POLL_INTERVAL = 0.1
+        self.broken = set()
+        patches = [
+            mock.patch.object(self.runner, "_initialize_driver", side_effect=self._driver),
+            mock.patch.object(self.runner, "_safe_quit_driver"),
+            mock.patch.object(self.runner, "_pull_debug_logs"),
+            mock.patch.object(test_runner, "AndroidPerformanceMonitor"),
+            mock.patch.object(test_runner, "ResultSink"),
+            mock.patch("builtins.print"),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _driver(self, device_name, port):
+        return None if device_name in self.broken else StubDriver()
+
+    def run_suite(self, test_cases, shared_queue=False):
+        results = self.runner.run_suite(test_cases, shared_queue=shared_queue)
+        return {device: sorted((row["index"], row["passed"]) for row in rows) for device, rows in results.items()}
+
+    def test_per_device_queue_runs_every_test_on_every_device(self):
+        results = self.run_suite([Passing(), FailsOnD2(), Passing()])
+        self.assertEqual(results["D1"], [(0, True), (1, True), (2, True)])
+        self.assertEqual(results["D2"], [(0, True), (1, False), (2, True)])
+
+    def test_shared_queue_runs_each_test_once(self):
+        results = self.run_suite([Passing() for _ in range(6)], shared_queue=True)
+        indexes = sorted(index for rows in results.values() for index, _ in rows)
+        self.assertEqual(indexes, list(range(6)))
+
+    def test_failed_driver_reports_every_queued_test(self):
+        self.broken.add("D2")
+        results = self.runner.run_suite([Passing(), Passing()])
+        self.assertEqual(len(results["D1"]), 2)
+        self.assertEqual([(row["index"], row["passed"]) for row in results["D2"]], [(0, False), (1, False)])
+        self.assertTrue(all("Driver başlatılamadı" in row["error"] for row in results["D2"]))
+
+    def test_failed_driver_leaves_shared_tests_to_other_devices(self):
+        self.broken.add("D2")
+        results = self.run_suite([Passing() for _ in range(4)], shared_queue=True)
+        self.assertEqual(results["D1"], [(0, True), (1, True), (2, True), (3, True)])
+        self.assertEqual(results["D2"], [])
+
+    def test_no_driver_anywhere_reports_shared_tests_as_failed(self):
+        self.broken.update({"D1", "D2"})
+        results = self.runner.run_suite([Passing() for _ in range(3)], shared_queue=True)
+        rows = [row for device_rows in results.values() for row in device_rows]
+        self.assertEqual(sorted(row["index"] for row in rows), [0, 1, 2])
+        self.assertFalse(any(row["passed"] for row in rows))
+
+    def test_dead_worker_reports_remaining_tests(self):
+        results = self.runner.run_suite([Passing(), KillsD2(), Passing()])
+        self.assertEqual(len(results["D1"]), 3)
+        d2 = sorted(results["D2"], key=lambda row: row["index"])
+        # Ölen sürecin henüz kuyruğa aktaramadığı sonuç da kaybolabilir; her test yine raporlanır
+        self.assertEqual([row["index"] for row in d2], [0, 1, 2])
+        self.assertFalse(d2[1]["passed"] or d2[2]["passed"])
+        self.assertIn("çıkış kodu 3", d2[2]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import glob
+import gzip
+import io
+import json
+import os
+import re
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from core.kernel_telemetry import KernelTelemetry
+from core.timeline import TimelineBuilder, kernel_events, logcat_capture_events, pcap_events, result_events
+
+LOGS = os.path.join(os.path.dirname(__file__), "..", "..", "core", "Logs")
+SAMPLE_PCAPS = sorted(glob.glob(os.path.join(LOGS, "L2885900115_*", "debuglogger", "debuglogger",
+                                             "netlog", "*", "tcpdump_*.cap")))
+
+
+def ipv4_udp(source, destination, source_port, destination_port):
+    header = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 28, 0, 0, 64, 17, 0,
+                         bytes(map(int, source.split("."))), bytes(map(int, destination.split("."))))
+    return header + struct.pack(">HHHH", source_port, destination_port, 8, 0)
+
+
+def ipv6_tcp():
+    header = struct.pack(">IHBB16s16s", 6 << 28, 20, 6, 64, bytes(15) + b"\x01", b"\xfe\x80" + bytes(13) + b"\x02")
+    return header + struct.pack(">HH", 443, 50000) + bytes(16)
+
+
+def write_pcap(path, packets, order="<", magic=0xa1b2c3d4, linktype=101):
+    with open(path, "wb") as f:
+        f.write(struct.pack(order + "IHHiIII", magic, 2, 4, 0, 0, 65535, linktype))
+        for seconds, fraction, data in packets:
+            f.write(struct.pack(order + "IIII", seconds, fraction, len(data), len(data) + 4))
+            f.write(data)
+
+
+def count_pcap_records(path):
+    """pcap_events'ten bağımsız olarak kayıt başlıklarını sayar"""
+    with open(path, "rb") as f:
+        f.seek(24)
+        count = 0
+        while True:
+            raw = f.read(16)
+            if len(raw) < 16:
+                return count
+            f.seek(struct.unpack("<IIII", raw)[2], os.SEEK_CUR)
+            count += 1
+
+
+class PcapTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_raw_ip_microseconds(self):
+        path = os.path.join(self.dir, "tcpdump.cap")
+        write_pcap(path, [(1749814145, 500000, ipv4_udp("10.0.0.1", "224.0.0.251", 5353, 5353)),
+                          (1749814146, 0, ipv6_tcp()),
+                          (1749814147, 0, bytes([0x45]) + bytes(8) + bytes([1]) + bytes(2) + bytes(8))])
+        events = list(pcap_events(path))
+        self.assertEqual([e[0] for e in events], [1749814145.5, 1749814146.0, 1749814147.0])
+        self.assertEqual(events[0][1:], ("net", "I", "tcpdump", "UDP 10.0.0.1:5353 > 224.0.0.251:5353 len=32"))
+        self.assertEqual(events[1][4], "TCP ::1:443 > fe80::2:50000 len=64")
+        self.assertEqual(events[2][4], "ICMP 0.0.0.0 > 0.0.0.0 len=24")
+
+    def test_big_endian_nanoseconds_ethernet_and_large_packets(self):
+        path = os.path.join(self.dir, "tcpdump.pcap")
+        frame = bytes(12) + b"\x08\x00" + ipv4_udp("192.168.1.2", "8.8.8.8", 40000, 53) + bytes(500)
+        write_pcap(path, [(10, 250_000_000, frame), (11, 0, b"\x00" * 14 + b"\x00")],
+                   order=">", magic=0xa1b23c4d, linktype=1)
+        events = list(pcap_events(path, peek=64))  # Gövde peek'ten uzun: kalan kısım atlanır
+        self.assertEqual([e[0] for e in events], [10.25, 11.0])
+        self.assertEqual(events[0][4], f"UDP 192.168.1.2:40000 > 8.8.8.8:53 len={len(frame) + 4}")
+        self.assertEqual(events[1][4], "non-IP len=19")
+
+    def test_truncated_and_unsupported_files(self):
+        path = os.path.join(self.dir, "tcpdump.cap")
+        write_pcap(path, [(1, 0, ipv4_udp("1.1.1.1", "2.2.2.2", 1, 2))])
+        with open(path, "ab") as f:
+            f.write(b"\x00" * 7)  # Yarım kayıt başlığı
+        self.assertEqual(len(list(pcap_events(path))), 1)
+
+        with open(path, "wb") as f:
+            f.write(struct.pack("<I", 0x0A0D0D0A) + bytes(40))
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(list(pcap_events(path)), [])
+        self.assertIn("pcapng", output.getvalue())
+
+    @unittest.skipUnless(SAMPLE_PCAPS, "core/Logs örnekleri yok")
+    def test_sample_capture(self):
+        events = list(pcap_events(SAMPLE_PCAPS[0]))
+        self.assertEqual(len(events), count_pcap_records(SAMPLE_PCAPS[0]))
+        self.assertTrue(all(re.search(r" len=\d+$", e[4]) for e in events))
+        self.assertEqual(datetime.fromtimestamp(events[0][0]).date().isoformat(), "2025-06-13")
+
+
+class SourceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+
+    def test_result_jsonl_and_text(self):
+        jsonl = os.path.join(self.dir, "results_D.jsonl")
+        with open(jsonl, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"ts": "2025-06-13T14:30:00.500", "device": "D", "step": "Giriş",
+                                "status": "step_end", "message": "tamam"}) + "\nbozuk satır\n")
+        [event] = result_events(jsonl)
+        self.assertEqual(event, (datetime(2025, 6, 13, 14, 30, 0, 500000).timestamp(), "result",
+                                 "step_end", "D", "[Giriş] tamam"))
+
+        text = os.path.join(self.dir, "results_D.txt")
+        with open(text, "w", encoding="utf-8") as f:
+            f.write("[2025-06-13 14:30:01] [Success]: {'YouTube açıldı'}\n")
+        self.assertEqual(list(result_events(text)),
+                         [(datetime(2025, 6, 13, 14, 30, 1).timestamp(), "result", "Success", "", "YouTube açıldı")])
+
+    def test_logcat_capture_chunks(self):
+        path = os.path.join(self.dir, "logcat_D_0.log.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("Giriş\t1749814008.006589  1570  6445 D Tag: mesaj\n"
+                    "-\t1749814009.000000     1     1 E init: hata\n")
+        self.assertEqual(list(logcat_capture_events(path)),
+                         [(1749814008.006589, "logcat", "D", "Tag", "[Giriş] mesaj"),
+                          (1749814009.0, "logcat", "E", "init", "hata")])
+
+    def test_kernel_events_follow_reboots(self):
+        path = os.path.join(self.dir, "kernel_log_6__2025_0613_110010")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("----- timezone:UTC\n"
+                    "<6>[   50.000000] -(0)[761:surfaceflinger][thread:761] "
+                    "2025-06-13 10:00:00.000000 UTC;android time 2025-06-13 10:00:00.000000\n"
+                    "<4>[   60.000000]  (1)[1:init]boot 0\n"
+                    "<6>[    2.000000] -(0)[761:surfaceflinger][thread:761] "
+                    "2025-06-13 11:00:00.000000 UTC;android time 2025-06-13 11:00:00.000000\n"
+                    "<4>[    3.000000]  (1)[1:init]boot 1\n")
+        events = [event for event in kernel_events(path, KernelTelemetry.from_paths([path]))
+                  if event[4].startswith("boot")]
+        base = datetime.fromisoformat("2025-06-13T10:00:00+00:00").timestamp()
+        self.assertEqual([(event[0] - base, event[4]) for event in events], [(10.0, "boot 0"), (3601.0, "boot 1")])
+
+
+class TimelineBuilderTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.run_dir = os.path.join(directory.name, "D_20250613_143100")
+        mobilelog = os.path.join(self.run_dir, "debuglogger", "mobilelog", "APLog_2025_0613_142900__1")
+        os.makedirs(mobilelog)
+        with open(os.path.join(mobilelog, "main_log_1__2025_0613_143020"), "w", encoding="utf-8") as f:
+            f.write("----- timezone:UTC\n"
+                    "06-13 11:30:00.100000   10   11 I Tag: birinci\n"
+                    "06-13 11:30:02.100000   10   11 E Tag: ikinci\n")
+        write_pcap(os.path.join(mobilelog, "tcpdump_1.cap"),
+                   [(int(datetime.fromisoformat("2025-06-13T11:30:01+00:00").timestamp()), 0,
+                     ipv4_udp("10.0.0.1", "10.0.0.2", 1000, 53))])
+        self.results = os.path.join(directory.name, "results_D.jsonl")
+        # ResultSink zamanı yerel saatle yazar
+        current = datetime.fromtimestamp(datetime.fromisoformat("2025-06-13T11:30:01.500+00:00").timestamp())
+        with open(self.results, "w", encoding="utf-8") as f:
+            for stamp, message in (("2025-06-12T09:00:00", "önceki çalıştırma"),
+                                   (current.isoformat(), "bu çalıştırma")):
+                f.write(json.dumps({"ts": stamp, "device": "D", "step": None, "status": "Success",
+                                    "message": message}) + "\n")
+        self.builder = TimelineBuilder(self.run_dir, result_paths=[self.results])
+
+    def test_sources_are_merged_in_time_order(self):
+        events = list(self.builder.events())
+        self.assertEqual([e[1] for e in events], ["result", "main", "net", "result", "main"])
+        self.assertEqual([e[0] for e in events], sorted(e[0] for e in events))
+
+    def test_filters(self):
+        since = datetime.fromisoformat("2025-06-13T11:30:00+00:00").timestamp()
+        events = list(self.builder.events(since=since, until=since + 2))
+        self.assertEqual([e[4] for e in events][::2], ["10/11 birinci", "bu çalıştırma"])
+        self.assertEqual(len(events), 3)
+        # Seviye filtresi result satırlarını dışarıda bırakmaz
+        self.assertEqual([e[1] for e in self.builder.events(levels="E")], ["result", "result", "main"])
+        self.assertEqual([e[1] for e in self.builder.events(sources={"net"}, pattern="UDP")], ["net"])
+
+    def test_write_tsv(self):
+        path, count = self.builder.write(since=datetime.fromisoformat("2025-06-13T00:00:00+00:00").timestamp())
+        self.assertEqual(os.path.basename(path), "timeline_D.tsv")
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "time\tsource\tlevel\ttag\tmessage")
+        self.assertEqual(count, len(lines) - 1)
+        self.assertEqual(count, 4)  # Önceki günün sonuç satırı hariç
+
+
+if __name__ == "__main__":
+    unittest.main()
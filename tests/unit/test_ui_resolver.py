@@ -0,0 +1,83 @@
+import unittest
+
+from core.ui_resolver import PageSnapshot, to_xpath, uiselector_to_xpath
+
+PAGE_SOURCE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="1080" height="2400">
+  <android.widget.FrameLayout index="0" package="com.android.launcher3" class="android.widget.FrameLayout"
+      text="" content-desc="" clickable="false" bounds="[0,0][1080,2400]">
+    <android.widget.TextView index="0" package="com.android.launcher3" class="android.widget.TextView"
+        text="YouTube" content-desc="YouTube" resource-id="com.android.launcher3:id/icon"
+        clickable="true" bounds="[100,200][300,400]" />
+    <android.widget.TextView index="1" package="com.android.launcher3" class="android.widget.TextView"
+        text="YouTube Music" content-desc="Müzik" resource-id="com.android.launcher3:id/icon"
+        clickable="true" bounds="[400,200][600,400]" />
+    <android.widget.TextView index="2" package="com.android.launcher3" class="android.widget.TextView"
+        text='Say "hi"' content-desc="" clickable="false" bounds="[0,500][200,600]" />
+  </android.widget.FrameLayout>
+</hierarchy>
+"""
+
+
+class UiSelectorToXPathTest(unittest.TestCase):
+    def test_equals_and_boolean(self):
+        self.assertEqual(uiselector_to_xpath('new UiSelector().text("YouTube").clickable(true)'),
+                         '//*[@text="YouTube"][@clickable="true"]')
+
+    def test_contains_starts_with_and_instance(self):
+        self.assertEqual(uiselector_to_xpath('new UiSelector().textContains("Tube").instance(1);'),
+                         '(//*[contains(@text, "Tube")])[2]')
+        self.assertEqual(uiselector_to_xpath('new UiSelector().descriptionStartsWith("Mü")'),
+                         '//*[starts-with(@content-desc, "Mü")]')
+
+    def test_matches_is_anchored_regex(self):
+        self.assertEqual(uiselector_to_xpath('new UiSelector().resourceIdMatches(".*:id/icon")'),
+                         '//*[re:test(@resource-id, "^(?:.*:id/icon)$")]')
+
+    def test_quotes_are_escaped(self):
+        self.assertEqual(uiselector_to_xpath(r'new UiSelector().text("Say \"hi\"")'),
+                         """//*[@text='Say "hi"']""")
+
+    def test_unsupported_or_malformed_selectors(self):
+        with self.assertRaisesRegex(ValueError, "Desteklenmeyen"):
+            uiselector_to_xpath('new UiSelector().index(0).depth(2)')
+        with self.assertRaises(ValueError):
+            uiselector_to_xpath('new UiSelector().childSelector(new UiSelector().text("a"))')
+        with self.assertRaisesRegex(ValueError, "çözümlenemedi"):
+            uiselector_to_xpath('new UiSelector().text("a") garbage')
+        with self.assertRaises(ValueError):
+            uiselector_to_xpath('//android.widget.TextView')
+
+    def test_xpath_passes_through(self):
+        self.assertEqual(to_xpath("//*[@text='YouTube']"), "//*[@text='YouTube']")
+
+
+class PageSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = PageSnapshot(PAGE_SOURCE)
+
+    def test_find_returns_bounds_and_center(self):
+        [element] = self.snapshot.find('new UiSelector().text("YouTube")', "youtube")
+        self.assertEqual((element.name, element.bounds, element.center), ("youtube", (100, 200, 300, 400), (200, 300)))
+        self.assertEqual(element.text, "YouTube")
+
+    def test_regex_and_instance_against_tree(self):
+        matches = self.snapshot.find('new UiSelector().textMatches("YouTube.*")')
+        self.assertEqual([m.text for m in matches], ["YouTube", "YouTube Music"])
+        # Tam eşleşme: "Tube" tek başına hiçbir metni eşlemez
+        self.assertEqual(self.snapshot.find('new UiSelector().textMatches("Tube")'), [])
+        [second] = self.snapshot.find('new UiSelector().resourceId("com.android.launcher3:id/icon").instance(1)')
+        self.assertEqual(second.text, "YouTube Music")
+
+    def test_resolve_and_first_keep_candidate_order(self):
+        candidates = {"yok": 'new UiSelector().text("Chrome")',
+                      "muzik": 'new UiSelector().description("Müzik")',
+                      "quoted": r'new UiSelector().text("Say \"hi\"")'}
+        resolved = self.snapshot.resolve(candidates)
+        self.assertEqual({name: len(found) for name, found in resolved.items()}, {"yok": 0, "muzik": 1, "quoted": 1})
+        self.assertEqual(self.snapshot.first(candidates).name, "muzik")
+        self.assertIsNone(self.snapshot.first(['new UiSelector().text("Chrome")']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from unittest import mock
+
+from core.ui_wait import FOCUS_COMMAND, UiIdleWaiter
+
+
+class SettlingDriver:
+    """page_source'u ilk `changes` okumada değişen, sonra sabit kalan sahte driver"""
+
+    def __init__(self, changes=0, fail=False):
+        self.changes = changes
+        self.fail = fail
+        self.reads = 0
+
+    @property
+    def page_source(self):
+        self.reads += 1
+        if self.fail:
+            raise ConnectionError("oturum yok")
+        return f"<hierarchy v='{min(self.reads, self.changes + 1)}'/>"
+
+
+class FakeAdb:
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.commands = []
+
+    def shell(self, command):
+        self.commands.append(command)
+        return self.outputs.pop(0) if len(self.outputs) > 1 else self.outputs[0]
+
+
+class UiIdleWaiterTest(unittest.TestCase):
+    def waiter(self, outputs=("mCurrentFocus=Launcher",), **kwargs):
+        kwargs.setdefault("interval", 0)
+        kwargs.setdefault("min_wait", 0)
+        return UiIdleWaiter("D1", adb=FakeAdb(outputs), **kwargs)
+
+    def test_default_window_mode_needs_two_samples(self):
+        waiter = self.waiter()
+        driver = SettlingDriver()
+        record = waiter.wait(driver, baseline=2)
+        self.assertTrue(record.idle)
+        self.assertEqual(waiter.adb.commands, [FOCUS_COMMAND] * 2)
+        self.assertEqual(driver.reads, 0)  # Appium'a gidilmez
+
+    def test_window_mode_waits_for_activity_change_to_settle(self):
+        waiter = self.waiter(["focus=A", "focus=B", "focus=C", "focus=C"])
+        self.assertTrue(waiter.wait(None, baseline=2).idle)
+        self.assertEqual(len(waiter.adb.commands), 4)
+
+    def test_hierarchy_settles_after_changes(self):
+        waiter = self.waiter(mode="hierarchy")
+        stable = SettlingDriver()
+        self.assertTrue(waiter.wait(stable, baseline=1).idle)
+        self.assertEqual(stable.reads, 2)  # Sabit ekran: ilk örnek + bir doğrulama
+
+        changing = SettlingDriver(changes=3)
+        self.assertTrue(waiter.wait(changing, baseline=1).idle)
+        self.assertEqual(changing.reads, 5)  # v1, v2, v3, v4, v4
+
+    def test_stable_samples_counts_the_first_sample(self):
+        waiter = self.waiter(mode="hierarchy", stable_samples=3)
+        driver = SettlingDriver()
+        waiter.wait(driver, baseline=1)
+        self.assertEqual(driver.reads, 3)
+
+    def test_never_settling_hits_cap(self):
+        waiter = self.waiter(mode="hierarchy", interval=0.01)
+        driver = SettlingDriver(changes=10 ** 6)
+        record = waiter.wait(driver, baseline=0.1, cap=0.1, label="dönen animasyon")
+        self.assertFalse(record.idle)
+        self.assertGreaterEqual(record.elapsed, 0.1)
+        self.assertEqual(waiter.summary()["timed_out"], 1)
+
+    def test_signature_error_falls_back_to_baseline_sleep(self):
+        waiter = self.waiter(mode="hierarchy")
+        with mock.patch("builtins.print"), mock.patch("core.ui_wait.time.sleep") as sleep:
+            record = waiter.wait(SettlingDriver(fail=True), baseline=1.5)
+        self.assertFalse(record.idle)
+        self.assertAlmostEqual(sleep.call_args[0][0], 1.5, places=1)
+
+    def test_both_mode_and_summary(self):
+        waiter = self.waiter(mode="both")
+        driver = SettlingDriver()
+        waiter.wait(driver, baseline=2, label="a")
+        self.assertEqual((driver.reads, len(waiter.adb.commands)), (2, 2))
+        summary = waiter.summary()
+        self.assertEqual(summary["waits"], 1)
+        self.assertGreater(summary["saved_sec"], 1.5)
+        waiter.reset()
+        self.assertEqual(waiter.summary()["waits"], 0)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            UiIdleWaiter("D1", mode="pixels")
+
+
+if __name__ == "__main__":
+    unittest.main()